@@ -0,0 +1,98 @@
+"""Benchmarks for the Home Assistant independent core.
+
+Run from the repository root:
+
+    python3 benchmarks/bench_core.py
+
+Measures the import time of the core server module in a fresh interpreter,
+the XML codec and a full GetAllCommands check-in (parse, apply, build the
+response, encode it) without any network I/O.
+"""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import timeit
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from custom_components.syr_connect_local.const import (  # noqa: E402
+    ALL_COMMANDS,
+    EXTENDED_PROPERTIES,
+)
+from custom_components.syr_connect_local.core.protocol import SyrProtocol  # noqa: E402
+from custom_components.syr_connect_local.core.server import SyrConnectServer  # noqa: E402
+
+SERIAL = "123456789"
+IMPORT_RUNS = 5
+IMPORT_SCRIPT = (
+    "import time; started = time.perf_counter(); "
+    "import custom_components.syr_connect_local.core.server; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def _check_in_body() -> str:
+    """Return the XML of a device answering every getter."""
+    properties = {name: "1" for name in [*ALL_COMMANDS, *EXTENDED_PROPERTIES]}
+    properties.update(
+        {"getSRN": SERIAL, "getVER": "1.0", "getFIR": "SLPS", "getTYP": "80"}
+    )
+    return SyrProtocol.generate_xml(properties)
+
+
+def bench_import() -> float:
+    """Return the best import time of core.server in milliseconds."""
+    times = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", IMPORT_SCRIPT],
+                cwd=ROOT,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(IMPORT_RUNS)
+    ]
+    return min(times) * 1000
+
+
+def _per_call(function, number: int) -> float:
+    """Return the median time of one call in microseconds."""
+    runs = timeit.repeat(function, number=number, repeat=5)
+    return statistics.median(runs) / number * 1e6
+
+
+async def _bench_check_in(body: str, number: int) -> float:
+    """Return the time of one check-in in microseconds."""
+    server = SyrConnectServer()
+
+    def check_in() -> None:
+        properties = server.protocol.parse_xml(body)
+        device = server.process_check_in(SERIAL, properties)
+        server.protocol.generate_xml(server._build_response(device))
+
+    return _per_call(check_in, number)
+
+
+def main() -> None:
+    """Run the benchmarks and print one line per result."""
+    body = _check_in_body()
+    properties = SyrProtocol.parse_xml(body)
+    results = [
+        ("import core.server", bench_import(), "ms"),
+        ("parse_xml", _per_call(lambda: SyrProtocol.parse_xml(body), 2000), "us"),
+        ("generate_xml", _per_call(lambda: SyrProtocol.generate_xml(properties), 2000), "us"),
+        ("check-in", asyncio.run(_bench_check_in(body, 2000)), "us"),
+    ]
+    for name, value, unit in results:
+        print(f"{name:<20} {value:10.1f} {unit}")
+
+
+if __name__ == "__main__":
+    main()
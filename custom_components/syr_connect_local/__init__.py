@@ -1,93 +1,191 @@
 """The SYR Connect Local integration."""
 from __future__ import annotations
 
+import asyncio
+import functools
+import importlib
 import logging
+import time
 
 from pathlib import Path
-
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-
-from homeassistant.helpers.dispatcher import async_dispatcher_send
+from typing import TYPE_CHECKING, Any
 
 from .const import (
+    CONF_API_TOKEN,
     CONF_CERT_FILE,
+    CONF_CLOUD_MIRROR_URL,
     CONF_HTTPS_PORT,
     CONF_HTTP_PORT,
     CONF_KEY_FILE,
+    CONF_LOOP_MONITOR,
     CONF_USE_HTTPS,
     CONF_DEBUG_ENDPOINTS,
-    DATA_COORDINATOR,
+    CONF_DEVICE_CAPACITY,
+    CONF_DEVICE_EXPIRY,
+    CONF_DNS_ADDRESS,
+    CONF_DNS_CLIENTS,
+    CONF_DNS_RESPONDER,
+    CONF_DNS_UPSTREAM,
+    CONF_POLL_HOSTS,
+    CONF_PROFILE_TOKEN,
+    CONF_SERVER_URL,
+    CONF_SNAPSHOT_ENDPOINT,
+    CONF_STREAM_ENDPOINT,
+    CONF_PROXY_PROTOCOL,
+    CONF_TLS_OFFLOAD,
+    CONF_TRUSTED_PROXIES,
+    CONF_UNIX_SOCKET,
+    DATA_COORDINATORS,
+    DATA_PLATFORMS,
     DATA_SERVER,
+    DATA_STORE,
+    DEFAULT_DEVICE_CAPACITY,
+    DEFAULT_DEVICE_EXPIRY,
     DEFAULT_HTTPS_PORT,
     DEFAULT_HTTP_PORT,
     DOMAIN,
+    JOURNAL_FILE,
     SIGNAL_NEW_DEVICE,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
 )
-from .coordinator import SyrConnectLocalCoordinator
-from .server import SyrConnectServer
+
+# Home Assistant is imported lazily so the core package can be used without it
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import device_registry as dr
+    from homeassistant.helpers.storage import Store
+
+    from .coordinator import SyrConnectLocalCoordinator
+    from .core.remote import RemoteSyrConnectServer
+    from .core.server import SyrConnectServer
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [
-    Platform.SENSOR,
-    Platform.BINARY_SENSOR,
-    Platform.SWITCH,
-    Platform.BUTTON,
-    Platform.NUMBER,
-    Platform.SELECT,
-    Platform.TIME,
-]
+# Description table of each platform, by homeassistant.const.Platform value
+_PLATFORM_DESCRIPTIONS: dict[str, str] = {
+    "sensor": "SENSORS",
+    "binary_sensor": "BINARY_SENSORS",
+    "button": "BUTTONS",
+    "number": "NUMBERS",
+    "select": "SELECTS",
+    "time": "TIMES",
+}
+PLATFORMS: list[str] = list(_PLATFORM_DESCRIPTIONS)
+
+
+@functools.cache
+def platform_properties() -> dict[str, tuple[str, ...] | None]:
+    """Return the properties a device needs to get entities on each platform.
+
+    Derived from the description tables (see required_properties); None if
+    every device gets entities. A platform is loaded the first time a
+    device reports one of its properties. Imports the platform modules,
+    so the first call belongs in the executor.
+    """
+    from .entity import required_properties
+
+    return {
+        platform: required_properties(
+            getattr(importlib.import_module(f".{platform}", __name__), table)
+        )
+        for platform, table in _PLATFORM_DESCRIPTIONS.items()
+    }
+
+
+def platforms_for_device(device_data: dict[str, Any] | None) -> list[str]:
+    """Return the platforms a device gets entities on."""
+    return [
+        platform
+        for platform, properties in platform_properties().items()
+        if properties is None
+        or (
+            device_data is not None
+            and any(device_data.get(key) is not None for key in properties)
+        )
+    ]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up SYR Connect Local from a config entry."""
-    _LOGGER.info("Setting up SYR Connect Local integration")
+    from homeassistant.exceptions import ConfigEntryNotReady
+    from homeassistant.helpers.dispatcher import async_dispatcher_send
+    from homeassistant.helpers.storage import Store
+    from homeassistant.helpers.update_coordinator import UpdateFailed
 
-    # Get configuration
-    http_port = entry.data.get(CONF_HTTP_PORT, DEFAULT_HTTP_PORT)
-    https_port = entry.data.get(CONF_HTTPS_PORT, DEFAULT_HTTPS_PORT)
-    use_https = entry.data.get(CONF_USE_HTTPS, False)
-    cert_file = entry.data.get(CONF_CERT_FILE)
-    key_file = entry.data.get(CONF_KEY_FILE)
-    debug_endpoints = entry.options.get(
-        CONF_DEBUG_ENDPOINTS, entry.data.get(CONF_DEBUG_ENDPOINTS, False)
-    )
+    from .coordinator import SyrConnectLocalCoordinator
+    from .core.monitor import PATH_DISPATCHER
+    from .core.remote import RemoteSyrConnectServer
+    from .core.server import SyrConnectServer
 
-    # Provide sensible defaults for HTTPS cert/key if enabled but not set
-    if use_https:
-        if not cert_file:
-            cert_file = "/config/syr_cert.pem"
-        if not key_file:
-            key_file = "/config/syr_key.pem"
-        if not Path(cert_file).exists() or not Path(key_file).exists():
-            _LOGGER.warning(
-                "HTTPS disabled: cert/key not found (cert=%s, key=%s)",
-                cert_file,
-                key_file,
-            )
-            use_https = False
+    _LOGGER.info("Setting up SYR Connect Local integration")
 
-    # Create the server
-    server = SyrConnectServer(
-        http_port=http_port,
-        https_port=https_port,
-        use_https=use_https,
-        cert_file=cert_file,
-        key_file=key_file,
-        enable_debug_endpoints=debug_endpoints,
-    )
+    # Get configuration
+    config = get_entry_config(entry)
+
+    # Create the server, or connect to a standalone one
+    server: SyrConnectServer | RemoteSyrConnectServer
+    if server_url := config.get(CONF_SERVER_URL):
+        server = RemoteSyrConnectServer(
+            server_url,
+            config.get(CONF_API_TOKEN),
+            loop_monitor=config.get(CONF_LOOP_MONITOR, False),
+        )
+    else:
+        server = SyrConnectServer(
+            **_server_settings(config),
+            journal_path=hass.config.path(".storage", JOURNAL_FILE),
+        )
+
+    # One coordinator per device serial
+    coordinators: dict[str, SyrConnectLocalCoordinator] = {}
+
+    # Read the platforms' description tables now rather than on the first discovery
+    await hass.async_add_executor_job(platform_properties)
+
+    # Platforms are loaded the first time a device needs them, once the
+    # entry data the platforms read is stored
+    loaded_platforms: list[str] = []
+    setup_done = asyncio.Event()
+    # Serializes discoveries, so a platform is loaded once and sees each device once
+    discovery_lock = asyncio.Lock()
 
     # Set up device discovery callback
     async def on_device_discovered_async(serial: str, properties: dict[str, str]) -> None:
         """Handle device discovery asynchronously."""
         _LOGGER.info("Device discovered: %s", serial)
-        # Trigger coordinator update to create entities
-        await coordinator.async_request_refresh()
-        # Signal to platform listeners after coordinator has updated
-        async_dispatcher_send(hass, SIGNAL_NEW_DEVICE, serial)
+        await setup_done.wait()
+        async with discovery_lock:
+            if serial in coordinators or entry.entry_id not in hass.data.get(DOMAIN, {}):
+                return
+            coordinator = SyrConnectLocalCoordinator(hass, server, serial)
+            coordinators[serial] = coordinator
+            # Load device data before entities are created
+            await coordinator.async_refresh()
+            # Signal to platform listeners after coordinator has updated
+            started = time.perf_counter()
+            async_dispatcher_send(hass, SIGNAL_NEW_DEVICE, serial)
+            if server.monitor is not None:
+                # Entity creation by the platforms
+                server.monitor.observe(PATH_DISPATCHER, time.perf_counter() - started, serial)
+            # Platforms loaded now create the entities of all known devices
+            # in their setup, including this one
+            if new_platforms := [
+                platform
+                for platform in platforms_for_device(coordinator.data)
+                if platform not in loaded_platforms
+            ]:
+                _LOGGER.debug("Loading platforms %s for %s", new_platforms, serial)
+                loaded_platforms.extend(new_platforms)
+                # Forwarding after setup must hold the entry's setup lock (HA 2024.8+)
+                forward = getattr(
+                    hass.config_entries,
+                    "async_late_forward_entry_setups",
+                    hass.config_entries.async_forward_entry_setups,
+                )
+                await forward(entry, new_platforms)
 
     def on_device_discovered(serial: str, properties: dict[str, str]) -> None:
         """Handle device discovery."""
@@ -96,10 +194,35 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     def on_device_update(serial: str, properties: dict[str, str]) -> None:
         """Handle device update."""
         _LOGGER.debug("Device updated: %s", serial)
-        # Coordinator will poll on its own schedule
+        # Only the coordinator of this device is refreshed
+        if coordinator := coordinators.get(serial):
+            coordinator.async_handle_device_update()
+
+    def on_device_removed(serial: str) -> None:
+        """Mark the entities of an evicted device unavailable.
+
+        The coordinator is kept, so the entities recover when the device
+        checks in again.
+        """
+        if coordinator := coordinators.get(serial):
+            coordinator.async_set_update_error(
+                UpdateFailed(f"Device {serial} was evicted from the device table")
+            )
 
     server.on_device_discovered = on_device_discovered
     server.on_device_update = on_device_update
+    server.on_device_removed = on_device_removed
+
+    # Restore learned device capabilities and persist them when they change
+    store: Store[dict] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+    if stored := await store.async_load():
+        server.restore_state(stored)
+
+    def on_state_changed() -> None:
+        """Schedule saving server state."""
+        store.async_delay_save(server.export_state, STORAGE_SAVE_DELAY)
+
+    server.on_state_changed = on_state_changed
 
     # Start the server
     try:
@@ -108,53 +231,164 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.error("Failed to start server: %s", err)
         raise ConfigEntryNotReady(f"Failed to start server: {err}") from err
 
-    # Create coordinator
-    coordinator = SyrConnectLocalCoordinator(hass, server)
-
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
-
-    # Store coordinator and server
+    # Store coordinators and server
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
-        DATA_COORDINATOR: coordinator,
+        DATA_COORDINATORS: coordinators,
         DATA_SERVER: server,
+        DATA_STORE: store,
+        DATA_PLATFORMS: loaded_platforms,
     }
 
-    # Forward entry setup to platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Devices are only known once they check in; platforms are forwarded
+    # as discovered devices need them
+    setup_done.set()
 
     # Register services
-    await _async_setup_services(hass, coordinator)
+    await _async_setup_services(hass, entry, server)
+
+    # Apply option changes to the running server
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     _LOGGER.info("SYR Connect Local integration setup complete")
     return True
 
 
+def get_entry_config(entry: ConfigEntry) -> dict[str, Any]:
+    """Return the entry configuration, with options taking precedence over data."""
+    return {**entry.data, **entry.options}
+
+
+def _server_settings(config: dict[str, Any]) -> dict[str, Any]:
+    """Return SyrConnectServer settings for an entry configuration."""
+    use_https = config.get(CONF_USE_HTTPS, False)
+    cert_file = config.get(CONF_CERT_FILE)
+    key_file = config.get(CONF_KEY_FILE)
+
+    # Provide sensible defaults for HTTPS cert/key if enabled but not set
+    if use_https:
+        if not cert_file:
+            cert_file = "/config/syr_cert.pem"
+        if not key_file:
+            key_file = "/config/syr_key.pem"
+        if not Path(cert_file).exists() or not Path(key_file).exists():
+            _LOGGER.warning(
+                "HTTPS disabled: cert/key not found (cert=%s, key=%s)",
+                cert_file,
+                key_file,
+            )
+            use_https = False
+
+    return {
+        "http_port": config.get(CONF_HTTP_PORT, DEFAULT_HTTP_PORT),
+        "https_port": config.get(CONF_HTTPS_PORT, DEFAULT_HTTPS_PORT),
+        "use_https": use_https,
+        "cert_file": cert_file,
+        "key_file": key_file,
+        "enable_debug_endpoints": config.get(CONF_DEBUG_ENDPOINTS, False),
+        "tls_offload": config.get(CONF_TLS_OFFLOAD, False),
+        "unix_socket": config.get(CONF_UNIX_SOCKET) or None,
+        "trusted_proxies": config.get(CONF_TRUSTED_PROXIES),
+        "proxy_protocol": config.get(CONF_PROXY_PROTOCOL, False),
+        "device_expiry": config.get(CONF_DEVICE_EXPIRY, DEFAULT_DEVICE_EXPIRY) * 86400,
+        "device_capacity": config.get(CONF_DEVICE_CAPACITY, DEFAULT_DEVICE_CAPACITY),
+        "enable_stream": config.get(CONF_STREAM_ENDPOINT, False),
+        "enable_snapshot": config.get(CONF_SNAPSHOT_ENDPOINT, False),
+        "poll_hosts": config.get(CONF_POLL_HOSTS),
+        "cloud_mirror_url": config.get(CONF_CLOUD_MIRROR_URL) or None,
+        "dns_responder": config.get(CONF_DNS_RESPONDER, False),
+        "dns_address": config.get(CONF_DNS_ADDRESS) or None,
+        "dns_upstream": config.get(CONF_DNS_UPSTREAM) or None,
+        "dns_clients": config.get(CONF_DNS_CLIENTS) or None,
+        "loop_monitor": config.get(CONF_LOOP_MONITOR, False),
+        "profile_token": config.get(CONF_PROFILE_TOKEN) or None,
+    }
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Handle options update.
+
+    A local server is reconfigured in place, keeping its devices and pending
+    commands; switching to or from a standalone server needs a reload.
+    """
+    from .core.server import SyrConnectServer
+
+    server = hass.data[DOMAIN][entry.entry_id][DATA_SERVER]
+    config = get_entry_config(entry)
+    if config.get(CONF_SERVER_URL) or not isinstance(server, SyrConnectServer):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    await server.reconfigure(**_server_settings(config))
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.info("Unloading SYR Connect Local integration")
 
-    # Unload platforms
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    # Unload the platforms that were loaded
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, hass.data[DOMAIN][entry.entry_id][DATA_PLATFORMS]
+    )
 
     if unload_ok:
         # Stop the server
         data = hass.data[DOMAIN].pop(entry.entry_id)
         server: SyrConnectServer = data[DATA_SERVER]
         await server.stop()
+        for coordinator in data[DATA_COORDINATORS].values():
+            await coordinator.async_shutdown()
+        store: Store[dict] = data[DATA_STORE]
+        await store.async_save(server.export_state())
 
     return unload_ok
 
 
+async def async_remove_config_entry_device(
+    hass: HomeAssistant, entry: ConfigEntry, device_entry: dr.DeviceEntry
+) -> bool:
+    """Remove a device and tear down its coordinator."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    server: SyrConnectServer = data[DATA_SERVER]
+    coordinators: dict[str, SyrConnectLocalCoordinator] = data[DATA_COORDINATORS]
+
+    for domain, serial in device_entry.identifiers:
+        if domain != DOMAIN:
+            continue
+        server.remove_device(serial)
+        if coordinator := coordinators.pop(serial, None):
+            await coordinator.async_shutdown()
+    return True
+
+
 async def _async_setup_services(
-    hass: HomeAssistant, coordinator: SyrConnectLocalCoordinator
+    hass: HomeAssistant, entry: ConfigEntry, server: SyrConnectServer
 ) -> None:
     """Set up services for the integration."""
+    from datetime import datetime
+
+    from homeassistant.core import (
+        CALLBACK_TYPE,
+        ServiceCall,
+        ServiceResponse,
+        SupportsResponse,
+        callback,
+    )
+    from homeassistant.exceptions import HomeAssistantError
     from homeassistant.helpers import config_validation as cv
+    from homeassistant.helpers import device_registry as dr
+    from homeassistant.helpers.event import async_call_later
     import voluptuous as vol
 
-    from .const import SERVICE_START_REGENERATION, SERVICE_UPDATE_PARAMETER, SETTER_START_REGEN
+    from .const import (
+        SERVICE_BULK_UPDATE,
+        SERVICE_GET_SNAPSHOT,
+        SERVICE_START_REGENERATION,
+        SERVICE_UPDATE_PARAMETER,
+        SETTER_START_REGEN,
+    )
+    from .core.protocol import SyrProtocol
+    from .core.snapshot import build_snapshot
 
     async def async_start_regeneration(call) -> None:
         """Handle start regeneration service call."""
@@ -166,7 +400,7 @@ async def _async_setup_services(
             return
 
         # Queue the regeneration command (setSIR = "0" triggers regeneration)
-        success = coordinator.queue_command(serial, SETTER_START_REGEN, "0")
+        success = await server.async_queue_commands(serial, {SETTER_START_REGEN: "0"})
 
         if success:
             _LOGGER.info("Regeneration started for device %s", serial)
@@ -184,13 +418,96 @@ async def _async_setup_services(
             return
 
         # Queue the command
-        success = coordinator.queue_command(serial, parameter, str(value))
+        success = await server.async_queue_commands(serial, {parameter: str(value)})
 
         if success:
             _LOGGER.info("Parameter %s set to %s for device %s", parameter, value, serial)
         else:
             _LOGGER.error("Failed to update parameter for device %s", serial)
 
+    # Staggered deliveries still due are cancelled on unload
+    scheduled: set[CALLBACK_TYPE] = set()
+
+    @callback
+    def _cancel_scheduled() -> None:
+        """Cancel staggered deliveries that have not run yet."""
+        for cancel in scheduled:
+            cancel()
+        scheduled.clear()
+
+    entry.async_on_unload(_cancel_scheduled)
+
+    @callback
+    def _schedule_commands(serial: str, commands: dict[str, str], delay: float) -> None:
+        """Queue staggered commands once their delay has passed."""
+
+        async def _deliver_commands(_now: datetime) -> None:
+            scheduled.discard(cancel)
+            if not await server.async_queue_commands(serial, commands):
+                _LOGGER.error("Failed to deliver staggered commands to device %s", serial)
+
+        cancel = async_call_later(hass, delay, _deliver_commands)
+        scheduled.add(cancel)
+
+    async def async_bulk_update(call: ServiceCall) -> ServiceResponse:
+        """Handle bulk update service call."""
+        # Validate the setters once for all devices
+        commands = {name: str(value) for name, value in call.data["parameters"].items()}
+        invalid = [name for name in commands if not SyrProtocol.is_setter(name)]
+        if invalid:
+            raise HomeAssistantError(f"Not a setter command: {', '.join(invalid)}")
+
+        # Resolve targets; without a target field, every identified device is targeted
+        serials: list[str] = list(call.data.get("serials", []))
+        if "serials" not in call.data and "device_id" not in call.data:
+            serials = [
+                serial
+                for serial, device in server.get_all_devices().items()
+                if device.is_identified
+            ]
+        device_registry = dr.async_get(hass)
+        for device_id in call.data.get("device_id", []):
+            if device_entry := device_registry.async_get(device_id):
+                serials.extend(
+                    serial for domain, serial in device_entry.identifiers if domain == DOMAIN
+                )
+
+        stagger: float = call.data["stagger"]
+        results: dict[str, dict[str, object]] = {}
+        immediate: list[str] = []
+        delay = 0.0
+        for serial in dict.fromkeys(serials):
+            if server.get_device(serial) is None:
+                results[serial] = {"status": "unknown_device"}
+                continue
+
+            if delay:
+                _schedule_commands(serial, commands, delay)
+                results[serial] = {"status": "scheduled", "delay": delay}
+            else:
+                immediate.append(serial)
+            delay += stagger
+
+        # Report what the server accepted, not what was attempted
+        outcomes = await asyncio.gather(
+            *(server.async_queue_commands(serial, commands) for serial in immediate)
+        )
+        for serial, queued in zip(immediate, outcomes):
+            results[serial] = {"status": "queued" if queued else "failed"}
+
+        _LOGGER.info(
+            "Bulk update of %s queued for %d devices",
+            ", ".join(commands),
+            sum(1 for result in results.values() if result["status"] in ("queued", "scheduled")),
+        )
+        return {"results": results}
+
+    async def async_get_snapshot(call: ServiceCall) -> ServiceResponse:
+        """Return typed values of all or selected devices."""
+        return build_snapshot(
+            server.get_all_devices(), call.data.get("serials"), call.data.get("fields")
+        )
+
     # Register services
     hass.services.async_register(
         DOMAIN,
@@ -216,3 +533,35 @@ async def _async_setup_services(
             }
         ),
     )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_UPDATE,
+        async_bulk_update,
+        schema=vol.Schema(
+            {
+                vol.Optional("serials"): vol.All(cv.ensure_list, [cv.string]),
+                vol.Optional("device_id"): vol.All(cv.ensure_list, [cv.string]),
+                vol.Required("parameters"): vol.All(
+                    dict, vol.Length(min=1), {cv.string: cv.string}
+                ),
+                vol.Optional("stagger", default=0): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, max=3600)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SNAPSHOT,
+        async_get_snapshot,
+        schema=vol.Schema(
+            {
+                vol.Optional("serials"): vol.All(cv.ensure_list, [cv.string]),
+                vol.Optional("fields"): vol.All(cv.ensure_list, [cv.string]),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -1,7 +1,8 @@
 """Binary sensor platform for SYR Connect Local integration."""
 from __future__ import annotations
 
-import logging
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
 from homeassistant.components.binary_sensor import (
@@ -10,88 +11,151 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
-    DATA_COORDINATOR,
-    DOMAIN,
     PROPERTY_ALARM,
-    PROPERTY_FIRMWARE,
     PROPERTY_FLOW,
-    PROPERTY_NAME,
     PROPERTY_REGEN_PERIOD_DAYS,
     PROPERTY_REGEN_TANK1,
     PROPERTY_REGEN_TANK2,
     PROPERTY_REGEN_TANK3,
-    PROPERTY_SERIAL,
-    PROPERTY_TYPE,
-    PROPERTY_VERSION,
-    SIGNAL_NEW_DEVICE,
 )
 from .coordinator import SyrConnectLocalCoordinator
+from .entity import SyrEntity, SyrEntityDescription, async_setup_platform_entities
 
-_LOGGER = logging.getLogger(__name__)
+# According to DVGW (DIN 1988 / DIN EN 806 / DIN EN 1717), the regeneration
+# interval must be maximum 4 days
+DVGW_MAX_INTERVAL_DAYS = 4
 
 
+def _flag(value: Any) -> bool | None:
+    """Return a boolean or "1"/"0" value as a boolean."""
+    if isinstance(value, bool):
+        return value
+    # Handle empty strings as None
+    if value == "":
+        return None
+    # Handle string values
+    if value == "1":
+        return True
+    if value == "0":
+        return False
+    return None
+
+
+def _flow_active(value: Any) -> bool | None:
+    """Return true if water is flowing."""
+    if value is not None and value != "":
+        try:
+            return int(value) > 0
+        except (ValueError, TypeError):
+            return None
+    return None
+
+
+def _alarm_active(value: Any) -> bool | None:
+    """Return true if there is an alarm."""
+    # Alarm is active if the value is not empty
+    if value is not None:
+        return bool(value and value != "")
+    return None
+
+
+def _interval_days(value: Any) -> int | None:
+    """Return the regeneration interval in days."""
+    if value is not None and value != "":
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return None
+    return None
+
+
+def _dvgw_exceeded(value: Any) -> bool | None:
+    """Return true if regeneration interval exceeds DVGW maximum (4 days)."""
+    interval_days = _interval_days(value)
+    if interval_days is None:
+        return None
+    # Return True (problem) if interval exceeds 4 days
+    return interval_days > DVGW_MAX_INTERVAL_DAYS
 
-def _create_binary_entities_for_serial(coordinator: SyrConnectLocalCoordinator, serial: str) -> list[BinarySensorEntity]:
-    """Create all binary sensor entities for a given device serial."""
-    entities: list[BinarySensorEntity] = []
-    device_data = coordinator.get_device_data(serial)
-
-    # Regeneration active sensors (one per tank)
-    entities.append(
-        SyrBinarySensor(
-            coordinator,
-            serial,
-            PROPERTY_REGEN_TANK1,
-            "Regeneration Active Tank 1",
-            BinarySensorDeviceClass.RUNNING,
-        )
-    )
 
-    # Add tank 2 and 3 if they exist or data not yet available
-    if device_data is None or device_data.get(PROPERTY_REGEN_TANK2) is not None:
-        entities.append(
-            SyrBinarySensor(
-                coordinator,
-                serial,
-                PROPERTY_REGEN_TANK2,
-                "Regeneration Active Tank 2",
-                BinarySensorDeviceClass.RUNNING,
-            )
-        )
+def _dvgw_attributes(value: Any) -> dict[str, Any] | None:
+    """Return the regeneration interval and the DVGW limit."""
+    interval_days = _interval_days(value)
+    if interval_days is None:
+        return None
+    return {
+        "current_interval_days": interval_days,
+        "max_compliant_interval_days": DVGW_MAX_INTERVAL_DAYS,
+        "regulation": "DVGW (DIN 1988 / DIN EN 806 / DIN EN 1717)",
+    }
 
-    if device_data is None or device_data.get(PROPERTY_REGEN_TANK3) is not None:
-        entities.append(
-            SyrBinarySensor(
-                coordinator,
-                serial,
-                PROPERTY_REGEN_TANK3,
-                "Regeneration Active Tank 3",
-                BinarySensorDeviceClass.RUNNING,
-            )
-        )
 
-    # Flow active sensor
-    entities.append(
-        SyrFlowBinarySensor(coordinator, serial)
-    )
+@dataclass(frozen=True)
+class SyrBinarySensorEntityDescription(SyrEntityDescription):
+    """Describe a SYR binary sensor."""
 
-    # Alarm sensor
-    entities.append(
-        SyrAlarmBinarySensor(coordinator, serial)
-    )
+    device_class: BinarySensorDeviceClass | None = None
+    is_on_fn: Callable[[Any], bool | None] = _flag
+    attributes_fn: Callable[[Any], dict[str, Any] | None] | None = None
 
-    # DVGW compliance sensor for regeneration interval
-    if device_data is None or device_data.get(PROPERTY_REGEN_PERIOD_DAYS) is not None:
-        entities.append(
-            SyrDVGWComplianceBinarySensor(coordinator, serial)
-        )
 
-    return entities
+# Binary sensors are created before the first data too, disabled until the
+# device reports the property
+BINARY_SENSORS: tuple[SyrBinarySensorEntityDescription, ...] = (
+    # Regeneration active sensors (one per tank)
+    SyrBinarySensorEntityDescription(
+        key=PROPERTY_REGEN_TANK1,
+        name="Regeneration Active Tank 1",
+        device_class=BinarySensorDeviceClass.RUNNING,
+        created_without_data=True,
+    ),
+    SyrBinarySensorEntityDescription(
+        key=PROPERTY_REGEN_TANK2,
+        name="Regeneration Active Tank 2",
+        device_class=BinarySensorDeviceClass.RUNNING,
+        requires=(PROPERTY_REGEN_TANK2,),
+        created_without_data=True,
+    ),
+    SyrBinarySensorEntityDescription(
+        key=PROPERTY_REGEN_TANK3,
+        name="Regeneration Active Tank 3",
+        device_class=BinarySensorDeviceClass.RUNNING,
+        requires=(PROPERTY_REGEN_TANK3,),
+        created_without_data=True,
+    ),
+    # Flow active sensor
+    SyrBinarySensorEntityDescription(
+        key=PROPERTY_FLOW,
+        name="Flow Active",
+        device_class=BinarySensorDeviceClass.RUNNING,
+        is_on_fn=_flow_active,
+        created_without_data=True,
+    ),
+    # Alarm sensor
+    SyrBinarySensorEntityDescription(
+        key=PROPERTY_ALARM,
+        name="Alarm",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        is_on_fn=_alarm_active,
+        created_without_data=True,
+    ),
+    # DVGW compliance sensor for regeneration interval: on (problem) when
+    # the interval exceeds 4 days. Its own unique ID avoids a conflict with
+    # the number entity for the same property.
+    SyrBinarySensorEntityDescription(
+        key=PROPERTY_REGEN_PERIOD_DAYS,
+        name="DVGW Regeneration Interval Compliance",
+        unique_id="dvgw_regen_compliance",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        is_on_fn=_dvgw_exceeded,
+        attributes_fn=_dvgw_attributes,
+        requires=(PROPERTY_REGEN_PERIOD_DAYS,),
+        created_without_data=True,
+    ),
+)
 
 
 async def async_setup_entry(
@@ -100,214 +164,37 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up SYR Connect Local binary sensors."""
-    coordinator: SyrConnectLocalCoordinator = hass.data[DOMAIN][entry.entry_id][
-        DATA_COORDINATOR
-    ]
-
-    entities: list[BinarySensorEntity] = []
-
-    # Create binary sensors for each device
-    for serial in coordinator.devices:
-        entities.extend(_create_binary_entities_for_serial(coordinator, serial))
-
-    async_add_entities(entities)
-
-    # Listen for newly discovered devices and add entities dynamically
-    async def _handle_new_device(serial: str) -> None:
-        _LOGGER.info("Binary sensor platform: new device signal for %s", serial)
-        new_entities = _create_binary_entities_for_serial(coordinator, serial)
-        if new_entities:
-            _LOGGER.info("Binary sensor platform: adding %d entities for %s", len(new_entities), serial)
-            async_add_entities(new_entities)
-
-    async_dispatcher_connect(hass, SIGNAL_NEW_DEVICE, _handle_new_device)
+    async_setup_platform_entities(
+        hass, entry, async_add_entities, "Binary sensor", BINARY_SENSORS, SyrBinarySensor
+    )
 
 
-class SyrBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class SyrBinarySensor(SyrEntity, BinarySensorEntity):
     """Representation of a SYR binary sensor."""
 
+    _description: SyrBinarySensorEntityDescription
+
     def __init__(
         self,
         coordinator: SyrConnectLocalCoordinator,
-        serial: str,
-        property_key: str,
-        name: str,
-        device_class: BinarySensorDeviceClass | None = None,
+        description: SyrBinarySensorEntityDescription,
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
-        self._serial = serial
-        self._property_key = property_key
-        self._attr_name = name
-        self._attr_device_class = device_class
-        self._attr_unique_id = f"{serial}_{property_key}"
-
-        # Set device info
-        device_data = coordinator.get_device_data(serial)
-        device_name = device_data.get(PROPERTY_NAME, "SYR Device") if device_data else "SYR Device"
-        firmware = device_data.get(PROPERTY_FIRMWARE, "") if device_data else ""
-        device_type = device_data.get(PROPERTY_TYPE, "") if device_data else ""
-        version = device_data.get(PROPERTY_VERSION, "") if device_data else ""
-
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, serial)},
-            "name": device_name,
-            "manufacturer": "SYR",
-            "model": f"{firmware} Type {device_type}" if firmware and device_type else "LEX Plus",
-            "sw_version": version,
-        }
-        
-        # Enable entity by default only if property is available from device
-        self._attr_entity_registry_enabled_default = (
-            device_data is not None and device_data.get(property_key) is not None
-        )
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        if not self.coordinator.last_update_success or self._serial not in self.coordinator.devices:
-            return False
-        
-        # Entity is available only if the property exists in device data
-        device_data = self.coordinator.get_device_data(self._serial)
-        return device_data is not None and device_data.get(self._property_key) is not None
+        super().__init__(coordinator, description)
+        self._attr_device_class = description.device_class
 
     @property
     def is_on(self) -> bool | None:
         """Return true if the binary sensor is on."""
-        device_data = self.coordinator.get_device_data(self._serial)
-        if device_data:
-            value = device_data.get(self._property_key)
-            if isinstance(value, bool):
-                return value
-            # Handle empty strings as None
-            if value == "":
-                return None
-            # Handle string values
-            if value == "1":
-                return True
-            if value == "0":
-                return False
-        return None
-
-
-class SyrFlowBinarySensor(SyrBinarySensor):
-    """Binary sensor for water flow."""
-
-    def __init__(
-        self,
-        coordinator: SyrConnectLocalCoordinator,
-        serial: str,
-    ) -> None:
-        """Initialize the flow binary sensor."""
-        super().__init__(
-            coordinator,
-            serial,
-            PROPERTY_FLOW,
-            "Flow Active",
-            BinarySensorDeviceClass.RUNNING,
-        )
-
-    @property
-    def is_on(self) -> bool | None:
-        """Return true if water is flowing."""
-        device_data = self.coordinator.get_device_data(self._serial)
+        device_data = self.coordinator.data
         if device_data:
-            flow = device_data.get(self._property_key)
-            if flow is not None and flow != "":
-                try:
-                    return int(flow) > 0
-                except (ValueError, TypeError):
-                    return None
-        return None
-
-
-class SyrAlarmBinarySensor(SyrBinarySensor):
-    """Binary sensor for alarm status."""
-
-    def __init__(
-        self,
-        coordinator: SyrConnectLocalCoordinator,
-        serial: str,
-    ) -> None:
-        """Initialize the alarm binary sensor."""
-        super().__init__(
-            coordinator,
-            serial,
-            PROPERTY_ALARM,
-            "Alarm",
-            BinarySensorDeviceClass.PROBLEM,
-        )
-
-    @property
-    def is_on(self) -> bool | None:
-        """Return true if there is an alarm."""
-        device_data = self.coordinator.get_device_data(self._serial)
-        if device_data:
-            alarm = device_data.get(self._property_key)
-            # Alarm is active if the value is not empty
-            if alarm is not None:
-                return bool(alarm and alarm != "")
-        return None
-
-
-class SyrDVGWComplianceBinarySensor(SyrBinarySensor):
-    """Binary sensor for DVGW regeneration interval compliance.
-    
-    According to DVGW (DIN 1988 / DIN EN 806 / DIN EN 1717), the regeneration
-    interval must be maximum 4 days. This sensor warns when the interval exceeds
-    this regulation.
-    
-    State Values:
-    - ON (True): Regeneration interval exceeds 4 days (non-compliant, problem state)
-    - OFF (False): Regeneration interval is 4 days or less (compliant, normal state)
-    """
-
-    def __init__(
-        self,
-        coordinator: SyrConnectLocalCoordinator,
-        serial: str,
-    ) -> None:
-        """Initialize the DVGW compliance binary sensor."""
-        super().__init__(
-            coordinator,
-            serial,
-            PROPERTY_REGEN_PERIOD_DAYS,
-            "DVGW Regeneration Interval Compliance",
-            BinarySensorDeviceClass.PROBLEM,
-        )
-        # Override unique_id to avoid conflict with number entity
-        self._attr_unique_id = f"{serial}_dvgw_regen_compliance"
-
-    @property
-    def is_on(self) -> bool | None:
-        """Return true if regeneration interval exceeds DVGW maximum (4 days)."""
-        device_data = self.coordinator.get_device_data(self._serial)
-        if device_data:
-            interval = device_data.get(self._property_key)
-            if interval is not None and interval != "":
-                try:
-                    interval_days = int(interval)
-                    # Return True (problem) if interval exceeds 4 days
-                    return interval_days > 4
-                except (ValueError, TypeError):
-                    return None
+            return self._description.is_on_fn(device_data.get(self._property_key))
         return None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
         """Return extra state attributes."""
-        device_data = self.coordinator.get_device_data(self._serial)
-        if device_data:
-            interval = device_data.get(self._property_key)
-            if interval is not None and interval != "":
-                try:
-                    interval_days = int(interval)
-                    return {
-                        "current_interval_days": interval_days,
-                        "max_compliant_interval_days": 4,
-                        "regulation": "DVGW (DIN 1988 / DIN EN 806 / DIN EN 1717)",
-                    }
-                except (ValueError, TypeError):
-                    pass
+        device_data = self.coordinator.data
+        if device_data and self._description.attributes_fn is not None:
+            return self._description.attributes_fn(device_data.get(self._property_key))
         return None
@@ -1,6 +1,7 @@
 """Config flow for SYR Connect Local integration."""
 from __future__ import annotations
 
+import ipaddress
 import logging
 from typing import Any
 
@@ -10,15 +11,37 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
+from . import get_entry_config
 from .const import (
+    CONF_API_TOKEN,
+    CONF_CLOUD_MIRROR_URL,
     CONF_HTTPS_PORT,
     CONF_HTTP_PORT,
     CONF_USE_HTTPS,
     CONF_DEBUG_ENDPOINTS,
+    CONF_DEVICE_CAPACITY,
+    CONF_DEVICE_EXPIRY,
+    CONF_DNS_ADDRESS,
+    CONF_DNS_CLIENTS,
+    CONF_DNS_RESPONDER,
+    CONF_DNS_UPSTREAM,
+    CONF_POLL_HOSTS,
+    CONF_PROXY_PROTOCOL,
+    CONF_SERVER_URL,
+    CONF_STREAM_ENDPOINT,
+    CONF_SNAPSHOT_ENDPOINT,
+    CONF_LOOP_MONITOR,
+    CONF_PROFILE_TOKEN,
+    CONF_TLS_OFFLOAD,
+    CONF_TRUSTED_PROXIES,
+    CONF_UNIX_SOCKET,
+    DEFAULT_DEVICE_CAPACITY,
+    DEFAULT_DEVICE_EXPIRY,
     DEFAULT_HTTPS_PORT,
     DEFAULT_HTTP_PORT,
     DOMAIN,
 )
+from .core.proxy import parse_trusted_proxies
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -71,7 +94,10 @@ class SyrConnectLocalConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_HTTPS_PORT, default=DEFAULT_HTTPS_PORT
                     ): vol.Coerce(int),
                     vol.Optional(CONF_USE_HTTPS, default=False): bool,
+                    vol.Optional(CONF_TLS_OFFLOAD, default=False): bool,
                     vol.Optional(CONF_DEBUG_ENDPOINTS, default=False): bool,
+                    vol.Optional(CONF_SERVER_URL): str,
+                    vol.Optional(CONF_API_TOKEN): str,
                 }
             ),
             errors=errors,
@@ -109,7 +135,24 @@ class SyrConnectLocalOptionsFlow(config_entries.OptionsFlow):
                     errors["http_port"] = "invalid_port"
                 elif not (1 <= https_port <= 65535):
                     errors["https_port"] = "invalid_port"
+                elif not _valid_proxies(user_input.get(CONF_TRUSTED_PROXIES)):
+                    errors[CONF_TRUSTED_PROXIES] = "invalid_proxies"
+                elif not _valid_addresses(user_input.get(CONF_DNS_ADDRESS)):
+                    errors[CONF_DNS_ADDRESS] = "invalid_address"
+                elif not _valid_proxies(user_input.get(CONF_DNS_CLIENTS)):
+                    errors[CONF_DNS_CLIENTS] = "invalid_network"
                 else:
+                    # A cleared field must override the value from the initial setup
+                    user_input.setdefault(CONF_SERVER_URL, "")
+                    user_input.setdefault(CONF_API_TOKEN, "")
+                    user_input.setdefault(CONF_UNIX_SOCKET, "")
+                    user_input.setdefault(CONF_TRUSTED_PROXIES, "")
+                    user_input.setdefault(CONF_POLL_HOSTS, "")
+                    user_input.setdefault(CONF_CLOUD_MIRROR_URL, "")
+                    user_input.setdefault(CONF_DNS_ADDRESS, "")
+                    user_input.setdefault(CONF_DNS_UPSTREAM, "")
+                    user_input.setdefault(CONF_DNS_CLIENTS, "")
+                    user_input.setdefault(CONF_PROFILE_TOKEN, "")
                     return self.async_create_entry(title="", data=user_input)
 
             except Exception:  # pylint: disable=broad-except
@@ -117,10 +160,29 @@ class SyrConnectLocalOptionsFlow(config_entries.OptionsFlow):
                 errors["base"] = "unknown"
 
         # Get current values
-        current_http = self._config_entry.data.get(CONF_HTTP_PORT, DEFAULT_HTTP_PORT)
-        current_https = self._config_entry.data.get(CONF_HTTPS_PORT, DEFAULT_HTTPS_PORT)
-        current_use_https = self._config_entry.data.get(CONF_USE_HTTPS, False)
-        current_debug = self._config_entry.data.get(CONF_DEBUG_ENDPOINTS, False)
+        config = get_entry_config(self._config_entry)
+        current_http = config.get(CONF_HTTP_PORT, DEFAULT_HTTP_PORT)
+        current_https = config.get(CONF_HTTPS_PORT, DEFAULT_HTTPS_PORT)
+        current_use_https = config.get(CONF_USE_HTTPS, False)
+        current_tls_offload = config.get(CONF_TLS_OFFLOAD, False)
+        current_debug = config.get(CONF_DEBUG_ENDPOINTS, False)
+        current_server_url = config.get(CONF_SERVER_URL)
+        current_api_token = config.get(CONF_API_TOKEN)
+        current_unix_socket = config.get(CONF_UNIX_SOCKET)
+        current_trusted_proxies = config.get(CONF_TRUSTED_PROXIES)
+        current_proxy_protocol = config.get(CONF_PROXY_PROTOCOL, False)
+        current_device_expiry = config.get(CONF_DEVICE_EXPIRY, DEFAULT_DEVICE_EXPIRY)
+        current_device_capacity = config.get(CONF_DEVICE_CAPACITY, DEFAULT_DEVICE_CAPACITY)
+        current_stream = config.get(CONF_STREAM_ENDPOINT, False)
+        current_snapshot = config.get(CONF_SNAPSHOT_ENDPOINT, False)
+        current_loop_monitor = config.get(CONF_LOOP_MONITOR, False)
+        current_profile_token = config.get(CONF_PROFILE_TOKEN)
+        current_poll_hosts = config.get(CONF_POLL_HOSTS)
+        current_cloud_mirror_url = config.get(CONF_CLOUD_MIRROR_URL)
+        current_dns_responder = config.get(CONF_DNS_RESPONDER, False)
+        current_dns_address = config.get(CONF_DNS_ADDRESS)
+        current_dns_upstream = config.get(CONF_DNS_UPSTREAM)
+        current_dns_clients = config.get(CONF_DNS_CLIENTS)
 
         return self.async_show_form(
             step_id="init",
@@ -131,8 +193,82 @@ class SyrConnectLocalOptionsFlow(config_entries.OptionsFlow):
                         int
                     ),
                     vol.Optional(CONF_USE_HTTPS, default=current_use_https): bool,
+                    vol.Optional(CONF_TLS_OFFLOAD, default=current_tls_offload): bool,
                     vol.Optional(CONF_DEBUG_ENDPOINTS, default=current_debug): bool,
+                    vol.Optional(CONF_STREAM_ENDPOINT, default=current_stream): bool,
+                    vol.Optional(CONF_SNAPSHOT_ENDPOINT, default=current_snapshot): bool,
+                    vol.Optional(
+                        CONF_SERVER_URL,
+                        description={"suggested_value": current_server_url},
+                    ): str,
+                    vol.Optional(
+                        CONF_API_TOKEN,
+                        description={"suggested_value": current_api_token},
+                    ): str,
+                    vol.Optional(
+                        CONF_UNIX_SOCKET,
+                        description={"suggested_value": current_unix_socket},
+                    ): str,
+                    vol.Optional(
+                        CONF_TRUSTED_PROXIES,
+                        description={"suggested_value": current_trusted_proxies},
+                    ): str,
+                    vol.Optional(
+                        CONF_PROXY_PROTOCOL, default=current_proxy_protocol
+                    ): bool,
+                    vol.Optional(
+                        CONF_POLL_HOSTS,
+                        description={"suggested_value": current_poll_hosts},
+                    ): str,
+                    vol.Optional(
+                        CONF_CLOUD_MIRROR_URL,
+                        description={"suggested_value": current_cloud_mirror_url},
+                    ): str,
+                    vol.Optional(CONF_DNS_RESPONDER, default=current_dns_responder): bool,
+                    vol.Optional(
+                        CONF_DNS_ADDRESS,
+                        description={"suggested_value": current_dns_address},
+                    ): str,
+                    vol.Optional(
+                        CONF_DNS_UPSTREAM,
+                        description={"suggested_value": current_dns_upstream},
+                    ): str,
+                    vol.Optional(
+                        CONF_DNS_CLIENTS,
+                        description={"suggested_value": current_dns_clients},
+                    ): str,
+                    vol.Optional(
+                        CONF_DEVICE_EXPIRY, default=current_device_expiry
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_DEVICE_CAPACITY, default=current_device_capacity
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Optional(CONF_LOOP_MONITOR, default=current_loop_monitor): bool,
+                    vol.Optional(
+                        CONF_PROFILE_TOKEN,
+                        description={"suggested_value": current_profile_token},
+                    ): str,
                 }
             ),
             errors=errors,
         )
+
+
+def _valid_addresses(value: str | None) -> bool:
+    """Return True if value is empty or a comma-separated list of IP addresses."""
+    try:
+        for item in (value or "").split(","):
+            if item.strip():
+                ipaddress.ip_address(item.strip())
+    except ValueError:
+        return False
+    return True
+
+
+def _valid_proxies(value: str | None) -> bool:
+    """Return True if value is a valid comma-separated list of addresses/networks."""
+    try:
+        parse_trusted_proxies(value)
+    except ValueError:
+        return False
+    return True
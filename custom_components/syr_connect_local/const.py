@@ -10,10 +10,33 @@ CONF_CERT_FILE: Final = "cert_file"
 CONF_KEY_FILE: Final = "key_file"
 CONF_USE_HTTPS: Final = "use_https"
 CONF_DEBUG_ENDPOINTS: Final = "debug_endpoints"
+CONF_SERVER_URL: Final = "server_url"
+CONF_TLS_OFFLOAD: Final = "tls_offload"
+CONF_UNIX_SOCKET: Final = "unix_socket"
+CONF_TRUSTED_PROXIES: Final = "trusted_proxies"
+CONF_PROXY_PROTOCOL: Final = "proxy_protocol"
+CONF_DEVICE_EXPIRY: Final = "device_expiry"
+CONF_DEVICE_CAPACITY: Final = "device_capacity"
+CONF_STREAM_ENDPOINT: Final = "stream_endpoint"
+CONF_SNAPSHOT_ENDPOINT: Final = "snapshot_endpoint"
+CONF_LOOP_MONITOR: Final = "loop_monitor"
+CONF_PROFILE_TOKEN: Final = "profile_token"
+CONF_POLL_HOSTS: Final = "poll_hosts"
+CONF_CLOUD_MIRROR_URL: Final = "cloud_mirror_url"
+CONF_DNS_RESPONDER: Final = "dns_responder"
+CONF_DNS_ADDRESS: Final = "dns_address"
+CONF_DNS_UPSTREAM: Final = "dns_upstream"
+CONF_DNS_CLIENTS: Final = "dns_clients"
+CONF_API_TOKEN: Final = "api_token"
 
 # Default values
 DEFAULT_HTTP_PORT: Final = 80
 DEFAULT_HTTPS_PORT: Final = 443
+DEFAULT_API_PORT: Final = 8124
+DEFAULT_DNS_PORT: Final = 53
+DEFAULT_DEVICE_EXPIRY: Final = 30  # days
+# Device table capacity; keeps memory bounded when something posts random serials
+DEFAULT_DEVICE_CAPACITY: Final = 256
 DEFAULT_NAME: Final = "SYR Connect Local"
 
 # Server domains to handle
@@ -29,6 +52,9 @@ ENDPOINT_BASIC: Final = "/WebServices/SyrConnectLimexWebService.asmx/GetBasicCom
 ENDPOINT_ALL: Final = "/WebServices/SyrConnectLimexWebService.asmx/GetAllCommands"
 ENDPOINT_BASIC_ALT: Final = "/GetBasicCommands"
 ENDPOINT_ALL_ALT: Final = "/GetAllCommands"
+ENDPOINT_STREAM: Final = "/api/stream"
+ENDPOINT_PROFILE: Final = "/debug/profile"
+ENDPOINT_SNAPSHOT: Final = "/api/snapshot"
 
 # Property mappings for sensors
 # Basic device information
@@ -388,6 +414,130 @@ NETWORK_PROPERTIES = [
     PROPERTY_TIMEZONE,
 ]
 
+# Command priorities
+COMMAND_PRIORITY_LOW: Final = -1  # Setters requested by the SYR cloud (mirror mode)
+COMMAND_PRIORITY_NORMAL: Final = 0
+COMMAND_PRIORITY_HIGH: Final = 1
+
+# Setters that skip the regular poll and are delivered in a minimal response
+HIGH_PRIORITY_SETTERS: Final = frozenset([SETTER_VALVE_SHUTOFF])
+
+# Getters requested alongside high-priority setters
+FAST_LANE_PROPERTIES: Final = [
+    PROPERTY_SERIAL,
+    PROPERTY_VALVE_SHUTOFF,
+    PROPERTY_VALVE_STATUS,
+    PROPERTY_ALARM,
+]
+
+# Getters that are never pruned from responses, even if a device leaves them empty
+# (identity, alarm/status messages and the valve state are empty or rare by design)
+CAPABILITY_PROTECTED_PROPERTIES: Final = frozenset(
+    [
+        *BASIC_COMMANDS,
+        PROPERTY_ALARM,
+        PROPERTY_STATUS,
+        PROPERTY_VALVE_SHUTOFF,
+        PROPERTY_VALVE_STATUS,
+    ]
+)
+
+# Number of consecutive empty/missing answers before a getter is considered unsupported
+CAPABILITY_MISS_THRESHOLD: Final = 3
+
+# Every Nth response to a model requests its unsupported getters again, so a
+# getter dropped after transient empty answers is picked up again
+CAPABILITY_REPROBE_INTERVAL: Final = 50
+
+# Device identification states
+IDENT_STATE_NEW: Final = "new"  # Checked in, identity getters not yet received
+IDENT_STATE_IDENTIFYING: Final = "identifying"  # Identity known, full property set requested
+IDENT_STATE_IDENTIFIED: Final = "identified"  # Full property set received, device announced
+
+# Seconds without a check-in after which a device's entities become unavailable
+DEVICE_STALE_TIMEOUT: Final = 300
+
+# Device table limits
+UNIDENTIFIED_DEVICE_TTL: Final = 900  # seconds an unidentified serial is kept without a check-in
+DEVICE_SWEEP_INTERVAL: Final = 300  # seconds between sweeps for expired devices
+
+# Persistent storage
+STORAGE_KEY: Final = f"{DOMAIN}.state"
+STORAGE_VERSION: Final = 1
+STORAGE_SAVE_DELAY: Final = 30  # seconds
+
+# TLS 1.3 session tickets issued per handshake, for session resumption
+TLS_NUM_TICKETS: Final = 2
+
+# Seconds between checks of the certificate and key files for changes
+CERT_WATCH_INTERVAL: Final = 60
+
+# Admission control for the device listeners
+ADMISSION_MAX_CONNECTIONS: Final = 512
+ADMISSION_MAX_CONNECTIONS_PER_IP: Final = 8
+ADMISSION_HEADER_TIMEOUT: Final = 10  # seconds until the request head (or TLS handshake) is complete
+ADMISSION_REQUEST_TIMEOUT: Final = 30  # seconds to read the body and answer
+ADMISSION_KEEPALIVE_TIMEOUT: Final = 15  # seconds an idle keep-alive connection is kept
+ADMISSION_MAX_REQUEST_SIZE: Final = 64 * 1024  # bytes
+ADMISSION_RATE: Final = 5.0  # requests per second and client address
+ADMISSION_BURST: Final = 20
+ADMISSION_MAX_TRACKED_CLIENTS: Final = 4096
+
+# Active polling of devices with a local JSON API
+POLL_DEFAULT_PORT: Final = 5333
+POLL_DEFAULT_PATH: Final = "/safe-tec"
+POLL_INTERVAL_MIN: Final = 10  # seconds
+POLL_INTERVAL_MAX: Final = 120  # seconds
+POLL_CONCURRENCY: Final = 4  # devices polled at the same time
+POLL_TIMEOUT: Final = 10  # seconds per request
+
+# Cloud mirror
+MIRROR_QUEUE_SIZE: Final = 64  # check-ins waiting for the upstream before the oldest is dropped
+MIRROR_MAX_ATTEMPTS: Final = 3
+MIRROR_RETRY_DELAY: Final = 2  # seconds, doubled on each retry
+MIRROR_TIMEOUT: Final = 15  # seconds per upstream request
+
+# DNS responder for HANDLED_DOMAINS
+DNS_TTL: Final = 300  # seconds, for answers with this host's address
+DNS_CACHE_SIZE: Final = 1024
+DNS_CACHE_MAX_TTL: Final = 3600  # seconds an upstream answer is cached at most
+DNS_FORWARD_TIMEOUT: Final = 5  # seconds to wait for the upstream resolver
+DNS_MAX_PENDING: Final = 256  # forwarded queries awaiting an answer
+
+# Command journal
+JOURNAL_FILE: Final = f"{DOMAIN}.commands"  # in .storage
+JOURNAL_FLUSH_DELAY: Final = 0.05  # seconds records are batched before a write
+JOURNAL_COMPACT_THRESHOLD: Final = 1000  # records before the journal is rewritten
+
+# Request logging
+ACCESS_LOG_SIZE: Final = 200  # most recent requests kept in memory for diagnostics
+LOG_THROTTLE_INTERVAL: Final = 300  # seconds between repeats of a per-device message
+LOG_THROTTLE_KEYS: Final = 512
+
+# Event loop monitor
+LOOP_MONITOR_INTERVAL: Final = 0.1  # seconds; blocks longer than this are always caught
+LOOP_LAG_THRESHOLD: Final = 0.1  # seconds of lag recorded as a spike
+SLOW_PATH_THRESHOLD: Final = 0.05  # seconds an integration code path may take
+LOOP_LAG_SAMPLES: Final = 1200  # lag samples kept for percentiles (2 minutes)
+LOOP_MONITOR_HISTORY: Final = 50  # slow paths and lag spikes kept
+
+# Profiling endpoint
+PROFILE_DEFAULT_DURATION: Final = 10  # seconds
+PROFILE_MAX_DURATION: Final = 120  # seconds
+PROFILE_SAMPLE_INTERVAL: Final = 0.005  # seconds between stack samples
+PROFILE_TOP: Final = 40  # functions/allocation sites reported
+
+# Snapshot endpoint
+SNAPSHOT_CACHE_SIZE: Final = 32  # encoded bodies kept, one per selection and format
+
+# Live device stream
+STREAM_QUEUE_SIZE: Final = 256  # events buffered per subscriber before it is resynced
+STREAM_KEEPALIVE_INTERVAL: Final = 15  # seconds
+
+# Standalone server client
+REMOTE_POLL_TIMEOUT: Final = 30  # seconds
+REMOTE_RETRY_DELAY: Final = 10  # seconds
+
 # Signals
 SIGNAL_NEW_DEVICE: Final = f"{DOMAIN}_new_device"
 SIGNAL_DEVICE_UPDATE: Final = f"{DOMAIN}_device_update"
@@ -401,8 +551,12 @@ EVENT_DEVICE_CONNECTED: Final = f"{DOMAIN}_device_connected"
 # Service names
 SERVICE_START_REGENERATION: Final = "start_regeneration"
 SERVICE_UPDATE_PARAMETER: Final = "update_parameter"
+SERVICE_BULK_UPDATE: Final = "bulk_update"
+SERVICE_GET_SNAPSHOT: Final = "get_snapshot"
 
 # Data keys
-DATA_COORDINATOR: Final = "coordinator"
+DATA_COORDINATORS: Final = "coordinators"
 DATA_SERVER: Final = "server"
 DATA_DEVICES: Final = "devices"
+DATA_STORE: Final = "store"
+DATA_PLATFORMS: Final = "platforms"
@@ -1,91 +1,167 @@
 """Data coordinator for SYR Connect Local integration."""
 from __future__ import annotations
 
+import asyncio
 from datetime import timedelta
 import logging
+import time
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN, PROPERTY_SERIAL
-from .server import DeviceState, SyrConnectServer
+from .const import (
+    DEVICE_STALE_TIMEOUT,
+    DOMAIN,
+    PROPERTY_FIRMWARE,
+    PROPERTY_NAME,
+    PROPERTY_TYPE,
+    PROPERTY_VERSION,
+)
+from .core.converters import convert_properties
+from .core.device import DeviceState
+from .core.monitor import PATH_COORDINATOR_UPDATE
+from .core.server import SyrConnectServer
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_INTERVAL = timedelta(seconds=15)
+# Fallback poll; regular updates are pushed on every device check-in
+SCAN_INTERVAL = timedelta(seconds=60)
 
 
-class SyrConnectLocalCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
-    """Class to manage fetching SYR Connect Local data."""
+class SyrConnectLocalCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Class to manage the data of a single SYR device.
 
-    def __init__(self, hass: HomeAssistant, server: SyrConnectServer) -> None:
+    Each device gets its own coordinator, so a check-in only refreshes the
+    entities of that device and a device that stops checking in only marks
+    its own entities unavailable.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, server: SyrConnectServer, serial: str
+    ) -> None:
         """Initialize the coordinator."""
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
+            name=f"{DOMAIN} {serial}",
             update_interval=SCAN_INTERVAL,
         )
         self.server = server
-        self.devices: dict[str, dict[str, Any]] = {}
-
-    async def _async_update_data(self) -> dict[str, dict[str, Any]]:
-        """Fetch data from the server's device states."""
-        try:
-            # Get all devices from the server
-            devices = self.server.get_all_devices()
-
-            # Convert device states to data dictionary
-            data: dict[str, dict[str, Any]] = {}
-
-            for serial, device_state in devices.items():
-                if not device_state.is_identified:
-                    # Skip devices that haven't been fully identified yet
-                    continue
-
-                # Convert properties to appropriate types
-                device_data = self._convert_device_data(device_state)
-                data[serial] = device_data
-
-            self.devices = data
-            return data
-
-        except Exception as err:
-            _LOGGER.error("Error updating data: %s", err)
-            raise UpdateFailed(f"Error communicating with server: {err}") from err
-
-    def _convert_device_data(self, device_state: DeviceState) -> dict[str, Any]:
-        """Convert device state to typed data dictionary."""
-        from .protocol import SyrProtocol
+        self.serial = serial
+        # Device info shared by all entities of the device, and the
+        # identifying properties it was built from
+        self._device_identity: tuple[Any, ...] | None = None
+        self._device_info: dict[str, Any] | None = None
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return the device info, rebuilt only when the device identity changes."""
+        identity = self._identity(self.data)
+        if self._device_info is None or identity != self._device_identity:
+            self._set_device_identity(identity)
+        return self._device_info
+
+    def _set_device_identity(self, identity: tuple[Any, ...]) -> None:
+        """Build the device info from the identifying properties."""
+        self._device_identity = identity
+        device_name, firmware, device_type, version = identity
+        self._device_info = {
+            "identifiers": {(DOMAIN, self.serial)},
+            "name": device_name,
+            "manufacturer": "SYR",
+            "model": f"{firmware} Type {device_type}" if firmware and device_type else "LEX Plus",
+            "sw_version": version,
+        }
+
+    @staticmethod
+    def _identity(data: dict[str, Any] | None) -> tuple[Any, ...]:
+        """Return the properties the device info is built from."""
+        if not data:
+            return ("SYR Device", "", "", "")
+        return (
+            data.get(PROPERTY_NAME, "SYR Device"),
+            data.get(PROPERTY_FIRMWARE, ""),
+            data.get(PROPERTY_TYPE, ""),
+            data.get(PROPERTY_VERSION, ""),
+        )
 
-        protocol = SyrProtocol()
-        data: dict[str, Any] = {}
+    @callback
+    def _async_update_device_registry(self, data: dict[str, Any]) -> None:
+        """Update the registered device after a firmware update or rename."""
+        if self._device_info is None:
+            # No entity has registered the device yet
+            return
+        identity = self._identity(data)
+        if identity == self._device_identity:
+            return
+        # Registered device info is only read when entities are added
+        self._set_device_identity(identity)
+        info = self._device_info
+        registry = dr.async_get(self.hass)
+        if device := registry.async_get_device(identifiers={(DOMAIN, self.serial)}):
+            registry.async_update_device(
+                device.id,
+                name=info["name"],
+                model=info["model"],
+                sw_version=info["sw_version"],
+            )
 
-        for prop_name, prop_value in device_state.properties.items():
-            converted_value = protocol.convert_value(prop_name, prop_value)
-            data[prop_name] = converted_value
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch data from the server's device state."""
+        device_state = self.server.get_device(self.serial)
+        if device_state is None or not device_state.is_identified:
+            raise UpdateFailed(f"Device {self.serial} is not known to the server")
+
+        # The fallback poll only runs if the device has not pushed for a while
+        age = asyncio.get_running_loop().time() - device_state.last_seen
+        if age > DEVICE_STALE_TIMEOUT:
+            raise UpdateFailed(
+                f"Device {self.serial} has not checked in for {age:.0f} seconds"
+            )
 
+        data = self._convert_device_data(device_state)
+        self._async_update_device_registry(data)
         return data
 
-    def get_device_data(self, serial: str) -> dict[str, Any] | None:
-        """Get data for a specific device."""
-        return self.devices.get(serial)
+    @callback
+    def async_handle_device_update(self) -> None:
+        """Push fresh data to entities after a device check-in."""
+        device_state = self.server.get_device(self.serial)
+        if device_state is None or not device_state.is_identified:
+            return
+        if (monitor := self.server.monitor) is None:
+            data = self._convert_device_data(device_state)
+            self._async_update_device_registry(data)
+            self.async_set_updated_data(data)
+            return
+        # Conversion and the state writes of all entities of this device
+        started = time.perf_counter()
+        data = self._convert_device_data(device_state)
+        self._async_update_device_registry(data)
+        self.async_set_updated_data(data)
+        monitor.observe(PATH_COORDINATOR_UPDATE, time.perf_counter() - started, self.serial)
+
+    @staticmethod
+    def _convert_device_data(device_state: DeviceState) -> dict[str, Any]:
+        """Convert device state to typed data dictionary."""
+        return convert_properties(device_state.properties)
 
-    def queue_command(self, serial: str, command: str, value: str) -> bool:
-        """Queue a command for a device."""
-        success = self.server.queue_command(serial, command, value)
+    async def async_queue_command(self, command: str, value: str) -> bool:
+        """Queue a command for the device."""
+        success = await self.server.async_queue_commands(self.serial, {command: value})
         if success:
             _LOGGER.info(
                 "Command queued for device %s: %s=%s",
-                serial,
+                self.serial,
                 command,
                 value,
             )
         else:
             _LOGGER.error(
                 "Failed to queue command for device %s: %s=%s",
-                serial,
+                self.serial,
                 command,
                 value,
             )
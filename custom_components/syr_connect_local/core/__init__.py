@@ -0,0 +1,39 @@
+"""Home Assistant independent core of the SYR Connect Local integration.
+
+Holds the protocol codec, device state and command queue, capability
+learning, the device server and the standalone/remote server. Nothing
+here imports homeassistant. Submodules load on first attribute access,
+so importing the package itself is cheap.
+"""
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .capabilities import CapabilityMap
+    from .converters import convert_properties
+    from .device import DeviceState
+    from .protocol import SyrProtocol
+    from .remote import RemoteSyrConnectServer
+    from .server import SyrConnectServer
+
+_EXPORTS = {
+    "CapabilityMap": "capabilities",
+    "DeviceState": "device",
+    "RemoteSyrConnectServer": "remote",
+    "SyrConnectServer": "server",
+    "SyrProtocol": "protocol",
+    "convert_properties": "converters",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import exported names on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
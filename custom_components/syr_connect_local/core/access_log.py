@@ -0,0 +1,109 @@
+"""In-memory access log and log rate limiting for the request path.
+
+Devices check in every few seconds, so per-request detail is kept in a
+bounded ring of structured records (shown in diagnostics) instead of the
+log. Messages that may repeat on every check-in are rate-limited per key.
+"""
+from __future__ import annotations
+
+from collections import deque
+import logging
+import time
+from typing import Any
+
+from ..const import ACCESS_LOG_SIZE, LOG_THROTTLE_INTERVAL, LOG_THROTTLE_KEYS
+
+_FIELDS = (
+    "time",
+    "client",
+    "serial",
+    "endpoint",
+    "status",
+    "request_bytes",
+    "response_bytes",
+    "duration_ms",
+    "commands",
+)
+
+
+class AccessLog:
+    """Keep the most recent requests as structured records."""
+
+    def __init__(self, size: int = ACCESS_LOG_SIZE) -> None:
+        """Initialize the access log."""
+        # Records are tuples in _FIELDS order; dicts are only built on read
+        self._records: deque[tuple[Any, ...]] = deque(maxlen=size)
+        self.total = 0
+
+    def record(
+        self,
+        client: str | None,
+        serial: str | None,
+        endpoint: str,
+        status: int,
+        request_bytes: int | None,
+        response_bytes: int | None,
+        duration: float,
+        commands: list[str] | None,
+    ) -> None:
+        """Add a request."""
+        self.total += 1
+        self._records.append(
+            (
+                time.time(),
+                client,
+                serial,
+                endpoint,
+                status,
+                request_bytes,
+                response_bytes,
+                round(duration * 1000, 2),
+                commands,
+            )
+        )
+
+    def records(self, serial: str | None = None) -> list[dict[str, Any]]:
+        """Return the records, oldest first, optionally for one device."""
+        return [
+            dict(zip(_FIELDS, record))
+            for record in self._records
+            if serial is None or record[2] == serial
+        ]
+
+
+class LogThrottle:
+    """Allow a message at most once per interval for each key.
+
+    Suppressed messages are counted and reported with the next one let
+    through, so nothing disappears silently.
+    """
+
+    def __init__(self, interval: float = LOG_THROTTLE_INTERVAL) -> None:
+        """Initialize the throttle."""
+        self.interval = interval
+        # Key -> (time last logged, messages suppressed since)
+        self._state: dict[Any, tuple[float, int]] = {}
+
+    def log(
+        self, logger: logging.Logger, level: int, key: Any, msg: str, *args: Any
+    ) -> None:
+        """Log a message unless one with the same key was logged recently."""
+        if not logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        last, suppressed = self._state.get(key, (0.0, 0))
+        if last and now - last < self.interval:
+            self._state[key] = (last, suppressed + 1)
+            return
+        if suppressed:
+            msg += " (%d similar messages suppressed)"
+            args = (*args, suppressed)
+        if len(self._state) >= LOG_THROTTLE_KEYS and key not in self._state:
+            # Forget keys that are quiet again, e.g. one per bogus serial
+            self._state = {
+                k: v for k, v in self._state.items() if now - v[0] < self.interval
+            }
+            if len(self._state) >= LOG_THROTTLE_KEYS:
+                self._state.clear()
+        self._state[key] = (now, 0)
+        logger.log(level, msg, *args)
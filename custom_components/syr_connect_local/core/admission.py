@@ -0,0 +1,324 @@
+"""Admission control for the device listeners.
+
+Keeps misbehaving or hostile clients from tying up the event loop that
+devices and Home Assistant share: connections are limited in total and
+per client address, request headers must arrive in time, and requests
+are rate-limited per client. Rejections are cheap canned responses.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+import ssl
+import threading
+import time
+from typing import Any
+
+from aiohttp import web
+
+from ..const import (
+    ADMISSION_BURST,
+    ADMISSION_HEADER_TIMEOUT,
+    ADMISSION_MAX_CONNECTIONS,
+    ADMISSION_MAX_CONNECTIONS_PER_IP,
+    ADMISSION_MAX_TRACKED_CLIENTS,
+    ADMISSION_RATE,
+)
+from .proxy import PROXY_V2_SIGNATURE, IPNetwork, ProxyProtocolGate, is_trusted
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_UNAVAILABLE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Content-Length: 0\r\nConnection: close\r\n\r\n"
+)
+_HEADER_END = b"\r\n\r\n"
+
+
+class AdmissionControl:
+    """Connection limits and per-client token buckets, shared by all listeners."""
+
+    def __init__(
+        self,
+        trusted_proxies: list[IPNetwork],
+        max_connections: int = ADMISSION_MAX_CONNECTIONS,
+        max_connections_per_ip: int = ADMISSION_MAX_CONNECTIONS_PER_IP,
+        header_timeout: float = ADMISSION_HEADER_TIMEOUT,
+        rate: float = ADMISSION_RATE,
+        burst: float = ADMISSION_BURST,
+    ) -> None:
+        """Initialize admission control."""
+        # Proxies carry many clients and are exempt from the per-address limit
+        self.trusted_proxies = trusted_proxies
+        self.max_connections = max_connections
+        self.max_connections_per_ip = max_connections_per_ip
+        self.header_timeout = header_timeout
+        self.rate = rate
+        self.burst = burst
+        self.connections = 0
+        self._connections_by_host: dict[str, int] = {}
+        # The TLS offloader counts connections from its own thread
+        self._lock = threading.Lock()
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self.rejected: dict[str, int] = {
+            "connection_limit": 0,
+            "header_timeout": 0,
+            "rate_limit": 0,
+            "request_timeout": 0,
+            "request_too_large": 0,
+        }
+
+    def connection_opened(self, host: str) -> bool:
+        """Admit a new connection from host, or return False to refuse it."""
+        with self._lock:
+            count = self._connections_by_host.get(host, 0)
+            if self.connections >= self.max_connections or (
+                host
+                and count >= self.max_connections_per_ip
+                and not is_trusted(host, self.trusted_proxies)
+            ):
+                self.rejected["connection_limit"] += 1
+                return False
+            self.connections += 1
+            self._connections_by_host[host] = count + 1
+            return True
+
+    def connection_closed(self, host: str) -> None:
+        """Release a connection admitted by connection_opened."""
+        with self._lock:
+            self.connections -= 1
+            count = self._connections_by_host.pop(host, 1) - 1
+            if count > 0:
+                self._connections_by_host[host] = count
+
+    def allow_request(self, host: str) -> bool:
+        """Take a token from the host's bucket; False if it is empty."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(host, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        else:
+            self.rejected["rate_limit"] += 1
+
+        # Re-insert to keep the dict in least-recently-used order
+        self._buckets[host] = (tokens, now)
+        if len(self._buckets) > ADMISSION_MAX_TRACKED_CLIENTS:
+            del self._buckets[next(iter(self._buckets))]
+        return allowed
+
+    def metrics(self) -> dict[str, Any]:
+        """Return admission counters."""
+        return {
+            "connections": self.connections,
+            "clients_connected": len(self._connections_by_host),
+            "clients_tracked": len(self._buckets),
+            "rejected": dict(self.rejected),
+        }
+
+
+def _peer_host(transport: asyncio.BaseTransport) -> str:
+    """Return the peer address of a transport; empty for unix sockets."""
+    peername = transport.get_extra_info("peername")
+    return str(peername[0]) if isinstance(peername, tuple) else ""
+
+
+class AdmissionGate(asyncio.Protocol):
+    """Admit a connection, terminate TLS and enforce the request header timeout.
+
+    Connections are counted when they are accepted, before any TLS
+    handshake, so clients that never finish one still count against the
+    limits; the header timeout covers the handshake as well.
+    """
+
+    def __init__(
+        self,
+        protocol: asyncio.Protocol,
+        admission: AdmissionControl,
+        ssl_context: ssl.SSLContext | None = None,
+    ) -> None:
+        """Initialize the gate."""
+        self._protocol = protocol
+        self._admission = admission
+        self._ssl_context = ssl_context
+        self._transport: asyncio.Transport | None = None
+        self._host: str | None = None
+        # Set once the wrapped protocol has been handed the (TLS) transport
+        self._connected = False
+        self._handshake: asyncio.Task | None = None
+        # Decrypted data that arrived before start_tls returned
+        self._early_data: list[bytes] = []
+        self._received = b""
+        self._timeout: asyncio.TimerHandle | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Refuse the connection if over a limit, otherwise pass it on."""
+        self._transport = transport  # type: ignore[assignment]
+        host = _peer_host(transport)
+        if not self._admission.connection_opened(host):
+            # A TLS client could not read a plain response
+            if self._ssl_context is None:
+                self._transport.write(SERVICE_UNAVAILABLE)
+            self._transport.close()
+            return
+        self._host = host
+        loop = asyncio.get_running_loop()
+        self._timeout = loop.call_later(
+            self._admission.header_timeout, self._on_header_timeout
+        )
+        if self._ssl_context is None:
+            self._connect(self._transport)
+            return
+        # Nothing may be read before the TLS layer has taken over the transport
+        self._transport.pause_reading()
+        self._handshake = loop.create_task(self._start_tls(self._transport))
+
+    async def _start_tls(self, transport: asyncio.Transport) -> None:
+        """Do the TLS handshake, then pass the connection on."""
+        assert self._ssl_context is not None
+        try:
+            tls_transport = await asyncio.get_running_loop().start_tls(
+                transport,
+                self,
+                self._ssl_context,
+                server_side=True,
+                ssl_handshake_timeout=self._admission.header_timeout,
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("TLS handshake with %s failed: %s", self._host, err)
+            self.connection_lost(None)
+            return
+        finally:
+            self._handshake = None
+        if self._host is None or tls_transport is None:
+            # Lost right after the handshake
+            return
+        self._transport = tls_transport
+        self._connect(tls_transport)
+
+    def _connect(self, transport: asyncio.Transport) -> None:
+        """Hand the connection to the wrapped protocol."""
+        self._connected = True
+        self._protocol.connection_made(transport)
+        early_data, self._early_data = self._early_data, []
+        for data in early_data:
+            self._protocol.data_received(data)
+
+    def _on_header_timeout(self) -> None:
+        """Close connections that do not send a complete request head in time."""
+        self._timeout = None
+        self._admission.rejected["header_timeout"] += 1
+        _LOGGER.debug("Closing connection from %s: request header timeout", self._host)
+        if self._transport is not None:
+            self._transport.abort()
+
+    def data_received(self, data: bytes) -> None:
+        """Watch for the end of the first request head, then pass data on."""
+        if self._timeout is not None:
+            self._received += data
+            # A PROXY v2 header starts with the blank-line sequence itself
+            start = len(PROXY_V2_SIGNATURE) if self._received.startswith(PROXY_V2_SIGNATURE) else 0
+            if self._received.find(_HEADER_END, start) >= 0:
+                self._timeout.cancel()
+                self._timeout = None
+                self._received = b""
+        if not self._connected:
+            self._early_data.append(data)
+            return
+        self._protocol.data_received(data)
+
+    def eof_received(self) -> bool | None:
+        """Pass end of stream through."""
+        if not self._connected:
+            return None
+        return self._protocol.eof_received()
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Release the connection and pass the loss through."""
+        if self._timeout is not None:
+            self._timeout.cancel()
+            self._timeout = None
+        if self._host is None:
+            return
+        self._admission.connection_closed(self._host)
+        self._host = None
+        if self._connected:
+            self._protocol.connection_lost(exc)
+
+    def pause_writing(self) -> None:
+        """Pass flow control through."""
+        if self._connected:
+            self._protocol.pause_writing()
+
+    def resume_writing(self) -> None:
+        """Pass flow control through."""
+        if self._connected:
+            self._protocol.resume_writing()
+
+
+class GatedSite(web.BaseSite):
+    """Listener whose connections pass admission control.
+
+    Listens on a TCP port (optionally with TLS) or a unix socket path and
+    optionally expects a PROXY protocol header on every connection.
+    """
+
+    def __init__(
+        self,
+        runner: web.BaseRunner,
+        admission: AdmissionControl,
+        *,
+        port: int | None = None,
+        path: str | None = None,
+        ssl_context: ssl.SSLContext | None = None,
+        reuse_port: bool | None = None,
+        proxy_protocol: bool = False,
+    ) -> None:
+        """Initialize the site."""
+        super().__init__(runner, ssl_context=ssl_context)
+        self._admission = admission
+        self._port = port
+        self._path = path
+        self._reuse_port = reuse_port
+        self._proxy_protocol = proxy_protocol
+
+    @property
+    def name(self) -> str:
+        """Return the site name."""
+        prefix = "proxy+" if self._proxy_protocol else ""
+        if self._path is not None:
+            return f"{prefix}unix:{self._path}:"
+        scheme = "https" if self._ssl_context else "http"
+        return f"{prefix}{scheme}://0.0.0.0:{self._port}"
+
+    def _protocol_factory(self) -> Callable[[], asyncio.Protocol]:
+        """Return a factory wrapping the runner's HTTP protocol."""
+        server = self._runner.server
+        assert server is not None
+        admission = self._admission
+        ssl_context = self._ssl_context
+        if self._proxy_protocol:
+            return lambda: AdmissionGate(
+                ProxyProtocolGate(server(), admission.trusted_proxies), admission
+            )
+        return lambda: AdmissionGate(server(), admission, ssl_context)
+
+    async def start(self) -> None:
+        """Start listening."""
+        await super().start()
+        loop = asyncio.get_running_loop()
+        if self._path is not None:
+            self._server = await loop.create_unix_server(
+                self._protocol_factory(), self._path, backlog=self._backlog
+            )
+        else:
+            self._server = await loop.create_server(
+                self._protocol_factory(),
+                None,  # Listen on all interfaces
+                self._port,
+                # TLS is started by the gate, after admission
+                backlog=self._backlog,
+                reuse_port=self._reuse_port,
+            )
@@ -0,0 +1,131 @@
+"""Per-model capability learning for SYR devices."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+import logging
+from typing import Any
+
+from ..const import (
+    CAPABILITY_MISS_THRESHOLD,
+    CAPABILITY_PROTECTED_PROPERTIES,
+    CAPABILITY_REPROBE_INTERVAL,
+    PROPERTY_FIRMWARE,
+    PROPERTY_TYPE,
+    PROPERTY_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CapabilityMap:
+    """Learn which getters a device model answers.
+
+    Models are keyed by firmware type, device type and firmware version
+    (getFIR/getTYP/getVER), so a firmware update starts learning afresh.
+    A getter that comes back empty or missing for several consecutive
+    check-ins is marked unsupported and dropped from future responses.
+    Every reprobe_interval-th response to a model requests its unsupported
+    getters again, and a getter that is answered is supported again.
+    """
+
+    def __init__(
+        self,
+        miss_threshold: int = CAPABILITY_MISS_THRESHOLD,
+        reprobe_interval: int = CAPABILITY_REPROBE_INTERVAL,
+    ) -> None:
+        """Initialize the capability map."""
+        self.miss_threshold = miss_threshold
+        self.reprobe_interval = reprobe_interval
+        self._misses: dict[str, dict[str, int]] = {}
+        self._unsupported: dict[str, set[str]] = {}
+        self._responses: dict[str, int] = {}
+
+    @staticmethod
+    def model_key(properties: dict[str, str]) -> str | None:
+        """Return the model key for a device, or None if not yet known."""
+        firmware = properties.get(PROPERTY_FIRMWARE)
+        device_type = properties.get(PROPERTY_TYPE)
+        version = properties.get(PROPERTY_VERSION)
+        if not firmware or not device_type or not version:
+            return None
+        return f"{firmware}|{device_type}|{version}"
+
+    def observe(
+        self, model_key: str, requested: Iterable[str], properties: dict[str, str]
+    ) -> bool:
+        """Record which requested getters were answered.
+
+        Returns True if the set of unsupported getters changed.
+        """
+        misses = self._misses.setdefault(model_key, {})
+        unsupported = self._unsupported.setdefault(model_key, set())
+        changed = False
+
+        for getter in requested:
+            if getter in CAPABILITY_PROTECTED_PROPERTIES:
+                continue
+
+            if properties.get(getter):
+                misses.pop(getter, None)
+                if getter in unsupported:
+                    unsupported.discard(getter)
+                    changed = True
+                continue
+
+            count = misses.get(getter, 0) + 1
+            misses[getter] = count
+            if count >= self.miss_threshold and getter not in unsupported:
+                unsupported.add(getter)
+                changed = True
+                _LOGGER.debug(
+                    "Model %s does not answer %s; no longer requesting it",
+                    model_key,
+                    getter,
+                )
+
+        return changed
+
+    def unsupported(self, model_key: str) -> set[str]:
+        """Return the getters known to be unsupported by a model."""
+        return self._unsupported.get(model_key, set())
+
+    def prune(
+        self, model_key: str, request: dict[str, str], reprobe: bool = True
+    ) -> dict[str, str]:
+        """Remove getters the model does not support from a response.
+
+        Every reprobe_interval-th response is left unpruned, so getters that
+        were dropped after transient empty answers are requested again.
+        Responses whose answers are not observed pass reprobe=False: they
+        are always pruned and do not count toward the schedule.
+        """
+        unsupported = self._unsupported.get(model_key)
+        if not unsupported:
+            return request
+        if not reprobe:
+            return {name: value for name, value in request.items() if name not in unsupported}
+        responses = self._responses.get(model_key, 0) + 1
+        self._responses[model_key] = responses
+        if responses % self.reprobe_interval == 0:
+            _LOGGER.debug("Requesting unsupported getters of model %s again", model_key)
+            return request
+        return {name: value for name, value in request.items() if name not in unsupported}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            model_key: sorted(getters)
+            for model_key, getters in self._unsupported.items()
+            if getters
+        }
+
+    def load(self, data: dict[str, Any]) -> None:
+        """Restore learned capabilities from a stored representation."""
+        for model_key, getters in data.items():
+            unsupported = {
+                getter
+                for getter in getters
+                if getter not in CAPABILITY_PROTECTED_PROPERTIES
+            }
+            if unsupported:
+                self._unsupported[model_key] = unsupported
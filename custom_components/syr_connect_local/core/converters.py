@@ -0,0 +1,14 @@
+"""Convert raw SYR device properties into typed values."""
+from __future__ import annotations
+
+from typing import Any
+
+from .protocol import SyrProtocol
+
+
+def convert_properties(properties: dict[str, str]) -> dict[str, Any]:
+    """Convert raw property strings to typed values."""
+    return {
+        prop_name: SyrProtocol.convert_value(prop_name, prop_value)
+        for prop_name, prop_value in properties.items()
+    }
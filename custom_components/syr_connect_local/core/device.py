@@ -0,0 +1,166 @@
+"""Per-device state and command queue for SYR devices."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from ..const import (
+    COMMAND_PRIORITY_HIGH,
+    COMMAND_PRIORITY_LOW,
+    COMMAND_PRIORITY_NORMAL,
+    HIGH_PRIORITY_SETTERS,
+    IDENT_STATE_IDENTIFIED,
+    IDENT_STATE_NEW,
+)
+
+if TYPE_CHECKING:
+    from .journal import CommandJournal
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DeviceState:
+    """Store state for a single SYR device."""
+
+    def __init__(self, serial_number: str):
+        """Initialize device state."""
+        self.serial_number = serial_number
+        self.properties: dict[str, str] = {}
+        self.pending_commands: dict[str, str] = {}
+        self.command_priorities: dict[str, int] = {}
+        self.command_queued_at: dict[str, float] = {}
+        # Delivered setters waiting for the matching getter to report the value
+        self.awaiting_confirmation: dict[str, tuple[str, str, float]] = {}
+        # Seconds from queueing to delivery and to confirmation, per command
+        self.command_latencies: dict[str, dict[str, float]] = {}
+        self.last_seen: float = 0
+        self.identification_state = IDENT_STATE_NEW
+        self.first_seen: float = 0
+        self.identified_at: float | None = None
+        # Getters sent in the last GetAllCommands response, answered on the next check-in
+        self.requested_getters: list[str] = []
+        # Records queued and delivered commands, so they survive a restart
+        self.journal: CommandJournal | None = None
+
+    @property
+    def is_identified(self) -> bool:
+        """Return True once the device has been announced."""
+        return self.identification_state == IDENT_STATE_IDENTIFIED
+
+    @property
+    def time_to_identify(self) -> float | None:
+        """Return seconds from first check-in until the device was announced."""
+        if self.identified_at is None:
+            return None
+        return self.identified_at - self.first_seen
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return a JSON-serializable representation of the device state."""
+        return {
+            "serial": self.serial_number,
+            "identification_state": self.identification_state,
+            "time_to_identify_seconds": self.time_to_identify,
+            "last_seen_seconds_ago": round(max(0.0, now - self.last_seen), 3)
+            if self.last_seen
+            else None,
+            "properties": self.properties,
+            "pending_commands": self.pending_commands,
+        }
+
+    def update_properties(self, properties: dict[str, str]) -> dict[str, str]:
+        """Update device properties from received data.
+
+        Returns the properties whose values changed.
+        """
+        changed = {
+            name: value
+            for name, value in properties.items()
+            if self.properties.get(name) != value
+        }
+        self.properties.update(properties)
+
+        # Record how long delivered setters took to take effect
+        for getter in [name for name in self.awaiting_confirmation if name in properties]:
+            command, value, queued_at = self.awaiting_confirmation[getter]
+            if properties[getter] == value:
+                del self.awaiting_confirmation[getter]
+                self.command_latencies.setdefault(command, {})["confirmed"] = round(
+                    time.monotonic() - queued_at, 3
+                )
+        return changed
+
+    def queue_command(
+        self,
+        command: str,
+        value: str,
+        priority: int | None = None,
+        queued_at: float | None = None,
+    ) -> None:
+        """Queue a command to be sent to the device.
+
+        Safety-relevant setters (HIGH_PRIORITY_SETTERS) default to high
+        priority and are delivered ahead of the regular poll. A command
+        queued again after a failed delivery passes its original queue time.
+        """
+        if priority is None:
+            priority = (
+                COMMAND_PRIORITY_HIGH
+                if command in HIGH_PRIORITY_SETTERS
+                else COMMAND_PRIORITY_NORMAL
+            )
+        self.pending_commands[command] = value
+        self.command_priorities[command] = priority
+        self.command_queued_at[command] = time.monotonic() if queued_at is None else queued_at
+        if self.journal:
+            self.journal.queued(self.serial_number, command, value, priority)
+        _LOGGER.debug(
+            "Device %s: queued %s=%s (total pending: %d)",
+            self.serial_number,
+            command,
+            value,
+            len(self.pending_commands),
+        )
+
+    def has_priority_commands(self) -> bool:
+        """Return True if a high-priority command is pending."""
+        return any(
+            priority >= COMMAND_PRIORITY_HIGH
+            for priority in self.command_priorities.values()
+        )
+
+    def get_pending_commands(
+        self, min_priority: int = COMMAND_PRIORITY_LOW
+    ) -> dict[str, str]:
+        """Get and clear pending commands of at least the given priority.
+
+        Commands are returned highest priority first.
+        """
+        selected = sorted(
+            (
+                command
+                for command, priority in self.command_priorities.items()
+                if priority >= min_priority
+            ),
+            key=lambda command: -self.command_priorities[command],
+        )
+        if not selected:
+            return {}
+        _LOGGER.debug(
+            "Device %s: retrieving %d pending commands: %s",
+            self.serial_number,
+            len(selected),
+            selected,
+        )
+        now = time.monotonic()
+        commands: dict[str, str] = {}
+        for command in selected:
+            value = commands[command] = self.pending_commands.pop(command)
+            del self.command_priorities[command]
+            queued_at = self.command_queued_at.pop(command)
+            self.command_latencies[command] = {"delivered": round(now - queued_at, 3)}
+            getter = "get" + command[3:]
+            self.awaiting_confirmation[getter] = (command, value, queued_at)
+        if self.journal and commands:
+            self.journal.delivered(self.serial_number, list(commands))
+        return commands
@@ -0,0 +1,338 @@
+"""Minimal DNS responder for the SYR cloud domains.
+
+Answers A/AAAA queries for HANDLED_DOMAINS (and their subdomains) with the
+address of this host, so devices reach the local server without a separate
+DNS rewrite service. Other queries are forwarded to an upstream resolver
+and cached, or refused if no upstream is configured. Only clients on local
+networks (or an allow-list) get forwarded answers, so the responder is not
+an open resolver.
+"""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import secrets
+import socket
+import struct
+from typing import Any
+
+from ..const import (
+    DNS_CACHE_MAX_TTL,
+    DNS_CACHE_SIZE,
+    DNS_FORWARD_TIMEOUT,
+    DNS_MAX_PENDING,
+    DNS_TTL,
+    HANDLED_DOMAINS,
+)
+from .proxy import IPNetwork, is_trusted
+
+_LOGGER = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("!HHHHHH")
+_RR = struct.Struct("!HHIH")
+
+TYPE_A = 1
+TYPE_AAAA = 28
+CLASS_IN = 1
+
+_FLAG_RESPONSE = 0x8000
+_FLAG_AUTHORITATIVE = 0x0400
+_FLAG_RECURSION_DESIRED = 0x0100
+_RCODE_SERVFAIL = 2
+_RCODE_NXDOMAIN = 3
+_RCODE_REFUSED = 5
+
+
+class DnsFormatError(ValueError):
+    """Malformed DNS message."""
+
+
+def parse_question(data: bytes) -> tuple[str, int, int, int]:
+    """Return name, type, class and end offset of the single question in a query."""
+    if len(data) < _HEADER.size:
+        raise DnsFormatError("Message too short")
+    _, flags, questions, _, _, _ = _HEADER.unpack_from(data)
+    if flags & _FLAG_RESPONSE or questions != 1:
+        raise DnsFormatError("Not a single-question query")
+    pos = _HEADER.size
+    labels: list[bytes] = []
+    try:
+        while length := data[pos]:
+            if length & 0xC0:
+                raise DnsFormatError("Compressed question name")
+            labels.append(data[pos + 1 : pos + 1 + length])
+            pos += 1 + length
+        qtype, qclass = struct.unpack_from("!HH", data, pos + 1)
+    except (IndexError, struct.error) as err:
+        raise DnsFormatError("Truncated question") from err
+    name = b".".join(labels).decode("ascii", "replace").lower()
+    return name, qtype, qclass, pos + 5
+
+
+def _skip_name(data: bytes, pos: int) -> int:
+    """Return the offset after a possibly compressed name."""
+    while length := data[pos]:
+        if length & 0xC0:
+            return pos + 2
+        pos += 1 + length
+    return pos + 1
+
+
+def response_ttl(data: bytes) -> int:
+    """Return how long a response may be cached: its lowest record TTL."""
+    _, _, questions, answers, authority, _ = _HEADER.unpack_from(data)
+    pos = _HEADER.size
+    for _ in range(questions):
+        pos = _skip_name(data, pos) + 4
+    ttl = DNS_CACHE_MAX_TTL
+    for _ in range(answers + authority):
+        pos = _skip_name(data, pos)
+        _, _, record_ttl, length = _RR.unpack_from(data, pos)
+        ttl = min(ttl, record_ttl)
+        pos += _RR.size + length
+    return ttl
+
+
+def is_handled(name: str) -> bool:
+    """Return True for the SYR cloud domains and their subdomains."""
+    return any(name == domain or name.endswith("." + domain) for domain in HANDLED_DOMAINS)
+
+
+def detect_local_address() -> str | None:
+    """Return the IPv4 address of the interface with the default route.
+
+    No packet is sent; connecting a UDP socket only selects the route.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        try:
+            sock.connect(("192.0.2.1", 9))
+        except OSError:
+            return None
+        return sock.getsockname()[0]
+
+
+def is_local_client(host: str) -> bool:
+    """Return True for private, loopback and link-local addresses."""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return address.is_private or address.is_loopback or address.is_link_local
+
+
+def parse_upstream(value: str) -> tuple[str, int]:
+    """Parse an upstream resolver given as host, host:port or [v6]:port."""
+    value = value.strip()
+    if value.startswith("["):
+        host, _, port = value[1:].partition("]:")
+        return host.rstrip("]"), int(port or 53)
+    if value.count(":") == 1:
+        host, port = value.split(":")
+        return host, int(port)
+    return value, 53
+
+
+class _UpstreamProtocol(asyncio.DatagramProtocol):
+    """Receive answers from the upstream resolver."""
+
+    def __init__(self, responder: DnsResponder) -> None:
+        """Initialize the protocol."""
+        self._responder = responder
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        """Pass the answer back to the client that asked."""
+        self._responder.upstream_response(data)
+
+
+class DnsResponder(asyncio.DatagramProtocol):
+    """Answer DNS queries over UDP."""
+
+    def __init__(
+        self,
+        port: int,
+        addresses: list[str],
+        upstream: tuple[str, int] | None = None,
+        clients: list[IPNetwork] | None = None,
+    ) -> None:
+        """Initialize the responder.
+
+        Names other than HANDLED_DOMAINS are only answered for clients in
+        clients, or for clients on local networks if no list is given.
+        """
+        self.port = port
+        self.upstream = upstream
+        self.clients = clients or []
+        self._records: dict[int, list[bytes]] = {TYPE_A: [], TYPE_AAAA: []}
+        for address in addresses:
+            ip = ipaddress.ip_address(address)
+            self._records[TYPE_A if ip.version == 4 else TYPE_AAAA].append(ip.packed)
+        self._transport: asyncio.DatagramTransport | None = None
+        self._upstream_transport: asyncio.DatagramTransport | None = None
+        # Responses without their ID, by (name, type, class)
+        self._cache: dict[tuple[str, int, int], tuple[float, bytes]] = {}
+        # Forwarded queries by upstream ID: client address, client ID,
+        # question section and cache key
+        self._pending: dict[int, tuple[Any, bytes, bytes, tuple[str, int, int]]] = {}
+        self.counters: dict[str, int] = {
+            "queries": 0,
+            "local": 0,
+            "cache_hits": 0,
+            "forwarded": 0,
+            "refused": 0,
+            "malformed": 0,
+            "mismatched": 0,
+        }
+
+    async def start(self) -> None:
+        """Listen for queries and connect to the upstream resolver."""
+        loop = asyncio.get_running_loop()
+        if self.upstream:
+            self._upstream_transport, _ = await loop.create_datagram_endpoint(
+                lambda: _UpstreamProtocol(self), remote_addr=self.upstream
+            )
+        try:
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: self, local_addr=("0.0.0.0", self.port)
+            )
+        except OSError:
+            self.stop()
+            raise
+        _LOGGER.info("DNS responder listening on UDP port %d", self.port)
+
+    def stop(self) -> None:
+        """Stop answering queries."""
+        for transport in (self._transport, self._upstream_transport):
+            if transport is not None:
+                transport.close()
+        self._transport = self._upstream_transport = None
+        self._pending.clear()
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        """Answer a query."""
+        assert self._transport is not None
+        self.counters["queries"] += 1
+        try:
+            name, qtype, qclass, end = parse_question(data)
+        except DnsFormatError:
+            self.counters["malformed"] += 1
+            return
+
+        if is_handled(name):
+            self.counters["local"] += 1
+            self._transport.sendto(self._local_answer(data, name, qtype, qclass, end), addr)
+            return
+
+        if not self._may_recurse(addr[0]):
+            # Neither cached nor forwarded answers for outside clients
+            self.counters["refused"] += 1
+            self._transport.sendto(_error(data, end, _RCODE_REFUSED), addr)
+            return
+
+        key = (name, qtype, qclass)
+        loop_time = asyncio.get_running_loop().time()
+        cached = self._cache.get(key)
+        if cached is not None:
+            if cached[0] > loop_time:
+                self.counters["cache_hits"] += 1
+                self._transport.sendto(data[:2] + cached[1], addr)
+                return
+            del self._cache[key]
+
+        if self._upstream_transport is None:
+            self.counters["refused"] += 1
+            self._transport.sendto(_error(data, end, _RCODE_REFUSED), addr)
+        elif len(self._pending) >= DNS_MAX_PENDING:
+            self._transport.sendto(_error(data, end, _RCODE_SERVFAIL), addr)
+        else:
+            self._forward(data, addr, key, end)
+
+    def _may_recurse(self, host: str) -> bool:
+        """Return True if a client may get answers for names other than ours."""
+        if self.clients:
+            return is_trusted(host, self.clients)
+        return is_local_client(host)
+
+    def _local_answer(self, query: bytes, name: str, qtype: int, qclass: int, end: int) -> bytes:
+        """Build an authoritative answer with this host's addresses."""
+        key = (name, qtype, qclass)
+        if (cached := self._cache.get(key)) is not None:
+            return query[:2] + cached[1]
+
+        records = self._records.get(qtype, []) if qclass == CLASS_IN else []
+        flags = (
+            _FLAG_RESPONSE
+            | _FLAG_AUTHORITATIVE
+            | (_HEADER.unpack_from(query)[1] & _FLAG_RECURSION_DESIRED)
+        )
+        response = _HEADER.pack(0, flags, 1, len(records), 0, 0) + query[_HEADER.size : end]
+        for rdata in records:
+            # The name is a pointer to the question
+            response += b"\xc0\x0c" + _RR.pack(qtype, CLASS_IN, DNS_TTL, len(rdata)) + rdata
+        # Local answers never change, so they are cached without expiry
+        self._store(key, float("inf"), response[2:])
+        return query[:2] + response[2:]
+
+    def _forward(self, data: bytes, addr: Any, key: tuple[str, int, int], end: int) -> None:
+        """Send a query to the upstream resolver under a new, unpredictable ID."""
+        assert self._upstream_transport is not None
+        while (upstream_id := secrets.randbits(16)) in self._pending:
+            pass
+        pending = (addr, data[:2], data[_HEADER.size : end], key)
+        self._pending[upstream_id] = pending
+        asyncio.get_running_loop().call_later(
+            DNS_FORWARD_TIMEOUT, self._expire, upstream_id, pending
+        )
+        self.counters["forwarded"] += 1
+        self._upstream_transport.sendto(struct.pack("!H", upstream_id) + data[2:])
+
+    def _expire(self, upstream_id: int, pending: tuple[Any, ...]) -> None:
+        """Forget a forwarded query that was not answered, unless its ID was reused."""
+        if self._pending.get(upstream_id) is pending:
+            del self._pending[upstream_id]
+
+    def upstream_response(self, data: bytes) -> None:
+        """Relay an upstream answer and cache it."""
+        if len(data) < _HEADER.size or self._transport is None:
+            return
+        upstream_id, flags, questions, _, _, _ = _HEADER.unpack_from(data)
+        pending = self._pending.get(upstream_id)
+        if pending is None:
+            return
+        addr, client_id, question, key = pending
+        if (
+            not flags & _FLAG_RESPONSE
+            or questions != 1
+            or data[_HEADER.size : _HEADER.size + len(question)].lower() != question.lower()
+        ):
+            # Not the answer to our question: spoofed or stray; keep waiting
+            self.counters["mismatched"] += 1
+            return
+        del self._pending[upstream_id]
+        self._transport.sendto(client_id + data[2:], addr)
+
+        if flags & 0x000F in (0, _RCODE_NXDOMAIN):
+            try:
+                ttl = response_ttl(data)
+            except (IndexError, struct.error):
+                return
+            if ttl > 0:
+                self._store(key, asyncio.get_running_loop().time() + ttl, data[2:])
+
+    def _store(self, key: tuple[str, int, int], expires: float, response: bytes) -> None:
+        """Cache a response, dropping the oldest entry when full."""
+        self._cache.pop(key, None)
+        self._cache[key] = (expires, response)
+        if len(self._cache) > DNS_CACHE_SIZE:
+            del self._cache[next(iter(self._cache))]
+
+    def metrics(self) -> dict[str, Any]:
+        """Return query counters."""
+        return {**self.counters, "cached": len(self._cache), "pending": len(self._pending)}
+
+
+def _error(query: bytes, end: int, rcode: int) -> bytes:
+    """Build an error response to a query."""
+    ident, flags, _, _, _, _ = _HEADER.unpack_from(query)
+    flags = _FLAG_RESPONSE | (flags & _FLAG_RECURSION_DESIRED) | rcode
+    return _HEADER.pack(ident, flags, 1, 0, 0, 0) + query[_HEADER.size : end]
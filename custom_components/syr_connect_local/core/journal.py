@@ -0,0 +1,171 @@
+"""Append-only journal of queued device commands.
+
+Queued and delivered commands are appended as JSON lines, so commands
+queued before a restart are delivered after it. On the event loop a record
+is only applied to the in-memory view and buffered; it is encoded, written
+and fsynced in the executor, in batches. The journal is compacted to the
+commands still pending once it has grown well beyond them.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from ..const import JOURNAL_COMPACT_THRESHOLD, JOURNAL_FLUSH_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class CommandJournal:
+    """Persist pending commands per device serial."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize the journal."""
+        self.path = Path(path)
+        # Commands not yet delivered: serial -> command -> (value, priority)
+        self.pending: dict[str, dict[str, tuple[str, int]]] = {}
+        self._buffer: list[dict[str, Any]] = []
+        self._wake = asyncio.Event()
+        self._worker: asyncio.Task | None = None
+        self._closing = False
+        self._records_since_compaction = 0
+        self.counters: dict[str, int] = {"records": 0, "flushes": 0, "compactions": 0}
+
+    async def start(self) -> dict[str, dict[str, tuple[str, int]]]:
+        """Replay the journal and start writing; return the pending commands."""
+        loop = asyncio.get_running_loop()
+        lines = await loop.run_in_executor(None, self._read)
+        for line in lines:
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                # A torn last line after a crash; everything before it is intact
+                _LOGGER.debug("Skipping unreadable journal line: %r", line)
+        self._records_since_compaction = len(lines)
+        if self.pending:
+            _LOGGER.info(
+                "Restored %d pending commands from %s",
+                sum(len(commands) for commands in self.pending.values()),
+                self.path,
+            )
+        self._worker = loop.create_task(self._run())
+        # Start from a compact file
+        self._wake.set()
+        return {serial: dict(commands) for serial, commands in self.pending.items()}
+
+    async def stop(self) -> None:
+        """Write everything still buffered and stop."""
+        if self._worker is not None:
+            self._closing = True
+            self._wake.set()
+            await self._worker
+            self._worker = None
+
+    def queued(self, serial: str, command: str, value: str, priority: int) -> None:
+        """Record a queued command."""
+        self._append({"q": serial, "c": command, "v": value, "p": priority})
+
+    def delivered(self, serial: str, commands: list[str]) -> None:
+        """Record commands sent to the device."""
+        self._append({"d": serial, "c": commands})
+
+    def forget(self, serial: str) -> None:
+        """Drop all pending commands of a device."""
+        if serial in self.pending:
+            self._append({"x": serial})
+
+    def _append(self, record: dict[str, Any]) -> None:
+        """Apply a record and buffer it for the next write."""
+        self._apply(record)
+        self._buffer.append(record)
+        self.counters["records"] += 1
+        self._records_since_compaction += 1
+        self._wake.set()
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        """Apply a record to the pending commands."""
+        if "q" in record:
+            self.pending.setdefault(record["q"], {})[record["c"]] = (record["v"], record["p"])
+        elif "d" in record:
+            commands = self.pending.get(record["d"], {})
+            for command in record["c"]:
+                commands.pop(command, None)
+            if not commands:
+                self.pending.pop(record["d"], None)
+        elif "x" in record:
+            self.pending.pop(record["x"], None)
+
+    async def _run(self) -> None:
+        """Write buffered records in batches."""
+        while True:
+            await self._wake.wait()
+            if not self._closing:
+                # Let records queued together end up in one write and one fsync
+                await asyncio.sleep(JOURNAL_FLUSH_DELAY)
+            self._wake.clear()
+            await self._flush()
+            if self._closing:
+                return
+
+    async def _flush(self) -> None:
+        """Append buffered records, or rewrite the file if it has grown too large."""
+        records, self._buffer = self._buffer, []
+        snapshot: list[dict[str, Any]] | None = None
+        live = sum(len(commands) for commands in self.pending.values())
+        if self._records_since_compaction > max(JOURNAL_COMPACT_THRESHOLD, 4 * live):
+            # The snapshot already includes the buffered records
+            snapshot = [
+                {"q": serial, "c": command, "v": value, "p": priority}
+                for serial, commands in self.pending.items()
+                for command, (value, priority) in commands.items()
+            ]
+            self._records_since_compaction = len(snapshot)
+            self.counters["compactions"] += 1
+        elif not records:
+            return
+        self.counters["flushes"] += 1
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._write, records, snapshot
+            )
+        except OSError as err:
+            _LOGGER.error("Could not write command journal %s: %s", self.path, err)
+
+    def _read(self) -> list[str]:
+        """Read the journal lines (runs in the executor)."""
+        try:
+            with self.path.open(encoding="utf-8") as file:
+                return [line for line in file if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _write(
+        self, records: list[dict[str, Any]], snapshot: list[dict[str, Any]] | None
+    ) -> None:
+        """Append records, or replace the file with a snapshot (runs in the executor)."""
+        if snapshot is None:
+            with self.path.open("a", encoding="utf-8") as file:
+                file.writelines(_dumps(record) + "\n" for record in records)
+                file.flush()
+                os.fsync(file.fileno())
+            return
+        tmp_path = self.path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as file:
+            file.writelines(_dumps(record) + "\n" for record in snapshot)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+
+    def metrics(self) -> dict[str, Any]:
+        """Return journal counters."""
+        return {
+            **self.counters,
+            "pending": sum(len(commands) for commands in self.pending.values()),
+            "buffered": len(self._buffer),
+        }
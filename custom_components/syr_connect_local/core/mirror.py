@@ -0,0 +1,129 @@
+"""Write-behind mirror of device check-ins to the SYR cloud.
+
+Check-ins are answered locally first; their bodies are then queued and
+forwarded to the upstream server by a background worker. The device never
+waits for the upstream, and when the upstream is slow or down the oldest
+queued check-ins are dropped.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+from typing import Any
+
+import aiohttp
+
+from ..const import (
+    MIRROR_MAX_ATTEMPTS,
+    MIRROR_QUEUE_SIZE,
+    MIRROR_RETRY_DELAY,
+    MIRROR_TIMEOUT,
+)
+from .protocol import SyrProtocol
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CloudMirror:
+    """Forward check-ins to an upstream SYR Connect server."""
+
+    def __init__(self, url: str) -> None:
+        """Initialize the mirror."""
+        self.url = url.rstrip("/")
+        # Called with the serial and the setters the upstream asked for
+        self.on_upstream_commands: Callable[[str, dict[str, str]], None] | None = None
+        self._queue: asyncio.Queue[tuple[str, bytes, str, str | None]] = asyncio.Queue(
+            MIRROR_QUEUE_SIZE
+        )
+        self._session: aiohttp.ClientSession | None = None
+        self._worker: asyncio.Task | None = None
+        self.counters: dict[str, int] = {
+            "forwarded": 0,
+            "failed": 0,
+            "dropped": 0,
+            "retries": 0,
+            "upstream_commands": 0,
+        }
+
+    async def start(self) -> None:
+        """Start the forwarding worker."""
+        self._session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=MIRROR_TIMEOUT)
+        )
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+        _LOGGER.info("Mirroring device check-ins to %s", self.url)
+
+    async def stop(self) -> None:
+        """Stop forwarding; queued check-ins are discarded."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def forward(self, path: str, body: bytes, host: str, serial: str | None) -> None:
+        """Queue a check-in body for the upstream; never blocks."""
+        item = (path, body, host, serial)
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Under pressure the oldest check-in is the least useful one
+            self._queue.get_nowait()
+            self._queue.put_nowait(item)
+            self.counters["dropped"] += 1
+
+    async def _run(self) -> None:
+        """Forward queued check-ins one at a time."""
+        while True:
+            path, body, host, serial = await self._queue.get()
+            for attempt in range(MIRROR_MAX_ATTEMPTS):
+                if attempt:
+                    self.counters["retries"] += 1
+                    await asyncio.sleep(MIRROR_RETRY_DELAY * 2 ** (attempt - 1))
+                try:
+                    response_body = await self._send(path, body, host)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                    _LOGGER.debug("Mirroring %s to %s failed: %s", path, self.url, err)
+                    continue
+                self.counters["forwarded"] += 1
+                if serial:
+                    self._handle_response(serial, response_body)
+                break
+            else:
+                self.counters["failed"] += 1
+
+    async def _send(self, path: str, body: bytes, host: str) -> str:
+        """Post a check-in body upstream and return the response body."""
+        assert self._session is not None
+        async with self._session.post(
+            f"{self.url}{path}",
+            data=body,
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                # The upstream may be addressed by IP to bypass the DNS redirect
+                "Host": host,
+            },
+        ) as response:
+            response.raise_for_status()
+            return await response.text()
+
+    def _handle_response(self, serial: str, response_body: str) -> None:
+        """Pass setters from the upstream response on."""
+        commands = {
+            name: value
+            for name, value in SyrProtocol.parse_xml(response_body).items()
+            if SyrProtocol.is_setter(name)
+        }
+        if commands and self.on_upstream_commands:
+            self.counters["upstream_commands"] += len(commands)
+            self.on_upstream_commands(serial, commands)
+
+    def metrics(self) -> dict[str, Any]:
+        """Return forwarding counters."""
+        return {"url": self.url, "queued": self._queue.qsize(), **self.counters}
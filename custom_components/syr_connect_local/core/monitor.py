@@ -0,0 +1,171 @@
+"""Event loop lag and slow code path monitor.
+
+A sampling task sleeps for a fixed period and measures how late it wakes
+up; that delay is time the loop spent on other callbacks. Integration code
+paths (request handlers, check-in processing, coordinator updates,
+dispatcher callbacks) report their own durations, so a lag spike can be
+attributed to the slow path that ran during it, or to code outside the
+integration if none did.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+import time
+from typing import Any
+
+from ..const import (
+    LOOP_LAG_SAMPLES,
+    LOOP_LAG_THRESHOLD,
+    LOOP_MONITOR_HISTORY,
+    LOOP_MONITOR_INTERVAL,
+    SLOW_PATH_THRESHOLD,
+)
+from .access_log import LogThrottle
+
+_LOGGER = logging.getLogger(__name__)
+
+# Code paths reported to the monitor
+PATH_REQUEST = "request"
+PATH_CHECK_IN = "check_in"
+PATH_COORDINATOR_UPDATE = "coordinator_update"
+PATH_DISPATCHER = "dispatcher"
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    """Return a percentile of sorted values."""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class LoopMonitor:
+    """Sample event loop lag and record slow integration code paths."""
+
+    def __init__(
+        self,
+        interval: float = LOOP_MONITOR_INTERVAL,
+        lag_threshold: float = LOOP_LAG_THRESHOLD,
+        slow_threshold: float = SLOW_PATH_THRESHOLD,
+    ) -> None:
+        """Initialize the monitor."""
+        self.interval = interval
+        self.lag_threshold = lag_threshold
+        self.slow_threshold = slow_threshold
+        self._task: asyncio.Task | None = None
+        self._lags: deque[float] = deque(maxlen=LOOP_LAG_SAMPLES)
+        self.max_lag = 0.0
+        self.lag_spikes = 0
+        # Path -> [count, total seconds, max seconds, slow count]
+        self._paths: dict[str, list[Any]] = {}
+        # Slow paths and lag spikes: (time, kind, path, detail, seconds)
+        self.history: deque[tuple[float, str, str, str | None, float]] = deque(
+            maxlen=LOOP_MONITOR_HISTORY
+        )
+        # End (monotonic), path and detail of the most recent slow path
+        self._last_slow: tuple[float, str, str | None] | None = None
+        self._log_throttle = LogThrottle()
+
+    @property
+    def running(self) -> bool:
+        """Return True while lag is being sampled."""
+        return self._task is not None
+
+    def start(self) -> None:
+        """Start sampling loop lag."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop sampling loop lag."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        """Measure how late the loop wakes up from a fixed sleep."""
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.lag_threshold:
+                self._lag_spike(now, lag)
+
+    def _lag_spike(self, now: float, lag: float) -> None:
+        """Record a lag spike and the slow path that ran during it, if any."""
+        self.lag_spikes += 1
+        cause, detail = "outside integration", None
+        if self._last_slow is not None and self._last_slow[0] >= now - lag - self.interval:
+            _, cause, detail = self._last_slow
+        self.history.append((time.time(), "lag", cause, detail, lag))
+        self._log_throttle.log(
+            _LOGGER,
+            logging.WARNING,
+            ("lag", cause),
+            "Event loop blocked for %.0f ms (%s)",
+            lag * 1000,
+            f"{cause} {detail}" if detail else cause,
+        )
+
+    def observe(self, path: str, duration: float, detail: str | None = None) -> None:
+        """Record the duration of an integration code path."""
+        stats = self._paths.get(path)
+        if stats is None:
+            stats = self._paths[path] = [0, 0.0, 0.0, 0]
+        stats[0] += 1
+        stats[1] += duration
+        if duration > stats[2]:
+            stats[2] = duration
+        if duration < self.slow_threshold:
+            return
+        stats[3] += 1
+        self._last_slow = (time.monotonic(), path, detail)
+        self.history.append((time.time(), "slow", path, detail, duration))
+        self._log_throttle.log(
+            _LOGGER,
+            logging.DEBUG,
+            ("slow", path),
+            "Slow %s (%s): %.0f ms",
+            path,
+            detail,
+            duration * 1000,
+        )
+
+    def metrics(self) -> dict[str, Any]:
+        """Return lag statistics, per-path timings and the slow event history."""
+        lags = sorted(self._lags)
+        return {
+            "running": self.running,
+            "lag": {
+                "samples": len(lags),
+                "p50_ms": round(_percentile(lags, 0.5) * 1000, 2) if lags else None,
+                "p99_ms": round(_percentile(lags, 0.99) * 1000, 2) if lags else None,
+                "max_ms": round(self.max_lag * 1000, 2),
+                "spikes": self.lag_spikes,
+            },
+            "paths": {
+                path: {
+                    "count": count,
+                    "mean_ms": round(total / count * 1000, 3),
+                    "max_ms": round(longest * 1000, 3),
+                    "slow": slow,
+                }
+                for path, (count, total, longest, slow) in self._paths.items()
+            },
+            "history": [
+                {
+                    "time": at,
+                    "kind": kind,
+                    "path": path,
+                    "detail": detail,
+                    "ms": round(seconds * 1000, 1),
+                }
+                for at, kind, path, detail, seconds in self.history
+            ],
+            "thresholds_ms": {
+                "lag": self.lag_threshold * 1000,
+                "slow_path": self.slow_threshold * 1000,
+            },
+        }
@@ -0,0 +1,247 @@
+"""Active polling of SYR devices with a local JSON API.
+
+Newer devices (SafeTech+, Neosoft) answer `GET <base>/get/ALL` with all
+their getters as JSON and accept setters as `GET <base>/set/<CMD>/<value>`.
+Polled properties go through the same check-in path as devices that post
+XML to the server, so identification, entities and commands work the same.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import logging
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote
+
+import aiohttp
+
+from ..const import (
+    IDENT_STATE_IDENTIFYING,
+    POLL_CONCURRENCY,
+    POLL_DEFAULT_PATH,
+    POLL_DEFAULT_PORT,
+    POLL_INTERVAL_MAX,
+    POLL_INTERVAL_MIN,
+    POLL_TIMEOUT,
+    PROPERTY_SERIAL,
+)
+
+if TYPE_CHECKING:
+    from .server import SyrConnectServer
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_poll_hosts(value: str | Iterable[str] | None) -> list[str]:
+    """Return base URLs for hosts, given as a list or a comma-separated string.
+
+    A bare host (or host:port) gets the default port and API path.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    urls: list[str] = []
+    for item in value:
+        if not (item := item.strip().rstrip("/")):
+            continue
+        if "://" not in item:
+            host, _, path = item.partition("/")
+            if ":" not in host:
+                host = f"{host}:{POLL_DEFAULT_PORT}"
+            item = f"http://{host}{'/' + path if path else POLL_DEFAULT_PATH}"
+        urls.append(item)
+    return urls
+
+
+def _as_property(value: Any) -> str:
+    """Return a JSON value as the string the XML protocol would carry."""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if value is None:
+        return ""
+    return str(value)
+
+
+class _PolledDevice:
+    """Polling state of one host."""
+
+    def __init__(self, url: str) -> None:
+        """Initialize the polling state."""
+        self.url = url
+        self.serial: str | None = None
+        self.interval = POLL_INTERVAL_MIN
+        self.wake = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.polls = 0
+        self.errors = 0
+        self.last_error: str | None = None
+
+
+class DevicePoller:
+    """Poll devices over one shared keep-alive session.
+
+    Each host is polled on its own adaptive interval: it doubles up to
+    POLL_INTERVAL_MAX while nothing changes and drops back to
+    POLL_INTERVAL_MIN on a change. Queued commands trigger an immediate
+    poll. At most POLL_CONCURRENCY hosts are polled at the same time.
+    """
+
+    def __init__(self, server: SyrConnectServer) -> None:
+        """Initialize the poller."""
+        self.server = server
+        self._devices: dict[str, _PolledDevice] = {}
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore = asyncio.Semaphore(POLL_CONCURRENCY)
+        self.commands_sent = 0
+
+    async def start(self, hosts: list[str]) -> None:
+        """Start polling the given base URLs."""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=POLL_CONCURRENCY, limit_per_host=1),
+                timeout=aiohttp.ClientTimeout(total=POLL_TIMEOUT),
+            )
+        await self.set_hosts(hosts)
+
+    async def set_hosts(self, hosts: list[str]) -> None:
+        """Poll exactly the given base URLs; devices already polled keep their state."""
+        for url in set(self._devices) - set(hosts):
+            await self._stop_device(self._devices.pop(url))
+        for url in hosts:
+            if url not in self._devices:
+                device = self._devices[url] = _PolledDevice(url)
+                device.task = asyncio.get_running_loop().create_task(self._poll_loop(device))
+                _LOGGER.info("Polling SYR device at %s", url)
+
+    async def stop(self) -> None:
+        """Stop polling and close the session."""
+        for device in self._devices.values():
+            await self._stop_device(device)
+        self._devices.clear()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @staticmethod
+    async def _stop_device(device: _PolledDevice) -> None:
+        """Cancel the polling task of a device."""
+        if device.task is not None:
+            device.task.cancel()
+            try:
+                await device.task
+            except asyncio.CancelledError:
+                pass
+            device.task = None
+
+    def wake(self, serial: str) -> None:
+        """Poll the device with the given serial now, e.g. to deliver commands."""
+        for device in self._devices.values():
+            if device.serial == serial:
+                device.wake.set()
+
+    async def _poll_loop(self, device: _PolledDevice) -> None:
+        """Poll one device until cancelled."""
+        while True:
+            async with self._semaphore:
+                try:
+                    changed = await self._poll(device)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+                    device.errors += 1
+                    device.last_error = str(err) or type(err).__name__
+                    _LOGGER.debug("Polling %s failed: %s", device.url, device.last_error)
+                    # Back off like an unchanged device
+                    changed = False
+                else:
+                    device.last_error = None
+
+            if changed:
+                device.interval = POLL_INTERVAL_MIN
+            else:
+                device.interval = min(device.interval * 2, POLL_INTERVAL_MAX)
+
+            state = self.server.get_device(device.serial) if device.serial else None
+            if state is not None and state.identification_state == IDENT_STATE_IDENTIFYING:
+                # Identification completes on the next check-in: poll again
+                # without backing off, but never more often than the minimum
+                device.interval = POLL_INTERVAL_MIN
+            try:
+                await asyncio.wait_for(device.wake.wait(), device.interval)
+            except asyncio.TimeoutError:
+                pass
+            device.wake.clear()
+
+    async def _poll(self, device: _PolledDevice) -> bool:
+        """Fetch all getters, deliver pending commands; return True if anything changed."""
+        assert self._session is not None
+        async with self._session.get(f"{device.url}/get/ALL") as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+        if not isinstance(data, dict):
+            raise ValueError("Unexpected response")
+
+        properties = {name: _as_property(value) for name, value in data.items()}
+        serial = properties.get(PROPERTY_SERIAL)
+        if not serial:
+            raise ValueError("Response without serial number")
+        device.serial = serial
+        device.polls += 1
+
+        state = self.server.get_device(serial)
+        previous = dict(state.properties) if state is not None else {}
+        state = self.server.process_check_in(serial, properties)
+        changed = any(previous.get(name) != value for name, value in properties.items())
+
+        if state is None or not state.is_identified:
+            return changed
+        # Undelivered commands are queued again with their priority and queue time
+        queued = {
+            command: (state.command_priorities[command], state.command_queued_at[command])
+            for command in state.pending_commands
+        }
+        if commands := state.get_pending_commands():
+            self.server.log_throttle.log(
+                _LOGGER,
+                logging.INFO,
+                ("commands", serial),
+                "Sending %d commands to device %s: %s",
+                len(commands),
+                serial,
+                commands,
+            )
+            items = list(commands.items())
+            for index, (command, value) in enumerate(items):
+                # Setters are sent one by one over the same connection
+                try:
+                    async with self._session.get(
+                        f"{device.url}/set/{command[3:]}/{quote(value, safe='')}"
+                    ) as response:
+                        response.raise_for_status()
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    # Keep the undelivered commands for the next poll, unless
+                    # a newer value has been queued in the meantime
+                    for command, value in items[index:]:
+                        if command not in state.pending_commands:
+                            state.queue_command(command, value, *queued[command])
+                    raise
+                self.commands_sent += 1
+            # Read back the new values right away
+            device.wake.set()
+            changed = True
+        return changed
+
+    def metrics(self) -> dict[str, Any]:
+        """Return polling counters."""
+        return {
+            "commands_sent": self.commands_sent,
+            "devices": {
+                device.url: {
+                    "serial": device.serial,
+                    "interval": device.interval,
+                    "polls": device.polls,
+                    "errors": device.errors,
+                    "last_error": device.last_error,
+                }
+                for device in self._devices.values()
+            },
+        }
@@ -0,0 +1,171 @@
+"""On-demand profiling of the running server.
+
+Two profilers are offered. The sampling profiler captures the stack of the
+event loop thread from a separate thread every few milliseconds; it is
+cheap enough for real traffic and yields collapsed stacks for flamegraph
+tools. The deterministic profiler (cProfile) records every call on the
+event loop thread, with exact call counts at a higher overhead. Either can
+additionally trace memory allocations with tracemalloc.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+import cProfile
+import io
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any
+
+from ..const import PROFILE_SAMPLE_INTERVAL, PROFILE_TOP
+
+MODE_SAMPLE = "sample"
+MODE_CPROFILE = "cprofile"
+
+# Install location of a file, up to the package or stdlib module
+_PATH_PREFIX = re.compile(r".*/(?:site-packages|custom_components|lib/python[\d.]+)/")
+
+
+def _frame_name(frame: Any) -> str:
+    """Return a short name for a stack frame: module file and function."""
+    code = frame.f_code
+    return f"{_PATH_PREFIX.sub('', code.co_filename)}:{code.co_name}"
+
+
+class _Sampler(threading.Thread):
+    """Capture the stack of one thread at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        """Initialize the sampler."""
+        super().__init__(name="syr_connect_local_profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        """Sample until stopped."""
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # noqa: SLF001
+            names: list[str] = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            self.samples += 1
+            self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the thread."""
+        self._stopped.set()
+        self.join()
+
+
+def _sample_stats(stacks: Counter[str], samples: int, top: int) -> list[dict[str, Any]]:
+    """Return the functions seen most often, by own and total samples."""
+    own: Counter[str] = Counter()
+    total: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        own[frames[-1]] += count
+        for name in set(frames):
+            total[name] += count
+    return [
+        {
+            "function": name,
+            "own_percent": round(own[name] * 100 / samples, 1),
+            "total_percent": round(count * 100 / samples, 1),
+        }
+        for name, count in sorted(total.items(), key=lambda item: (-own[item[0]], -item[1]))[
+            :top
+        ]
+    ]
+
+
+def _cprofile_stats(profile: cProfile.Profile, top: int) -> str:
+    """Return the cProfile report, sorted by cumulative and by own time."""
+    output = io.StringIO()
+    stats = pstats.Stats(profile, stream=output)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    return output.getvalue()
+
+
+def _allocations(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top: int
+) -> list[dict[str, Any]]:
+    """Return the source lines that allocated the most memory between snapshots."""
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_kib": round(stat.size_diff / 1024, 1),
+            "count": stat.count_diff,
+        }
+        for stat in after.compare_to(before, "lineno")[:top]
+        if stat.size_diff > 0
+    ]
+
+
+async def profile(
+    duration: float, mode: str = MODE_SAMPLE, memory: bool = False, top: int = PROFILE_TOP
+) -> dict[str, Any]:
+    """Profile the event loop thread for duration seconds while it keeps serving.
+
+    Must be called on the event loop thread. Reports are built in the
+    executor, so building them does not stall the loop.
+    """
+    loop = asyncio.get_running_loop()
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        memory_before = tracemalloc.take_snapshot() if memory else None
+        sampler: _Sampler | None = None
+        profiler: cProfile.Profile | None = None
+        if mode == MODE_CPROFILE:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            sampler = _Sampler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL)
+            sampler.start()
+        started = time.monotonic()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            if sampler is not None:
+                # Returns within one sample interval
+                sampler.stop()
+        memory_after = (
+            await loop.run_in_executor(None, tracemalloc.take_snapshot) if memory else None
+        )
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    result: dict[str, Any] = {
+        "mode": mode,
+        "duration": round(time.monotonic() - started, 3),
+    }
+    if sampler is not None:
+        samples = max(sampler.samples, 1)
+        result["samples"] = sampler.samples
+        result["stats"] = await loop.run_in_executor(
+            None, _sample_stats, sampler.stacks, samples, top
+        )
+        # Brendan Gregg's collapsed format, for flamegraph.pl or speedscope
+        result["collapsed"] = "\n".join(
+            f"{stack} {count}" for stack, count in sampler.stacks.most_common()
+        )
+    if profiler is not None:
+        result["stats"] = await loop.run_in_executor(None, _cprofile_stats, profiler, top)
+    if memory_before is not None and memory_after is not None:
+        result["allocations"] = await loop.run_in_executor(
+            None, _allocations, memory_before, memory_after, top
+        )
+    return result
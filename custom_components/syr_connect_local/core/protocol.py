@@ -78,11 +78,12 @@ class SyrProtocol:
                     if name:
                         properties[name] = value or ""
             
-            _LOGGER.debug("Parsed XML properties: %s", properties)
+            _LOGGER.debug("Parsed %d XML properties", len(properties))
             return properties
             
         except ET.ParseError as err:
-            _LOGGER.error("Failed to parse XML: %s", err)
+            # Reported (rate-limited) by the caller, which knows the client
+            _LOGGER.debug("Failed to parse XML: %s", err)
             return {}
         except Exception as err:
             _LOGGER.error("Unexpected error parsing XML: %s", err)
@@ -0,0 +1,222 @@
+"""Support for running behind a reverse proxy.
+
+Restores the device address from the PROXY protocol (v1 and v2) or from
+X-Forwarded-For, but only for connections from trusted proxies.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import ipaddress
+import logging
+import socket
+import struct
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+IPNetwork = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+PROXY_V1_PREFIX = b"PROXY "
+PROXY_V1_MAX_LENGTH = 107
+PROXY_V2_SIGNATURE = b"\r\n\r\n\x00\r\nQUIT\n"
+_PROXY_V2_HEADER = struct.Struct("!12sBBH")
+
+
+class ProxyProtocolError(ValueError):
+    """Invalid PROXY protocol header."""
+
+
+def parse_trusted_proxies(value: str | Iterable[str] | None) -> list[IPNetwork]:
+    """Parse addresses and networks, given as a list or a comma-separated string."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    networks: list[IPNetwork] = []
+    for item in value:
+        if item := item.strip():
+            networks.append(ipaddress.ip_network(item, strict=False))
+    return networks
+
+
+def is_trusted(host: str | None, trusted_proxies: list[IPNetwork]) -> bool:
+    """Return True if host is one of the trusted proxies."""
+    if not host or not trusted_proxies:
+        return False
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in trusted_proxies)
+
+
+def forwarded_client(header: str, peer: str, trusted_proxies: list[IPNetwork]) -> str:
+    """Return the client address from an X-Forwarded-For header.
+
+    Walks the chain from the right and returns the first address that is
+    not a trusted proxy, so clients cannot spoof their address.
+    """
+    client = peer
+    for host in reversed([host.strip() for host in header.split(",")]):
+        if not host:
+            break
+        client = host
+        if not is_trusted(host, trusted_proxies):
+            break
+    return client
+
+
+def parse_proxy_header(data: bytes) -> tuple[tuple[str, int] | None, int] | None:
+    """Parse a PROXY protocol header at the start of data.
+
+    Returns the source address (None for LOCAL/UNKNOWN connections) and the
+    header length, or None if more data is needed.
+    """
+    if data.startswith(PROXY_V2_SIGNATURE[: len(data)]) and len(data) < 16:
+        return None
+    if data.startswith(PROXY_V2_SIGNATURE):
+        return _parse_proxy_v2(data)
+    if data.startswith(PROXY_V1_PREFIX[: len(data)]) and len(data) < len(PROXY_V1_PREFIX):
+        return None
+    if data.startswith(PROXY_V1_PREFIX):
+        return _parse_proxy_v1(data)
+    raise ProxyProtocolError("Missing PROXY protocol header")
+
+
+def _parse_proxy_v1(data: bytes) -> tuple[tuple[str, int] | None, int] | None:
+    """Parse a PROXY protocol v1 (text) header."""
+    end = data.find(b"\r\n", 0, PROXY_V1_MAX_LENGTH)
+    if end < 0:
+        if len(data) >= PROXY_V1_MAX_LENGTH:
+            raise ProxyProtocolError("PROXY v1 header too long")
+        return None
+
+    parts = data[:end].decode("ascii", "replace").split(" ")
+    if len(parts) >= 2 and parts[1] == "UNKNOWN":
+        return None, end + 2
+    if len(parts) != 6 or parts[1] not in ("TCP4", "TCP6"):
+        raise ProxyProtocolError("Malformed PROXY v1 header")
+    try:
+        ipaddress.ip_address(parts[2])
+        return (parts[2], int(parts[4])), end + 2
+    except ValueError as err:
+        raise ProxyProtocolError("Malformed PROXY v1 address") from err
+
+
+def _parse_proxy_v2(data: bytes) -> tuple[tuple[str, int] | None, int] | None:
+    """Parse a PROXY protocol v2 (binary) header."""
+    _, version_command, family, length = _PROXY_V2_HEADER.unpack_from(data)
+    total = _PROXY_V2_HEADER.size + length
+    if len(data) < total:
+        return None
+    if version_command >> 4 != 2:
+        raise ProxyProtocolError("Unsupported PROXY protocol version")
+
+    # LOCAL command (health checks) and unsupported families keep the peer address
+    if version_command & 0x0F == 0:
+        return None, total
+    body = data[_PROXY_V2_HEADER.size : total]
+    if family >> 4 == 1 and length >= 12:
+        host = socket.inet_ntop(socket.AF_INET, body[0:4])
+        return (host, struct.unpack_from("!H", body, 8)[0]), total
+    if family >> 4 == 2 and length >= 36:
+        host = socket.inet_ntop(socket.AF_INET6, body[0:16])
+        return (host, struct.unpack_from("!H", body, 32)[0]), total
+    return None, total
+
+
+class _ProxiedTransport:
+    """Transport that reports the address from the PROXY header as peer."""
+
+    def __init__(self, transport: asyncio.Transport, peername: Any) -> None:
+        """Initialize the transport wrapper."""
+        self._transport = transport
+        self._peername = peername
+
+    def get_extra_info(self, name: str, default: Any = None) -> Any:
+        """Return transport information, with the proxied peer address."""
+        if name == "peername":
+            return self._peername
+        return self._transport.get_extra_info(name, default)
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the real transport."""
+        return getattr(self._transport, name)
+
+
+class ProxyProtocolGate(asyncio.Protocol):
+    """Read the PROXY header, then hand the connection to the HTTP protocol."""
+
+    def __init__(
+        self, protocol: asyncio.Protocol, trusted_proxies: list[IPNetwork]
+    ) -> None:
+        """Initialize the gate."""
+        self._protocol = protocol
+        self._trusted_proxies = trusted_proxies
+        self._transport: asyncio.Transport | None = None
+        self._buffer = b""
+        self._started = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Wait for the PROXY header."""
+        self._transport = transport  # type: ignore[assignment]
+
+    def data_received(self, data: bytes) -> None:
+        """Parse the PROXY header, then pass data through."""
+        if self._started:
+            self._protocol.data_received(data)
+            return
+
+        assert self._transport is not None
+        self._buffer += data
+        try:
+            result = parse_proxy_header(self._buffer)
+        except ProxyProtocolError as err:
+            _LOGGER.debug("Closing connection from %s: %s", self._peer(), err)
+            self._transport.close()
+            return
+        if result is None:
+            return
+
+        source, length = result
+        peername = self._transport.get_extra_info("peername")
+        # Only proxies may tell us who the client is; unix socket peers are local
+        peer_host = peername[0] if isinstance(peername, tuple) else None
+        if source is not None and (
+            not peer_host or is_trusted(peer_host, self._trusted_proxies)
+        ):
+            peername = source
+        elif source is not None:
+            _LOGGER.debug("Ignoring PROXY header from untrusted peer %s", peer_host)
+
+        self._started = True
+        rest, self._buffer = self._buffer[length:], b""
+        self._protocol.connection_made(_ProxiedTransport(self._transport, peername))  # type: ignore[arg-type]
+        if rest:
+            self._protocol.data_received(rest)
+
+    def _peer(self) -> Any:
+        """Return the address of the connected peer."""
+        return self._transport.get_extra_info("peername") if self._transport else None
+
+    def eof_received(self) -> bool | None:
+        """Pass end of stream through."""
+        if self._started:
+            return self._protocol.eof_received()
+        return None
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Pass connection loss through."""
+        if self._started:
+            self._protocol.connection_lost(exc)
+
+    def pause_writing(self) -> None:
+        """Pass flow control through."""
+        if self._started:
+            self._protocol.pause_writing()
+
+    def resume_writing(self) -> None:
+        """Pass flow control through."""
+        if self._started:
+            self._protocol.resume_writing()
@@ -0,0 +1,218 @@
+"""Client for a standalone SYR Connect Local server."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable
+
+import aiohttp
+
+from .capabilities import CapabilityMap
+from ..const import REMOTE_POLL_TIMEOUT, REMOTE_RETRY_DELAY
+from .device import DeviceState
+from .monitor import LoopMonitor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RemoteSyrConnectServer:
+    """Mirror the device state of a standalone server.
+
+    Offers the same interface as SyrConnectServer, so the coordinators and
+    platforms work unchanged. Device state is long-polled from the
+    standalone server's local API and commands are posted to it.
+    """
+
+    def __init__(
+        self, url: str, token: str | None = None, loop_monitor: bool = False
+    ) -> None:
+        """Initialize the client."""
+        self.url = url.rstrip("/")
+        self.token = token
+        # Lag of Home Assistant's event loop; the standalone server monitors its own
+        self.monitor: LoopMonitor | None = LoopMonitor() if loop_monitor else None
+        self.devices: dict[str, DeviceState] = {}
+        # Learned capabilities live in the standalone process
+        self.capabilities = CapabilityMap()
+        self.known_devices: dict[str, dict[str, str]] = {}
+        self.http_port = None
+        self.https_port = None
+        self.use_https = False
+        self.enable_debug_endpoints = False
+        self.on_device_discovered: Callable[[str, dict[str, str]], None] | None = None
+        self.on_device_update: Callable[[str, dict[str, str]], None] | None = None
+        self.on_device_removed: Callable[[str], None] | None = None
+        self.on_state_changed: Callable[[], None] | None = None
+        self._session: aiohttp.ClientSession | None = None
+        self._poll_task: asyncio.Task | None = None
+        self._request_tasks: set[asyncio.Task] = set()
+        # Versions count from 0 in every standalone process, see _poll
+        self._instance: str | None = None
+        self._version = 0
+
+    async def start(self) -> None:
+        """Load the current state and start following changes."""
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else None
+        self._session = aiohttp.ClientSession(headers=headers)
+        try:
+            # Fail setup early if the standalone server is unreachable
+            await self._poll(timeout=0)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            await self._session.close()
+            raise
+        self._poll_task = asyncio.create_task(self._poll_loop())
+        if self.monitor is not None:
+            self.monitor.start()
+        _LOGGER.info("Connected to standalone server at %s", self.url)
+
+    async def stop(self) -> None:
+        """Stop following changes."""
+        if self.monitor is not None:
+            self.monitor.stop()
+        if self._poll_task:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def _poll_loop(self) -> None:
+        """Long-poll the standalone server for changes."""
+        while True:
+            try:
+                await self._poll(timeout=REMOTE_POLL_TIMEOUT)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                _LOGGER.warning("Standalone server unreachable: %s", err)
+                await asyncio.sleep(REMOTE_RETRY_DELAY)
+            except Exception:  # pylint: disable=broad-except
+                # A malformed answer must not stop following the server; it
+                # may have been applied partly, so resync fully
+                _LOGGER.exception("Unexpected state update from standalone server")
+                self._version = 0
+                await asyncio.sleep(REMOTE_RETRY_DELAY)
+
+    async def _poll(self, timeout: float) -> None:
+        """Fetch changes since the last known version and apply them."""
+        assert self._session is not None
+        params = {"since": str(self._version), "timeout": str(timeout)}
+        if self._instance is not None:
+            # A restarted standalone server then answers with all devices
+            params["instance"] = self._instance
+        async with self._session.get(
+            f"{self.url}/api/state",
+            params=params,
+            timeout=aiohttp.ClientTimeout(total=timeout + 10),
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+
+        self._instance = data["instance"]
+        self._version = data["version"]
+        # Drop devices the standalone server no longer knows (removed or evicted)
+        for serial in set(self.devices) - set(data["serials"]):
+            device = self.devices.pop(serial)
+            if device.is_identified and self.on_device_removed:
+                self.on_device_removed(serial)
+
+        for serial, device_data in data["devices"].items():
+            self._apply(serial, device_data)
+
+    def _apply(self, serial: str, data: dict[str, Any]) -> None:
+        """Apply a device snapshot and fire the callbacks."""
+        device = self.devices.get(serial)
+        if device is None:
+            device = self.devices[serial] = DeviceState(serial)
+        was_identified = device.is_identified
+
+        now = asyncio.get_running_loop().time()
+        device.properties = data["properties"]
+        device.pending_commands = data["pending_commands"]
+        device.identification_state = data["identification_state"]
+        if data["last_seen_seconds_ago"] is not None:
+            device.last_seen = now - data["last_seen_seconds_ago"]
+        if data["time_to_identify_seconds"] is not None:
+            device.first_seen = 0
+            device.identified_at = data["time_to_identify_seconds"]
+
+        if not device.is_identified:
+            return
+        self.known_devices[serial] = device.properties
+        if not was_identified:
+            if self.on_device_discovered:
+                self.on_device_discovered(serial, device.properties)
+        elif self.on_device_update:
+            self.on_device_update(serial, device.properties)
+
+    def export_state(self) -> dict[str, Any]:
+        """Return state to persist; the standalone server keeps its own."""
+        return {}
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore persisted state; the standalone server keeps its own."""
+
+    def get_access_log(self, serial: str | None = None) -> list[dict[str, Any]]:
+        """Return recent requests; they are kept by the standalone server."""
+        return []
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Return server metrics; they are kept by the standalone server."""
+        if self.monitor is not None:
+            return {"loop": self.monitor.metrics()}
+        return {}
+
+    def get_device(self, serial: str) -> DeviceState | None:
+        """Get device state by serial number."""
+        return self.devices.get(serial)
+
+    def get_all_devices(self) -> dict[str, DeviceState]:
+        """Get all device states."""
+        return self.devices
+
+    def remove_device(self, serial: str) -> bool:
+        """Forget a device here and on the standalone server."""
+        if self.devices.pop(serial, None) is None:
+            return False
+        self.known_devices.pop(serial, None)
+        self._schedule("DELETE", f"/api/devices/{serial}")
+        return True
+
+    async def async_queue_commands(self, serial: str, commands: dict[str, str]) -> bool:
+        """Queue commands for a device on the standalone server.
+
+        Returns True once the standalone server has accepted them.
+        """
+        device = self.devices.get(serial)
+        if device is None:
+            _LOGGER.warning("Cannot queue command for unknown device: %s", serial)
+            return False
+        if not await self._request(
+            "POST", f"/api/devices/{serial}/commands", {"commands": commands}
+        ):
+            return False
+        # Reflect the commands locally until the next state update arrives
+        device.pending_commands.update(commands)
+        return True
+
+    def _schedule(self, method: str, path: str, payload: Any = None) -> None:
+        """Send a request to the standalone server in the background."""
+        task = asyncio.get_running_loop().create_task(self._request(method, path, payload))
+        self._request_tasks.add(task)
+        task.add_done_callback(self._request_tasks.discard)
+
+    async def _request(self, method: str, path: str, payload: Any) -> bool:
+        """Send a request to the standalone server and return whether it succeeded."""
+        if self._session is None:
+            return False
+        try:
+            async with self._session.request(
+                method, f"{self.url}{path}", json=payload
+            ) as response:
+                response.raise_for_status()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.error("Request %s %s to standalone server failed: %s", method, path, err)
+            return False
+        return True
@@ -0,0 +1,1343 @@
+"""SYR Connect Local HTTP/HTTPS server implementation."""
+from __future__ import annotations
+
+import asyncio
+import hmac
+import logging
+import socket
+import ssl
+import sys
+import time
+from typing import Any, Callable
+
+from aiohttp import hdrs, web
+
+if sys.version_info >= (3, 11):
+    from asyncio import timeout as async_timeout
+else:  # Python 3.10, where aiohttp depends on async_timeout
+    from async_timeout import timeout as async_timeout
+
+from ..const import (
+    ADMISSION_KEEPALIVE_TIMEOUT,
+    ADMISSION_MAX_REQUEST_SIZE,
+    ADMISSION_REQUEST_TIMEOUT,
+    ALL_COMMANDS,
+    BASIC_COMMANDS,
+    CERT_WATCH_INTERVAL,
+    COMMAND_PRIORITY_HIGH,
+    COMMAND_PRIORITY_LOW,
+    DEFAULT_DEVICE_CAPACITY,
+    DEFAULT_DNS_PORT,
+    DEVICE_SWEEP_INTERVAL,
+    ENDPOINT_ALL,
+    ENDPOINT_ALL_ALT,
+    ENDPOINT_BASIC,
+    ENDPOINT_BASIC_ALT,
+    ENDPOINT_PROFILE,
+    ENDPOINT_SNAPSHOT,
+    ENDPOINT_STREAM,
+    EXTENDED_PROPERTIES,
+    FAST_LANE_PROPERTIES,
+    IDENT_STATE_IDENTIFIED,
+    IDENT_STATE_IDENTIFYING,
+    IDENT_STATE_NEW,
+    LEAKAGE_PROPERTIES,
+    PROPERTY_SERIAL,
+    PROPERTY_VALVE_SHUTOFF,
+    PROPERTY_VALVE_STATUS,
+    PROFILE_DEFAULT_DURATION,
+    PROFILE_MAX_DURATION,
+    PROFILE_TOP,
+    UNIDENTIFIED_DEVICE_TTL,
+)
+from .access_log import AccessLog, LogThrottle
+from .admission import AdmissionControl, GatedSite
+from .capabilities import CapabilityMap
+from .device import DeviceState
+from .dns import DnsResponder, detect_local_address, parse_upstream
+from .journal import CommandJournal
+from .mirror import CloudMirror
+from .monitor import PATH_CHECK_IN, PATH_REQUEST, LoopMonitor
+from .poller import DevicePoller, parse_poll_hosts
+from .profiler import MODE_CPROFILE, MODE_SAMPLE, profile
+from .protocol import SyrProtocol
+from .snapshot import CONTENT_TYPES, FORMAT_JSON, SnapshotCache, available_formats
+from .stream import DeviceStream
+from .proxy import forwarded_client, is_trusted, parse_trusted_proxies
+from .tls import get_ssl_context, session_metrics
+from .tls_offload import TlsOffloader
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lets a new listener bind a port before the old one on it is closed
+_REUSE_PORT = hasattr(socket, "SO_REUSEPORT")
+
+
+class SyrConnectServer:
+    """SYR Connect local server implementation."""
+
+    def __init__(
+        self,
+        http_port: int = 80,
+        https_port: int = 443,
+        use_https: bool = False,
+        cert_file: str | None = None,
+        key_file: str | None = None,
+        enable_debug_endpoints: bool = False,
+        tls_offload: bool = False,
+        unix_socket: str | None = None,
+        trusted_proxies: list[str] | str | None = None,
+        proxy_protocol: bool = False,
+        device_expiry: float = 0,
+        device_capacity: int = DEFAULT_DEVICE_CAPACITY,
+        enable_stream: bool = False,
+        enable_snapshot: bool = False,
+        poll_hosts: list[str] | str | None = None,
+        cloud_mirror_url: str | None = None,
+        dns_responder: bool = False,
+        dns_address: str | None = None,
+        dns_upstream: str | None = None,
+        dns_clients: list[str] | str | None = None,
+        dns_port: int = DEFAULT_DNS_PORT,
+        journal_path: str | None = None,
+        loop_monitor: bool = False,
+        profile_token: str | None = None,
+    ):
+        """Initialize the server."""
+        self.http_port = http_port
+        self.https_port = https_port
+        self.use_https = use_https
+        self.cert_file = cert_file
+        self.key_file = key_file
+        self.tls_offload = tls_offload
+        self.unix_socket = unix_socket
+        # Proxies allowed to report the client address (PROXY header, X-Forwarded-For)
+        self.trusted_proxies = parse_trusted_proxies(trusted_proxies)
+        self.proxy_protocol = proxy_protocol
+        self.admission = AdmissionControl(self.trusted_proxies)
+
+        self.devices: dict[str, DeviceState] = {}
+        # Seconds without a check-in after which an identified device is evicted (0: never)
+        self.device_expiry = device_expiry
+        # Most serials tracked at once; identified devices are never evicted to make room
+        self.device_capacity = device_capacity
+        self.evictions: dict[str, int] = {"unidentified": 0, "expired": 0, "capacity": 0}
+        # New serials turned away because the table was full of identified devices
+        self.rejected_serials = 0
+        self._sweep_task: asyncio.Task | None = None
+        # Per-request detail goes here instead of the log
+        self.access_log = AccessLog()
+        # Limits messages that could otherwise repeat on every check-in
+        self.log_throttle = LogThrottle()
+        self.protocol = SyrProtocol()
+        self.app = web.Application(
+            middlewares=[
+                self._client_address_middleware,
+                self._access_log_middleware,
+                self._admission_middleware,
+            ],
+            client_max_size=ADMISSION_MAX_REQUEST_SIZE,
+        )
+        self.runner: web.AppRunner | None = None
+        self.sites: list[web.BaseSite] = []
+        self._http_site: web.BaseSite | None = None
+        self._https_site: web.BaseSite | None = None
+        self._unix_site: web.BaseSite | None = None
+        # TLS offloaders by the loopback site they forward to
+        self._tls_offloaders: dict[web.BaseSite, TlsOffloader] = {}
+        # Context the HTTPS site listens with; handshakes switch to _active_ssl_context
+        self.ssl_context: ssl.SSLContext | None = None
+        self._active_ssl_context: ssl.SSLContext | None = None
+        self._cert_watch_task: asyncio.Task | None = None
+        self.enable_debug_endpoints = enable_debug_endpoints
+        # Bearer token for the profiling endpoint; it is disabled without one
+        self.profile_token = profile_token
+        self._profiling = False
+        self.enable_stream = enable_stream
+        self.stream = DeviceStream(self.get_all_devices)
+        self.enable_snapshot = enable_snapshot
+        self.snapshot = SnapshotCache(self.get_all_devices)
+        # Devices with a local JSON API are polled instead of checking in
+        self.poll_hosts = parse_poll_hosts(poll_hosts)
+        self.poller: DevicePoller | None = None
+        # Check-ins are forwarded to the SYR cloud after they are answered
+        self.cloud_mirror_url = cloud_mirror_url
+        self.mirror: CloudMirror | None = None
+        # Answers DNS for the SYR cloud domains with this host's address
+        self.dns_settings = (dns_responder, dns_address, dns_upstream, dns_clients, dns_port)
+        self.dns: DnsResponder | None = None
+        # Pending commands survive restarts and evictions; kept ones wait for their device
+        self.journal = CommandJournal(journal_path) if journal_path else None
+        self._restored_commands: dict[str, dict[str, tuple[str, int]]] = {}
+        # Samples event loop lag; code paths report their durations to it
+        self.loop_monitor = loop_monitor
+        self.monitor: LoopMonitor | None = None
+        self.capabilities = CapabilityMap()
+        # Last known properties of identified devices, used to fast-track them
+        self.known_devices: dict[str, dict[str, str]] = {}
+
+        # Callbacks for device events
+        self.on_device_discovered: Callable[[str, dict[str, str]], None] | None = None
+        self.on_device_update: Callable[[str, dict[str, str]], None] | None = None
+        # Called with the serial of an identified device that was evicted
+        self.on_device_removed: Callable[[str], None] | None = None
+        # Called when state worth persisting (see export_state) has changed
+        self.on_state_changed: Callable[[], None] | None = None
+
+        # Setup routes
+        self._setup_routes()
+
+    def _setup_routes(self) -> None:
+        """Setup HTTP routes."""
+        # Main endpoints
+        self.app.router.add_post(ENDPOINT_BASIC, self.handle_basic_commands)
+        self.app.router.add_post(ENDPOINT_ALL, self.handle_all_commands)
+
+        # Alternative endpoints
+        self.app.router.add_post(ENDPOINT_BASIC_ALT, self.handle_basic_commands)
+        self.app.router.add_post(ENDPOINT_ALL_ALT, self.handle_all_commands)
+
+        # Live device stream; always routed so it can be toggled at runtime
+        self.app.router.add_get(ENDPOINT_STREAM, self.handle_stream)
+        self.app.router.add_get(ENDPOINT_SNAPSHOT, self.handle_snapshot)
+
+        # Debug-only endpoints; always routed so they can be toggled at runtime
+        self.app.router.add_get("/status", self.handle_status)
+        self.app.router.add_get("/echo", self.handle_echo)
+        self.app.router.add_post("/echo", self.handle_echo)
+        self.app.router.add_get(ENDPOINT_PROFILE, self.handle_profile)
+
+    @web.middleware
+    async def _client_address_middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        """Restore the device address of forwarded connections.
+
+        Covers connections from the TLS offloader and, from trusted proxies
+        or the unix socket, the X-Forwarded-For header.
+        """
+        if self._tls_offloaders and request.transport is not None:
+            peername = request.transport.get_extra_info("peername")
+            if peername and peername[0] == "127.0.0.1":
+                for offloader in self._tls_offloaders.values():
+                    if client := offloader.clients.get(peername[1]):
+                        request = request.clone(remote=client, scheme="https")
+                        break
+
+        forwarded_for = request.headers.get("X-Forwarded-For")
+        if forwarded_for and (
+            not request.remote or is_trusted(request.remote, self.trusted_proxies)
+        ):
+            request = request.clone(
+                remote=forwarded_client(forwarded_for, request.remote, self.trusted_proxies),
+                scheme=request.headers.get("X-Forwarded-Proto", request.scheme),
+            )
+        return await handler(request)
+
+    @web.middleware
+    async def _access_log_middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        """Record each request in the access log.
+
+        Handlers add the device serial and the commands sent to the request
+        as "serial" and "commands".
+        """
+        if request.path == ENDPOINT_STREAM:
+            return await handler(request)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        status = 500
+        response_bytes = None
+        try:
+            response = await handler(request)
+            status = response.status
+            response_bytes = response.content_length
+            return response
+        except web.HTTPException as err:
+            status = err.status
+            raise
+        finally:
+            duration = loop.time() - start
+            self.access_log.record(
+                request.remote,
+                request.get("serial"),
+                request.path,
+                status,
+                request.content_length,
+                response_bytes,
+                duration,
+                request.get("commands"),
+            )
+            if self.monitor is not None:
+                self.monitor.observe(PATH_REQUEST, duration, request.path)
+
+    @web.middleware
+    async def _admission_middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        """Rate-limit clients and bound request size and duration."""
+        admission = self.admission
+        if request.remote and not admission.allow_request(request.remote):
+            return web.Response(status=429, headers={"Retry-After": "1"})
+        if request.content_length and request.content_length > ADMISSION_MAX_REQUEST_SIZE:
+            admission.rejected["request_too_large"] += 1
+            return web.Response(status=413)
+        if request.path in (ENDPOINT_STREAM, ENDPOINT_PROFILE):
+            # Streams stay open for as long as the subscriber wants, profiles
+            # run for as long as requested
+            return await handler(request)
+        try:
+            async with async_timeout(ADMISSION_REQUEST_TIMEOUT):
+                return await handler(request)
+        except asyncio.TimeoutError:
+            admission.rejected["request_timeout"] += 1
+            return web.Response(status=408)
+        except web.HTTPRequestEntityTooLarge:
+            # Chunked bodies have no Content-Length to check up front
+            admission.rejected["request_too_large"] += 1
+            return web.Response(status=413)
+
+    async def handle_basic_commands(self, request: web.Request) -> web.Response:
+        """Handle GetBasicCommands endpoint."""
+        try:
+            _LOGGER.debug(
+                "GetBasicCommands request: scheme=%s, client=%s, host=%s, url=%s, headers=%s",
+                request.scheme, request.remote, request.host, request.url, request.headers
+            )
+
+            # Devices seen before get the full property set right away
+            serial = None
+            post_data = await request.post()
+            if xml_data := post_data.get("xml"):
+                serial = self.protocol.parse_xml(xml_data).get(PROPERTY_SERIAL)
+                request["serial"] = serial
+
+            if serial and serial in self.known_devices:
+                _LOGGER.debug("Fast-tracking known device %s", serial)
+                # Not observed: there is no device state to record the request in
+                response_data = self._full_request(self.known_devices[serial], reprobe=False)
+            else:
+                # Generate response requesting basic device info
+                response_data = self.protocol.create_command_request(BASIC_COMMANDS)
+            response_xml = self.protocol.generate_xml(response_data)
+            if self.mirror:
+                self.mirror.forward(request.path, await request.read(), request.host, None)
+
+            return web.Response(
+                body=response_xml.encode("utf-8"),
+                content_type="text/xml",
+                charset="utf-8",
+            )
+
+        except web.HTTPException:
+            # Raised by aiohttp, e.g. for a body over client_max_size
+            raise
+        except Exception as err:
+            _LOGGER.error("Error handling basic commands: %s", err)
+            return web.Response(
+                body='<?xml version="1.0" encoding="utf-8"?><sc version="1.0"><d></d></sc>'.encode("utf-8"),
+                content_type="text/xml",
+                charset="utf-8",
+            )
+
+    async def handle_all_commands(self, request: web.Request) -> web.Response:
+        """Handle GetAllCommands endpoint."""
+        try:
+            _LOGGER.debug(
+                "GetAllCommands request: scheme=%s, client=%s, host=%s, url=%s, headers=%s",
+                request.scheme, request.remote, request.host, request.url, request.headers
+            )
+
+            # Parse the POST data
+            post_data = await request.post()
+            xml_data = post_data.get("xml", "")
+
+            if not xml_data:
+                self.log_throttle.log(
+                    _LOGGER,
+                    logging.WARNING,
+                    ("no_xml", request.remote),
+                    "Received GetAllCommands without xml parameter from %s",
+                    request.remote,
+                )
+                return web.Response(
+                    body='<?xml version="1.0" encoding="utf-8"?><sc version="1.0"><d></d></sc>'.encode("utf-8"),
+                    content_type="text/xml",
+                    charset="utf-8",
+                )
+
+            # Parse device properties from XML
+            properties = self.protocol.parse_xml(xml_data)
+
+            if not properties:
+                self.log_throttle.log(
+                    _LOGGER,
+                    logging.WARNING,
+                    ("no_properties", request.remote),
+                    "Failed to parse device properties from %s",
+                    request.remote,
+                )
+                return web.Response(
+                    body='<?xml version="1.0" encoding="utf-8"?><sc version="1.0"><d></d></sc>'.encode("utf-8"),
+                    content_type="text/xml",
+                    charset="utf-8",
+                )
+
+            # Get serial number to identify device
+            serial = properties.get(PROPERTY_SERIAL)
+            if not serial:
+                self.log_throttle.log(
+                    _LOGGER,
+                    logging.WARNING,
+                    ("no_serial", request.remote),
+                    "Device %s did not provide serial number",
+                    request.remote,
+                )
+                # Still respond with command request
+                response_data = self.protocol.create_command_request(ALL_COMMANDS)
+                response_xml = self.protocol.generate_xml(response_data)
+                return web.Response(
+                    body=response_xml.encode("utf-8"),
+                    content_type="text/xml",
+                    charset="utf-8",
+                )
+
+            request["serial"] = serial
+            device = self.process_check_in(serial, properties)
+            # A serial that did not fit in the device table gets an empty answer
+            response_data = self._build_response(device) if device is not None else {}
+            if commands := [name for name in response_data if self.protocol.is_setter(name)]:
+                request["commands"] = commands
+            if self.mirror:
+                self.mirror.forward(request.path, await request.read(), request.host, serial)
+
+            # Generate XML response
+            response_xml = self.protocol.generate_xml(response_data)
+
+            return web.Response(
+                body=response_xml.encode("utf-8"),
+                content_type="text/xml",
+                charset="utf-8",
+            )
+
+        except web.HTTPException:
+            # Raised by aiohttp, e.g. for a body over client_max_size
+            raise
+        except Exception as err:
+            _LOGGER.error("Error handling all commands: %s", err, exc_info=True)
+            return web.Response(
+                body='<?xml version="1.0" encoding="utf-8"?><sc version="1.0"><d></d></sc>'.encode("utf-8"),
+                content_type="text/xml",
+                charset="utf-8",
+            )
+
+    def process_check_in(
+        self, serial: str, properties: dict[str, str]
+    ) -> DeviceState | None:
+        """Apply properties reported or polled from a device and advance its identification.
+
+        Returns None if the serial is new and the device table is full of
+        identified devices.
+        """
+        started = time.perf_counter() if self.monitor is not None else 0.0
+        now = asyncio.get_event_loop().time()
+
+        # Get or create device state
+        device = self.devices.get(serial)
+        if device is None:
+            if len(self.devices) >= self.device_capacity and not self._make_room(now):
+                self.rejected_serials += 1
+                self.log_throttle.log(
+                    _LOGGER,
+                    logging.WARNING,
+                    ("table_full",),
+                    "Device table is full (%d devices), ignoring new serial %s",
+                    len(self.devices),
+                    serial,
+                )
+                return None
+            # Announced at INFO once identified; bogus serials never are
+            _LOGGER.debug("New device discovered: %s", serial)
+            device = DeviceState(serial)
+            device.first_seen = now
+            device.journal = self.journal
+            for command, (value, priority) in self._restored_commands.pop(serial, {}).items():
+                device.queue_command(command, value, priority)
+            self.devices[serial] = device
+
+        # Update device properties
+        was_identified = device.is_identified
+        changed = device.update_properties(properties)
+        device.last_seen = now
+
+        # Learn which of the getters requested last time this model answers
+        model_key = self.capabilities.model_key(device.properties)
+        if model_key and device.requested_getters:
+            if self.capabilities.observe(model_key, device.requested_getters, properties):
+                self._notify_state_changed()
+
+        self._advance_identification(device, properties, model_key)
+        if was_identified and changed:
+            self.stream.device_changed(serial, changed)
+            self.snapshot.device_changed(serial)
+
+        # Notify about device update
+        if self.on_device_update:
+            self.on_device_update(serial, properties)
+
+        if self.monitor is not None:
+            # Includes the update callbacks, i.e. coordinator and entity updates
+            self.monitor.observe(PATH_CHECK_IN, time.perf_counter() - started, serial)
+        return device
+
+    def _advance_identification(
+        self, device: DeviceState, properties: dict[str, str], model_key: str | None
+    ) -> None:
+        """Move a device through the identification states.
+
+        A device becomes IDENTIFYING once its identity getters (getFIR, getTYP,
+        getVER) have arrived and IDENTIFIED once it has answered the full
+        property set. Devices known from a previous run with the same model are
+        announced as soon as their identity arrives, seeded with the last known
+        properties until the device reports fresh values.
+        """
+        serial = device.serial_number
+
+        if device.identification_state == IDENT_STATE_NEW and model_key:
+            known = self.known_devices.get(serial)
+            if known and self.capabilities.model_key(known) == model_key:
+                for name, value in known.items():
+                    device.properties.setdefault(name, value)
+                self._mark_identified(device)
+                return
+            device.identification_state = IDENT_STATE_IDENTIFYING
+            _LOGGER.debug("Device %s identifying as %s", serial, model_key)
+
+        if (
+            device.identification_state == IDENT_STATE_IDENTIFYING
+            and len(properties) > len(BASIC_COMMANDS)
+        ):
+            self._mark_identified(device)
+
+    def _mark_identified(self, device: DeviceState) -> None:
+        """Mark a device as identified and announce it."""
+        device.identification_state = IDENT_STATE_IDENTIFIED
+        device.identified_at = device.last_seen
+        _LOGGER.info(
+            "Device %s fully identified after %.1fs",
+            device.serial_number,
+            device.time_to_identify,
+        )
+        self._notify_state_changed()
+        self.stream.device_added(device)
+        self.snapshot.devices_changed(device.serial_number)
+        if self.on_device_discovered:
+            self.on_device_discovered(device.serial_number, device.properties)
+
+    def _full_request(
+        self, properties: dict[str, str], reprobe: bool = True
+    ) -> dict[str, str]:
+        """Build the full getter request for a device with the given properties.
+
+        Pass reprobe=False if the answers will not be observed (see CapabilityMap.prune).
+        """
+        response_data = self.protocol.create_command_request(ALL_COMMANDS)
+        for prop in EXTENDED_PROPERTIES:
+            response_data[prop] = ""
+
+        # Add leakage properties if device supports them
+        if (
+            properties.get(PROPERTY_VALVE_SHUTOFF) is not None
+            or properties.get(PROPERTY_VALVE_STATUS) is not None
+        ):
+            for prop in LEAKAGE_PROPERTIES:
+                response_data[prop] = ""
+
+        # Drop getters this device model is known not to answer
+        if model_key := self.capabilities.model_key(properties):
+            response_data = self.capabilities.prune(model_key, response_data, reprobe)
+        return response_data
+
+    def _build_response(self, device: DeviceState) -> dict[str, str]:
+        """Build the response to a GetAllCommands check-in."""
+        if device.has_priority_commands():
+            # Fast lane: high-priority setters first and only essential getters,
+            # so the device acts without processing a full read request first.
+            # Remaining commands and the full poll follow on the next check-in.
+            response_data = device.get_pending_commands(COMMAND_PRIORITY_HIGH)
+            self.log_throttle.log(
+                _LOGGER,
+                logging.INFO,
+                ("commands", device.serial_number),
+                "Sending priority commands to device %s: %s",
+                device.serial_number,
+                response_data,
+            )
+            getters = self.protocol.create_command_request(FAST_LANE_PROPERTIES)
+            response_data.update(getters)
+            device.requested_getters = list(getters)
+            return response_data
+
+        if device.identification_state == IDENT_STATE_NEW:
+            # Identity not known yet, only request the standard commands
+            response_data = self.protocol.create_command_request(ALL_COMMANDS)
+        else:
+            response_data = self._full_request(device.properties)
+        device.requested_getters = list(response_data)
+
+        # Add any pending commands (setters)
+        pending = device.get_pending_commands()
+        if pending:
+            self.log_throttle.log(
+                _LOGGER,
+                logging.INFO,
+                ("commands", device.serial_number),
+                "Sending %d commands to device %s: %s",
+                len(pending),
+                device.serial_number,
+                pending,
+            )
+            response_data.update(pending)
+
+        return response_data
+
+    async def handle_stream(self, request: web.Request) -> web.StreamResponse:
+        """Stream live device state as Server-Sent Events."""
+        if not self.enable_stream:
+            raise web.HTTPNotFound()
+        return await self.stream.handle(request)
+
+    async def handle_snapshot(self, request: web.Request) -> web.Response:
+        """Return typed values of all or selected devices, cached until they change.
+
+        Query parameters: devices and fields (comma-separated serials and
+        property names) and format (json or msgpack). Supports ETag and
+        If-None-Match.
+        """
+        if not self.enable_snapshot:
+            raise web.HTTPNotFound()
+        query = request.query
+        format_ = query.get("format", FORMAT_JSON)
+        if format_ not in available_formats():
+            raise web.HTTPBadRequest(
+                text=f"format must be one of: {', '.join(available_formats())}"
+            )
+        serials = _split_query(query.get("devices"))
+        fields = _split_query(query.get("fields"))
+
+        etag = self.snapshot.etag(serials, fields, format_)
+        if_none_match = request.headers.get(hdrs.IF_NONE_MATCH, "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match == "*":
+            self.snapshot.not_modified()
+            return web.Response(status=304, headers={hdrs.ETAG: etag})
+
+        etag, body = self.snapshot.encode(serials, fields, format_)
+        return web.Response(
+            body=body,
+            content_type=CONTENT_TYPES[format_],
+            headers={hdrs.ETAG: etag, hdrs.CACHE_CONTROL: "no-cache"},
+        )
+
+    async def handle_status(self, request: web.Request) -> web.Response:
+        """Return a JSON with integration/server status and known devices."""
+        if not self.enable_debug_endpoints:
+            raise web.HTTPNotFound()
+        try:
+            now = asyncio.get_event_loop().time()
+            devices_info: list[dict[str, Any]] = []
+            for serial, dev in self.devices.items():
+                last_seen_ago = None
+                if dev.last_seen:
+                    last_seen_ago = round(max(0.0, now - dev.last_seen), 3)
+                devices_info.append(
+                    {
+                        "serial": serial,
+                        "identified": dev.is_identified,
+                        "identification_state": dev.identification_state,
+                        "time_to_identify_seconds": dev.time_to_identify,
+                        "last_seen_seconds_ago": last_seen_ago,
+                        "properties_count": len(dev.properties),
+                        "pending_commands_count": len(dev.pending_commands),
+                        "command_latencies": dev.command_latencies,
+                    }
+                )
+
+            payload = {
+                "http_port": self.http_port,
+                "https_port": self.https_port if self.use_https else None,
+                "use_https": self.use_https,
+                "devices_count": len(self.devices),
+                "devices": devices_info,
+                "metrics": self.get_metrics(),
+            }
+            return web.json_response(payload)
+        except Exception as err:
+            _LOGGER.error("Error building status: %s", err, exc_info=True)
+            return web.json_response({"error": "internal_error"}, status=500)
+
+    async def handle_profile(self, request: web.Request) -> web.Response:
+        """Profile the server for a while as it keeps serving devices.
+
+        Query parameters: seconds, mode (sample or cprofile), memory=1 to
+        trace allocations, top and format=collapsed for plain collapsed
+        stacks. Needs debug endpoints and the profiling token as bearer
+        token; one profile runs at a time.
+        """
+        if not self.enable_debug_endpoints or not self.profile_token:
+            raise web.HTTPNotFound()
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(token.encode(), self.profile_token.encode()):
+            raise web.HTTPUnauthorized()
+
+        query = request.query
+        mode = query.get("mode", MODE_SAMPLE)
+        try:
+            seconds = float(query.get("seconds", PROFILE_DEFAULT_DURATION))
+            top = int(query.get("top", PROFILE_TOP))
+        except ValueError as err:
+            raise web.HTTPBadRequest(text="seconds and top must be numbers") from err
+        if mode not in (MODE_SAMPLE, MODE_CPROFILE):
+            raise web.HTTPBadRequest(text=f"mode must be {MODE_SAMPLE} or {MODE_CPROFILE}")
+        if not 0 < seconds <= PROFILE_MAX_DURATION or top < 1:
+            raise web.HTTPBadRequest(
+                text=f"seconds must be within 0-{PROFILE_MAX_DURATION} and top positive"
+            )
+        if self._profiling:
+            return web.json_response({"error": "A profile is already running"}, status=409)
+
+        self._profiling = True
+        try:
+            _LOGGER.info("Profiling (%s) for %.0f seconds", mode, seconds)
+            result = await profile(seconds, mode, query.get("memory") == "1", top)
+        finally:
+            self._profiling = False
+        if query.get("format") == "collapsed":
+            return web.Response(text=result.get("collapsed", ""), content_type="text/plain")
+        return web.json_response(result)
+
+    async def handle_echo(self, request: web.Request) -> web.Response:
+        """Echo back request details to help diagnose connectivity."""
+        if not self.enable_debug_endpoints:
+            raise web.HTTPNotFound()
+        try:
+            info: dict[str, Any] = {
+                "method": request.method,
+                "scheme": request.scheme,
+                "host": request.host,
+                "path": request.path,
+                "url": str(request.url),
+                "remote": request.remote,
+                "headers": dict(request.headers),
+                "content_type": request.content_type,
+            }
+
+            # Try to read form fields (non-blocking if none)
+            try:
+                form = await request.post()
+                if form:
+                    # Convert MultiDict to plain dict of strings
+                    info["form"] = {k: str(v) for k, v in form.items()}
+            except Exception:  # best-effort
+                pass
+
+            # Safely read a small portion of raw body for reference
+            try:
+                body = await request.read()
+                # Limit size to avoid huge payloads
+                preview = body[:512]
+                info["body_len"] = len(body)
+                # Show a utf-8 safe preview if possible
+                try:
+                    info["body_preview"] = preview.decode("utf-8", errors="replace")
+                except Exception:
+                    info["body_preview_base64"] = preview.hex()
+            except Exception:  # best-effort
+                pass
+
+            return web.json_response(info)
+        except Exception as err:
+            _LOGGER.error("Error handling echo: %s", err, exc_info=True)
+            return web.json_response({"error": "internal_error"}, status=500)
+
+    def _evict_expired(self, now: float) -> None:
+        """Evict unidentified serials past their TTL and identified devices unseen too long."""
+        for serial, device in list(self.devices.items()):
+            age = now - device.last_seen
+            if not device.is_identified:
+                if age > UNIDENTIFIED_DEVICE_TTL:
+                    self._evict(serial, "unidentified")
+            elif self.device_expiry and age > self.device_expiry:
+                self._evict(serial, "expired")
+
+    def _make_room(self, now: float) -> bool:
+        """Free a slot in the full device table for a new serial.
+
+        Expired entries go first, then the least recently seen unidentified
+        serial. Identified devices are never evicted to make room; returns
+        False if no slot could be freed.
+        """
+        self._evict_expired(now)
+        if len(self.devices) < self.device_capacity:
+            return True
+        candidates = [
+            device for device in self.devices.values() if not device.is_identified
+        ]
+        if not candidates:
+            return False
+        oldest = min(candidates, key=lambda device: device.last_seen)
+        self._evict(oldest.serial_number, "capacity")
+        return True
+
+    def _evict(self, serial: str, reason: str) -> None:
+        """Drop a device from the table, remembering it if it was identified.
+
+        An evicted device that checks in again is fast-tracked from the
+        persisted known devices and gets its pending commands, which stay
+        in the journal; those of unidentified serials are dropped.
+        """
+        device = self.devices.pop(serial)
+        self.evictions[reason] += 1
+        if not device.is_identified:
+            if self.journal and device.pending_commands:
+                self.journal.forget(serial)
+            _LOGGER.debug("Unidentified serial %s evicted (%s)", serial, reason)
+            return
+        _LOGGER.info("Device %s evicted (%s)", serial, reason)
+        if device.pending_commands:
+            self._restored_commands[serial] = {
+                command: (value, device.command_priorities[command])
+                for command, value in device.pending_commands.items()
+            }
+        self.stream.device_removed(serial)
+        self.snapshot.devices_changed()
+        self._remember(serial, device.properties)
+        self._notify_state_changed()
+        if self.on_device_removed:
+            self.on_device_removed(serial)
+
+    def _remember(self, serial: str, properties: dict[str, str]) -> None:
+        """Record the last known properties of an identified device."""
+        self.known_devices.pop(serial, None)
+        self.known_devices[serial] = dict(properties)
+        # Oldest entries go first, with their kept commands; the same bound as the device table
+        while len(self.known_devices) > self.device_capacity:
+            forgotten = next(iter(self.known_devices))
+            del self.known_devices[forgotten]
+            if forgotten not in self.devices and self._restored_commands.pop(forgotten, None):
+                if self.journal:
+                    self.journal.forget(forgotten)
+
+    async def _sweep_devices(self) -> None:
+        """Periodically evict expired devices."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(DEVICE_SWEEP_INTERVAL)
+            self._evict_expired(loop.time())
+
+    def export_state(self) -> dict[str, Any]:
+        """Return server state worth persisting across restarts."""
+        for serial, device in self.devices.items():
+            if device.is_identified:
+                self._remember(serial, device.properties)
+        return {
+            "capabilities": self.capabilities.as_dict(),
+            "known_devices": self.known_devices,
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore server state previously returned by export_state."""
+        self.capabilities.load(data.get("capabilities", {}))
+        for serial, properties in data.get("known_devices", {}).items():
+            self._remember(serial, properties)
+
+    def _notify_state_changed(self) -> None:
+        """Notify the owner that persistent state has changed."""
+        if self.on_state_changed:
+            self.on_state_changed()
+
+    def get_device(self, serial: str) -> DeviceState | None:
+        """Get device state by serial number."""
+        return self.devices.get(serial)
+
+    def get_all_devices(self) -> dict[str, DeviceState]:
+        """Get all device states."""
+        return self.devices
+
+    def remove_device(self, serial: str) -> bool:
+        """Forget a device, including its cached identity."""
+        device = self.devices.pop(serial, None)
+        known = self.known_devices.pop(serial, None)
+        self._restored_commands.pop(serial, None)
+        if self.journal:
+            self.journal.forget(serial)
+        if device is None and known is None:
+            return False
+        _LOGGER.info("Device %s removed", serial)
+        if device is not None and device.is_identified:
+            self.stream.device_removed(serial)
+            self.snapshot.devices_changed()
+        self._notify_state_changed()
+        return True
+
+    def queue_command(self, serial: str, command: str, value: str) -> bool:
+        """Queue a command for a device."""
+        device = self.get_device(serial)
+        if device:
+            device.queue_command(command, value)
+            if self.poller:
+                self.poller.wake(serial)
+            return True
+        _LOGGER.warning("Cannot queue command for unknown device: %s", serial)
+        return False
+
+    def queue_upstream_commands(self, serial: str, commands: dict[str, str]) -> None:
+        """Queue setters requested by the SYR cloud.
+
+        Local commands take precedence: upstream setters are queued at low
+        priority, only if the same setter is neither pending nor delivered
+        and awaiting confirmation, and are replaced by any local command for
+        the same setter. The upstream answers check-ins late, so it has
+        usually not seen the latest local change yet.
+        """
+        device = self.get_device(serial)
+        if device is None or not device.is_identified:
+            return
+        for command, value in commands.items():
+            if (
+                command in device.pending_commands
+                or "get" + command[3:] in device.awaiting_confirmation
+            ):
+                _LOGGER.debug("Ignoring upstream %s=%s for device %s", command, value, serial)
+                continue
+            device.queue_command(command, value, COMMAND_PRIORITY_LOW)
+
+    def queue_commands(self, serial: str, commands: dict[str, str]) -> bool:
+        """Queue several commands for a device at once."""
+        device = self.get_device(serial)
+        if device is None:
+            _LOGGER.warning("Cannot queue commands for unknown device: %s", serial)
+            return False
+        for command, value in commands.items():
+            device.queue_command(command, value)
+        if self.poller:
+            self.poller.wake(serial)
+        return True
+
+    async def async_queue_commands(self, serial: str, commands: dict[str, str]) -> bool:
+        """Queue several commands for a device at once.
+
+        Same as queue_commands; callers that may talk to a standalone server
+        use this, where queueing takes a request.
+        """
+        return self.queue_commands(serial, commands)
+
+    async def start(self) -> None:
+        """Start the server."""
+        if self.journal:
+            self._restored_commands = await self.journal.start()
+        try:
+            # Requests are recorded in self.access_log, not logged one by one
+            self.runner = web.AppRunner(
+                self.app, keepalive_timeout=ADMISSION_KEEPALIVE_TIMEOUT, access_log=None
+            )
+            await self.runner.setup()
+            self._http_site = await self._start_http_site(self.http_port)
+            self._https_site = await self._start_https_site(
+                self.use_https, self.https_port, self.cert_file, self.key_file, self.tls_offload
+            )
+            self._unix_site = await self._start_unix_site()
+        except Exception as err:
+            _LOGGER.error("Failed to start server: %s", err)
+            if self.journal:
+                await self.journal.stop()
+            raise
+        self._sweep_task = asyncio.get_running_loop().create_task(self._sweep_devices())
+        await self._update_poller()
+        await self._update_mirror()
+        self._update_monitor()
+        await self._update_dns()
+
+    async def _update_dns(self) -> None:
+        """Start, restart or stop the DNS responder for the current settings."""
+        if self.dns is not None:
+            self.dns.stop()
+            self.dns = None
+        enabled, address, upstream, clients, port = self.dns_settings
+        if not enabled:
+            return
+        addresses = [item.strip() for item in (address or "").split(",") if item.strip()]
+        if not addresses:
+            loop = asyncio.get_running_loop()
+            if detected := await loop.run_in_executor(None, detect_local_address):
+                addresses = [detected]
+            else:
+                _LOGGER.error("DNS responder not started: could not determine this host's address")
+                return
+        try:
+            dns = DnsResponder(
+                port,
+                addresses,
+                parse_upstream(upstream) if upstream else None,
+                parse_trusted_proxies(clients),
+            )
+            await dns.start()
+        except (OSError, ValueError) as err:
+            _LOGGER.error("Failed to start DNS responder on port %d: %s", port, err)
+            return
+        self.dns = dns
+
+    async def _update_mirror(self) -> None:
+        """Start, restart or stop the cloud mirror."""
+        if self.mirror is not None and self.mirror.url != (self.cloud_mirror_url or "").rstrip("/"):
+            await self.mirror.stop()
+            self.mirror = None
+        if self.cloud_mirror_url and self.mirror is None:
+            self.mirror = CloudMirror(self.cloud_mirror_url)
+            self.mirror.on_upstream_commands = self.queue_upstream_commands
+            await self.mirror.start()
+
+    def _update_monitor(self) -> None:
+        """Start or stop the event loop monitor."""
+        if self.loop_monitor and self.monitor is None:
+            self.monitor = LoopMonitor()
+            self.monitor.start()
+        elif not self.loop_monitor and self.monitor is not None:
+            self.monitor.stop()
+            self.monitor = None
+
+    async def _update_poller(self) -> None:
+        """Start, update or stop polling of JSON API devices."""
+        if self.poll_hosts:
+            if self.poller is None:
+                self.poller = DevicePoller(self)
+            await self.poller.start(self.poll_hosts)
+        elif self.poller is not None:
+            await self.poller.stop()
+            self.poller = None
+
+    async def _start_site(
+        self, port: int, ssl_context: ssl.SSLContext | None = None
+    ) -> web.BaseSite:
+        """Start listening on a port."""
+        assert self.runner is not None
+        site = GatedSite(
+            self.runner,
+            self.admission,
+            port=port,
+            ssl_context=ssl_context,
+            reuse_port=_REUSE_PORT,
+            # Proxies terminate TLS, so only plain HTTP carries PROXY headers
+            proxy_protocol=self.proxy_protocol and ssl_context is None,
+        )
+        await site.start()
+        self.sites.append(site)
+        return site
+
+    async def _stop_site(self, site: web.BaseSite) -> None:
+        """Stop listening on a site; open connections are served to the end."""
+        if offloader := self._tls_offloaders.pop(site, None):
+            await offloader.stop()
+        await site.stop()
+        self.sites.remove(site)
+
+    async def _start_offloaded_site(
+        self, port: int, ssl_context: ssl.SSLContext
+    ) -> web.BaseSite:
+        """Terminate TLS in a worker thread that forwards to a loopback site."""
+        assert self.runner is not None
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        site = web.SockSite(self.runner, sock)
+        await site.start()
+        self.sites.append(site)
+
+        offloader = TlsOffloader(port, ssl_context, sock.getsockname()[1], self.admission)
+        try:
+            await offloader.start()
+        except Exception:
+            await self._stop_site(site)
+            raise
+        self._tls_offloaders[site] = offloader
+        return site
+
+    async def _start_http_site(self, port: int) -> web.BaseSite | None:
+        """Start the HTTP site (gracefully handle port already in use)."""
+        try:
+            site = await self._start_site(port)
+        except OSError as err:
+            # If port is in use, continue with HTTPS only
+            _LOGGER.warning(
+                "HTTP port %d unavailable (%s); continuing without HTTP server",
+                port,
+                err,
+            )
+            return None
+        _LOGGER.info("SYR Connect Local HTTP server started on port %d", port)
+        return site
+
+    async def _start_unix_site(self) -> web.BaseSite | None:
+        """Start the unix socket site for a local reverse proxy, if configured."""
+        if not self.unix_socket:
+            return None
+        assert self.runner is not None
+        site = GatedSite(
+            self.runner,
+            self.admission,
+            path=self.unix_socket,
+            proxy_protocol=self.proxy_protocol,
+        )
+        try:
+            await site.start()
+        except OSError as err:
+            _LOGGER.error("Failed to listen on unix socket %s: %s", self.unix_socket, err)
+            return None
+        self.sites.append(site)
+        _LOGGER.info("SYR Connect Local server listening on unix socket %s", self.unix_socket)
+        return site
+
+    async def _start_https_site(
+        self,
+        use_https: bool,
+        port: int,
+        cert_file: str | None,
+        key_file: str | None,
+        tls_offload: bool,
+    ) -> web.BaseSite | None:
+        """Start the HTTPS site if configured."""
+        if not (use_https and cert_file and key_file):
+            _LOGGER.debug(
+                "HTTPS not started: use_https=%s, cert_file=%s, key_file=%s",
+                use_https, cert_file, key_file
+            )
+            return None
+
+        _LOGGER.info(
+            "Starting HTTPS server on port %d with cert=%s, key=%s",
+            port, cert_file, key_file
+        )
+        try:
+            loop = asyncio.get_event_loop()
+            # The context is shared across restarts so TLS sessions can be resumed
+            ssl_context = await loop.run_in_executor(None, get_ssl_context, cert_file, key_file)
+            if tls_offload:
+                site = await self._start_offloaded_site(port, ssl_context)
+            else:
+                site = await self._start_site(port, ssl_context)
+        except Exception as err:
+            _LOGGER.error("Failed to start HTTPS server: %s", err)
+            return None
+
+        self.ssl_context = self._active_ssl_context = ssl_context
+        ssl_context.sni_callback = self._select_ssl_context
+        _LOGGER.info(
+            "SYR Connect Local HTTPS server started on port %d%s",
+            port,
+            " (TLS offloaded to a worker thread)" if tls_offload else "",
+        )
+        if self._cert_watch_task is None:
+            self._cert_watch_task = loop.create_task(self._watch_certificates())
+        return site
+
+    async def reconfigure(
+        self,
+        http_port: int,
+        https_port: int,
+        use_https: bool,
+        cert_file: str | None,
+        key_file: str | None,
+        enable_debug_endpoints: bool,
+        tls_offload: bool,
+        unix_socket: str | None = None,
+        trusted_proxies: list[str] | str | None = None,
+        proxy_protocol: bool = False,
+        device_expiry: float = 0,
+        device_capacity: int = DEFAULT_DEVICE_CAPACITY,
+        enable_stream: bool = False,
+        enable_snapshot: bool = False,
+        poll_hosts: list[str] | str | None = None,
+        cloud_mirror_url: str | None = None,
+        dns_responder: bool = False,
+        dns_address: str | None = None,
+        dns_upstream: str | None = None,
+        dns_clients: list[str] | str | None = None,
+        dns_port: int = DEFAULT_DNS_PORT,
+        loop_monitor: bool = False,
+        profile_token: str | None = None,
+    ) -> None:
+        """Apply new settings without dropping devices or check-ins.
+
+        Listeners whose settings changed are replaced by opening the new one
+        before closing the old one, so there is always a socket accepting
+        check-ins. Device state and pending commands are kept.
+        """
+        self.enable_debug_endpoints = enable_debug_endpoints
+        self.profile_token = profile_token
+        self.device_expiry = device_expiry
+        self.device_capacity = device_capacity
+        if self.enable_stream and not enable_stream:
+            self.stream.close()
+        self.enable_stream = enable_stream
+        self.enable_snapshot = enable_snapshot
+        self.poll_hosts = parse_poll_hosts(poll_hosts)
+        await self._update_poller()
+        self.cloud_mirror_url = cloud_mirror_url
+        await self._update_mirror()
+        dns_settings = (dns_responder, dns_address, dns_upstream, dns_clients, dns_port)
+        if dns_settings != self.dns_settings:
+            self.dns_settings = dns_settings
+            await self._update_dns()
+        self.loop_monitor = loop_monitor
+        self._update_monitor()
+        # Updated in place; the PROXY protocol sites share this list
+        self.trusted_proxies[:] = parse_trusted_proxies(trusted_proxies)
+        proxy_protocol_changed = proxy_protocol != self.proxy_protocol
+        self.proxy_protocol = proxy_protocol
+
+        # Settings are only taken over once their listener is up; otherwise the
+        # old listener keeps serving and the settings describe it
+        if http_port != self.http_port or self._http_site is None or proxy_protocol_changed:
+            old_site = self._http_site
+            if new_site := await self._start_http_site(http_port):
+                self.http_port = http_port
+                self._http_site = new_site
+                if old_site:
+                    await self._stop_site(old_site)
+
+        https_settings = (use_https, https_port, cert_file, key_file, tls_offload)
+        current = (self.use_https, self.https_port, self.cert_file, self.key_file, self.tls_offload)
+        if https_settings != current:
+            old_site = self._https_site
+            new_site = await self._start_https_site(*https_settings)
+            if new_site or not use_https:
+                (
+                    self.use_https,
+                    self.https_port,
+                    self.cert_file,
+                    self.key_file,
+                    self.tls_offload,
+                ) = https_settings
+                self._https_site = new_site
+                if old_site:
+                    await self._stop_site(old_site)
+            if self._https_site is None:
+                self.ssl_context = self._active_ssl_context = None
+                if self._cert_watch_task:
+                    self._cert_watch_task.cancel()
+                    self._cert_watch_task = None
+
+        if unix_socket != self.unix_socket or proxy_protocol_changed:
+            # A unix socket path cannot be bound twice, so close the old one first
+            if self._unix_site:
+                await self._stop_site(self._unix_site)
+            self.unix_socket = unix_socket
+            self._unix_site = await self._start_unix_site()
+
+        _LOGGER.info("SYR Connect Local server reconfigured")
+
+    def _select_ssl_context(
+        self, ssl_object: ssl.SSLObject, server_name: str | None, ssl_context: ssl.SSLContext
+    ) -> None:
+        """Switch a new connection to the current certificate.
+
+        Called during every handshake, with or without SNI. Connections that
+        are already established keep the context they were opened with.
+        """
+        if self._active_ssl_context is not None and self._active_ssl_context is not ssl_context:
+            ssl_object.context = self._active_ssl_context
+
+    async def _watch_certificates(self) -> None:
+        """Pick up renewed certificate and key files without restarting."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(CERT_WATCH_INTERVAL)
+            try:
+                ssl_context = await loop.run_in_executor(
+                    None, get_ssl_context, self.cert_file, self.key_file
+                )
+            except (OSError, ssl.SSLError) as err:
+                # Files may be missing or half-written during a renewal; retry later
+                _LOGGER.warning("Could not reload certificate, keeping the current one: %s", err)
+                continue
+            if ssl_context is not self._active_ssl_context:
+                self._active_ssl_context = ssl_context
+                _LOGGER.info("Certificate %s reloaded", self.cert_file)
+
+    def get_access_log(self, serial: str | None = None) -> list[dict[str, Any]]:
+        """Return the most recent requests, optionally for one device."""
+        return self.access_log.records(serial)
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Return server metrics."""
+        metrics: dict[str, Any] = {
+            "admission": self.admission.metrics(),
+            "requests": self.access_log.total,
+            "devices": {
+                "count": len(self.devices),
+                "capacity": self.device_capacity,
+                "known": len(self.known_devices),
+                "evicted": dict(self.evictions),
+                "rejected": self.rejected_serials,
+            },
+            "stream": self.stream.metrics(),
+        }
+        if self.enable_snapshot:
+            metrics["snapshot"] = self.snapshot.metrics()
+        if self.poller is not None:
+            metrics["polling"] = self.poller.metrics()
+        if self.mirror is not None:
+            metrics["cloud_mirror"] = self.mirror.metrics()
+        if self.dns is not None:
+            metrics["dns"] = self.dns.metrics()
+        if self.journal is not None:
+            metrics["journal"] = self.journal.metrics()
+        if self.monitor is not None:
+            metrics["loop"] = self.monitor.metrics()
+        if self.ssl_context is not None:
+            metrics["tls"] = session_metrics(self.ssl_context)
+            if self._active_ssl_context not in (None, self.ssl_context):
+                # Handshakes after a certificate reload are counted on the new context
+                for name, value in session_metrics(self._active_ssl_context).items():
+                    if name != "num_tickets":
+                        metrics["tls"][name] += value
+        return metrics
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._sweep_task:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+        self.stream.close()
+        if self.poller is not None:
+            await self.poller.stop()
+            self.poller = None
+        if self.mirror is not None:
+            await self.mirror.stop()
+            self.mirror = None
+        if self.dns is not None:
+            self.dns.stop()
+            self.dns = None
+        if self.monitor is not None:
+            self.monitor.stop()
+            self.monitor = None
+        if self.journal is not None:
+            await self.journal.stop()
+        if self._cert_watch_task:
+            self._cert_watch_task.cancel()
+            self._cert_watch_task = None
+        for offloader in self._tls_offloaders.values():
+            await offloader.stop()
+        self._tls_offloaders.clear()
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+            self.sites.clear()
+            self._http_site = self._https_site = self._unix_site = None
+            _LOGGER.info("SYR Connect Local server stopped")
+
+
+def _split_query(value: str | None) -> tuple[str, ...] | None:
+    """Return the items of a comma-separated query parameter, or None if not given."""
+    if value is None:
+        return None
+    return tuple(dict.fromkeys(item.strip() for item in value.split(",") if item.strip()))
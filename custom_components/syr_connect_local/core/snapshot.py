@@ -0,0 +1,171 @@
+"""Cached snapshots of the typed state of identified devices.
+
+Every change to an identified device bumps a generation counter. The ETag
+of a snapshot is derived from the newest generation among the devices it
+covers, so If-None-Match is answered without building a body, and encoded
+bodies are reused until one of their devices changes. Typed values are
+cached per device, so a change only converts the device that changed.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+import hashlib
+import json
+import secrets
+from typing import TYPE_CHECKING, Any
+
+from ..const import SNAPSHOT_CACHE_SIZE
+from .converters import convert_properties
+
+try:
+    import msgpack
+except ImportError:  # Optional, for the compact binary encoding
+    msgpack = None
+
+if TYPE_CHECKING:
+    from .device import DeviceState
+
+FORMAT_JSON = "json"
+FORMAT_MSGPACK = "msgpack"
+CONTENT_TYPES = {FORMAT_JSON: "application/json", FORMAT_MSGPACK: "application/msgpack"}
+
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def available_formats() -> list[str]:
+    """Return the encodings that can be produced."""
+    return [FORMAT_JSON, FORMAT_MSGPACK] if msgpack is not None else [FORMAT_JSON]
+
+
+def select_fields(values: dict[str, Any], fields: Iterable[str] | None) -> dict[str, Any]:
+    """Return the requested fields of a device's values; all of them without a selection."""
+    if fields is None:
+        return values
+    return {name: values[name] for name in fields if name in values}
+
+
+def build_snapshot(
+    devices: dict[str, DeviceState],
+    serials: Iterable[str] | None = None,
+    fields: Iterable[str] | None = None,
+) -> dict[str, Any]:
+    """Return typed values of the selected identified devices, without caching."""
+    selected = devices if serials is None else {s: devices[s] for s in serials if s in devices}
+    return {
+        "devices": {
+            serial: select_fields(convert_properties(device.properties), fields)
+            for serial, device in selected.items()
+            if device.is_identified
+        }
+    }
+
+
+class SnapshotCache:
+    """Encode device snapshots once per change."""
+
+    def __init__(self, get_devices: Callable[[], dict[str, DeviceState]]) -> None:
+        """Initialize the cache."""
+        self._get_devices = get_devices
+        # ETags from an earlier run must not match
+        self._instance = secrets.token_hex(4)
+        self._generation = 0
+        # Generation of the last device added or removed
+        self._membership = 0
+        self._device_generations: dict[str, int] = {}
+        self._typed: dict[str, tuple[int, dict[str, Any]]] = {}
+        # (serials, fields, format) -> (ETag, body), least recently used first
+        self._bodies: dict[tuple[Any, ...], tuple[str, bytes]] = {}
+        self.counters: dict[str, int] = {"hits": 0, "misses": 0, "not_modified": 0}
+
+    def device_changed(self, serial: str) -> None:
+        """Invalidate snapshots that include a device whose values changed."""
+        self._generation += 1
+        self._device_generations[serial] = self._generation
+
+    def devices_changed(self, added: str | None = None) -> None:
+        """Invalidate all snapshots after a device was added or removed."""
+        self._generation += 1
+        self._membership = self._generation
+        if added is not None:
+            self._device_generations[added] = self._generation
+        devices = self._get_devices()
+        for serial in [serial for serial in self._device_generations if serial not in devices]:
+            del self._device_generations[serial]
+            self._typed.pop(serial, None)
+
+    def etag(
+        self,
+        serials: tuple[str, ...] | None = None,
+        fields: tuple[str, ...] | None = None,
+        format_: str = FORMAT_JSON,
+    ) -> str:
+        """Return the ETag of a snapshot of the given devices (all without a selection).
+
+        The tag covers the device and field selection and the format, so a
+        tag of one representation never matches another.
+        """
+        selection = "|".join(
+            (
+                format_,
+                "*" if serials is None else ",".join(sorted(serials)),
+                "*" if fields is None else ",".join(sorted(fields)),
+            )
+        )
+        variant = hashlib.blake2s(selection.encode(), digest_size=4).hexdigest()
+        if serials is None:
+            generation = self._generation
+        else:
+            generation = max(
+                (self._device_generations.get(serial, 0) for serial in serials),
+                default=0,
+            )
+            generation = max(generation, self._membership)
+        return f'"{self._instance}-{generation}-{variant}"'
+
+    def encode(
+        self,
+        serials: tuple[str, ...] | None = None,
+        fields: tuple[str, ...] | None = None,
+        format_: str = FORMAT_JSON,
+    ) -> tuple[str, bytes]:
+        """Return the ETag and encoded body of a snapshot."""
+        key = (serials, fields, format_)
+        etag = self.etag(serials, fields, format_)
+        cached = self._bodies.pop(key, None)
+        if cached is not None and cached[0] == etag:
+            self.counters["hits"] += 1
+            self._bodies[key] = cached
+            return cached
+
+        self.counters["misses"] += 1
+        devices = self._get_devices()
+        selected = devices if serials is None else {s: devices[s] for s in serials if s in devices}
+        data = {
+            "devices": {
+                serial: select_fields(self._typed_values(device), fields)
+                for serial, device in selected.items()
+                if device.is_identified
+            }
+        }
+        body = msgpack.packb(data) if format_ == FORMAT_MSGPACK else _dumps(data).encode()
+        self._bodies[key] = (etag, body)
+        if len(self._bodies) > SNAPSHOT_CACHE_SIZE:
+            del self._bodies[next(iter(self._bodies))]
+        return etag, body
+
+    def _typed_values(self, device: DeviceState) -> dict[str, Any]:
+        """Return the typed values of a device, converting only after a change."""
+        serial = device.serial_number
+        generation = self._device_generations.get(serial, 0)
+        cached = self._typed.get(serial)
+        if cached is None or cached[0] != generation:
+            cached = self._typed[serial] = (generation, convert_properties(device.properties))
+        return cached[1]
+
+    def not_modified(self) -> None:
+        """Count a request answered with 304 Not Modified."""
+        self.counters["not_modified"] += 1
+
+    def metrics(self) -> dict[str, Any]:
+        """Return cache counters."""
+        return {**self.counters, "generation": self._generation, "cached": len(self._bodies)}
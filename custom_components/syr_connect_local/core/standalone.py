@@ -0,0 +1,380 @@
+"""Standalone SYR Connect device server running outside Home Assistant.
+
+Runs SyrConnectServer in its own process (on uvloop if installed) and
+publishes device state on a local HTTP API that the integration, or any
+other consumer, connects to:
+
+    python -m custom_components.syr_connect_local.core.standalone --api-port 8124
+
+API:
+    GET  /api/state?since=<version>&instance=<id>&timeout=<seconds>
+         Devices changed since a version; waits up to timeout for a change.
+         Versions count from 0 in every process, so all devices are returned
+         if the instance ID differs from this process's
+    POST /api/devices/{serial}/commands   {"commands": {"setAB": "2"}}
+    DELETE /api/devices/{serial}
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hmac
+import ipaddress
+import json
+import logging
+import os
+from pathlib import Path
+import secrets
+import signal
+import sys
+from typing import Any
+
+from aiohttp import web
+
+from ..const import (
+    DEFAULT_API_PORT,
+    DEFAULT_DEVICE_CAPACITY,
+    DEFAULT_DEVICE_EXPIRY,
+    DEFAULT_DNS_PORT,
+    DEFAULT_HTTPS_PORT,
+    DEFAULT_HTTP_PORT,
+    STORAGE_SAVE_DELAY,
+)
+from .server import SyrConnectServer
+
+_LOGGER = logging.getLogger(__name__)
+
+# Upper bound for a single long-poll request
+MAX_POLL_TIMEOUT = 60.0
+
+# File names of the state file and the command journal in the data directory
+STATE_FILE = "syr_connect_local_state.json"
+JOURNAL_FILE = "syr_connect_local_commands.jsonl"
+
+
+class LocalApi:
+    """Publish device state and accept commands over local HTTP."""
+
+    def __init__(self, server: SyrConnectServer, token: str | None = None) -> None:
+        """Initialize the API."""
+        self.server = server
+        self.token = token
+        # Versions are only meaningful together with the process that issued them
+        self.instance = secrets.token_hex(4)
+        self.version = 0
+        self._device_versions: dict[str, int] = {}
+        self._changed = asyncio.Event()
+        self.app = web.Application(middlewares=[self._auth_middleware])
+        self.app.router.add_get("/api/state", self.handle_state)
+        self.app.router.add_post("/api/devices/{serial}/commands", self.handle_commands)
+        self.app.router.add_delete("/api/devices/{serial}", self.handle_remove)
+
+    def device_changed(self, serial: str) -> None:
+        """Record a device change and wake up waiting consumers."""
+        self.version += 1
+        self._device_versions[serial] = self.version
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    @web.middleware
+    async def _auth_middleware(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        """Require the bearer token if one is configured."""
+        if self.token and not hmac.compare_digest(
+            request.headers.get("Authorization", "").encode(),
+            f"Bearer {self.token}".encode(),
+        ):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        return await handler(request)
+
+    async def handle_state(self, request: web.Request) -> web.Response:
+        """Return devices changed since the given version (long-poll)."""
+        try:
+            since = int(request.query.get("since", 0))
+            timeout = min(float(request.query.get("timeout", 0)), MAX_POLL_TIMEOUT)
+        except ValueError:
+            return web.json_response({"error": "invalid_query"}, status=400)
+
+        # A consumer that has seen a previous process resyncs fully
+        instance = request.query.get("instance")
+        if since > self.version or (instance is not None and instance != self.instance):
+            since = 0
+
+        if since == self.version and timeout > 0:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        now = asyncio.get_running_loop().time()
+        devices = {
+            serial: device.as_dict(now)
+            for serial, device in self.server.get_all_devices().items()
+            if self._device_versions.get(serial, 0) > since or since == 0
+        }
+        return web.json_response(
+            {
+                "instance": self.instance,
+                "version": self.version,
+                "full": since == 0,
+                "serials": list(self.server.get_all_devices()),
+                "devices": devices,
+            }
+        )
+
+    async def handle_commands(self, request: web.Request) -> web.Response:
+        """Queue commands for a device."""
+        serial = request.match_info["serial"]
+        try:
+            payload = await request.json()
+            commands = {str(name): str(value) for name, value in payload["commands"].items()}
+        except (ValueError, KeyError, AttributeError):
+            return web.json_response({"error": "invalid_body"}, status=400)
+
+        if not all(self.server.protocol.is_setter(name) for name in commands):
+            return web.json_response({"error": "not_a_setter"}, status=400)
+        if not self.server.queue_commands(serial, commands):
+            return web.json_response({"error": "unknown_device"}, status=404)
+        self.device_changed(serial)
+        return web.json_response({"queued": list(commands)})
+
+    async def handle_remove(self, request: web.Request) -> web.Response:
+        """Forget a device."""
+        serial = request.match_info["serial"]
+        if not self.server.remove_device(serial):
+            return web.json_response({"error": "unknown_device"}, status=404)
+        self.device_changed(serial)
+        return web.json_response({"removed": serial})
+
+
+class _StateFile:
+    """Persist server state to a JSON file, debounced."""
+
+    def __init__(self, server: SyrConnectServer, path: Path) -> None:
+        """Initialize the state file."""
+        self.server = server
+        self.path = path
+        self._save_handle: asyncio.TimerHandle | None = None
+
+    def load(self) -> None:
+        """Restore server state from the file, if present."""
+        try:
+            self.server.restore_state(json.loads(self.path.read_text()))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Could not read state file %s: %s", self.path, err)
+
+    def schedule_save(self) -> None:
+        """Save the state after a delay, coalescing repeated changes."""
+        if self._save_handle is None:
+            self._save_handle = asyncio.get_running_loop().call_later(
+                STORAGE_SAVE_DELAY, lambda: asyncio.ensure_future(self.save())
+            )
+
+    async def save(self) -> None:
+        """Write the state file atomically in the executor."""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        data = json.dumps(self.server.export_state())
+        await asyncio.get_running_loop().run_in_executor(None, self._write, data)
+
+    def _write(self, data: str) -> None:
+        """Write data to a temporary file and move it into place."""
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(data)
+        os.replace(tmp_path, self.path)
+
+
+async def async_run(args: argparse.Namespace) -> None:
+    """Run the device server and the local API until stopped."""
+    server = SyrConnectServer(
+        http_port=args.http_port,
+        https_port=args.https_port,
+        use_https=bool(args.cert and args.key),
+        cert_file=args.cert,
+        key_file=args.key,
+        enable_debug_endpoints=args.debug_endpoints,
+        device_expiry=args.device_expiry * 86400,
+        device_capacity=args.device_capacity,
+        enable_stream=args.stream,
+        enable_snapshot=args.snapshot,
+        poll_hosts=args.poll_host,
+        cloud_mirror_url=args.cloud_mirror,
+        dns_responder=args.dns,
+        dns_address=args.dns_address,
+        dns_upstream=args.dns_upstream,
+        dns_clients=args.dns_clients,
+        dns_port=args.dns_port,
+        journal_path=str(args.journal),
+        loop_monitor=args.loop_monitor,
+        profile_token=args.profile_token or os.environ.get("SYR_PROFILE_TOKEN"),
+    )
+    api = LocalApi(server, token=args.api_token)
+    state_file = _StateFile(server, args.state_file)
+    state_file.load()
+
+    server.on_device_discovered = lambda serial, _properties: api.device_changed(serial)
+    server.on_device_update = lambda serial, _properties: api.device_changed(serial)
+    server.on_device_removed = api.device_changed
+    server.on_state_changed = state_file.schedule_save
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await server.start()
+    runner = web.AppRunner(api.app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, args.api_host, args.api_port).start()
+    _LOGGER.info("SYR Connect Local API listening on %s:%d", args.api_host, args.api_port)
+
+    try:
+        await stop_event.wait()
+    finally:
+        await runner.cleanup()
+        await server.stop()
+        await state_file.save()
+
+
+def default_data_dir() -> Path:
+    """Return where the state file and journal go unless given explicitly.
+
+    $SYR_DATA_DIR, otherwise syr_connect_local in the XDG state directory;
+    never the working directory, which depends on how the server is started.
+    """
+    if data_dir := os.environ.get("SYR_DATA_DIR"):
+        return Path(data_dir)
+    state_home = os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+    return Path(state_home) / "syr_connect_local"
+
+
+def is_loopback(host: str) -> bool:
+    """Return True if a listener on host is only reachable from this machine."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        # Host names and the empty "all interfaces" address
+        return False
+
+
+def main() -> None:
+    """Parse arguments and run the standalone server."""
+    parser = argparse.ArgumentParser(description="SYR Connect Local device server")
+    parser.add_argument("--http-port", type=int, default=DEFAULT_HTTP_PORT)
+    parser.add_argument("--https-port", type=int, default=DEFAULT_HTTPS_PORT)
+    parser.add_argument("--cert", help="Certificate file; enables HTTPS with --key")
+    parser.add_argument("--key", help="Private key file; enables HTTPS with --cert")
+    parser.add_argument("--api-host", default="127.0.0.1")
+    parser.add_argument("--api-port", type=int, default=DEFAULT_API_PORT)
+    parser.add_argument(
+        "--api-token",
+        help="Bearer token required by the API (or SYR_API_TOKEN); "
+        "required unless --api-host is a loopback address",
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        help="Directory for the default state file and journal "
+        "(default: $SYR_DATA_DIR or ~/.local/state/syr_connect_local)",
+    )
+    parser.add_argument(
+        "--state-file", type=Path, help=f"Learned state (default: {STATE_FILE} in --data-dir)"
+    )
+    parser.add_argument(
+        "--journal",
+        type=Path,
+        help="Journal of pending commands, replayed on startup "
+        f"(default: {JOURNAL_FILE} in --data-dir)",
+    )
+    parser.add_argument(
+        "--device-expiry",
+        type=float,
+        default=DEFAULT_DEVICE_EXPIRY,
+        help="Days without a check-in after which a device is forgotten (0: never)",
+    )
+    parser.add_argument(
+        "--device-capacity",
+        type=int,
+        default=DEFAULT_DEVICE_CAPACITY,
+        help="Most device serials tracked at once",
+    )
+    parser.add_argument(
+        "--poll-host",
+        action="append",
+        help="Poll a device with a local JSON API (host, host:port or URL); repeatable",
+    )
+    parser.add_argument(
+        "--cloud-mirror", help="Forward device check-ins to this SYR Connect server URL"
+    )
+    parser.add_argument(
+        "--dns", action="store_true", help="Answer DNS for the SYR cloud domains"
+    )
+    parser.add_argument("--dns-port", type=int, default=DEFAULT_DNS_PORT)
+    parser.add_argument(
+        "--dns-address", help="Addresses to answer with (default: this host's address)"
+    )
+    parser.add_argument("--dns-upstream", help="Resolver for all other names")
+    parser.add_argument(
+        "--dns-clients",
+        help="Clients allowed to resolve other names, comma-separated (default: local networks)",
+    )
+    parser.add_argument("--debug-endpoints", action="store_true")
+    parser.add_argument(
+        "--stream", action="store_true", help="Serve live device state on /api/stream"
+    )
+    parser.add_argument(
+        "--loop-monitor",
+        action="store_true",
+        help="Sample event loop lag and report slow code paths in the metrics",
+    )
+    parser.add_argument(
+        "--profile-token",
+        help="Bearer token for /debug/profile (needs --debug-endpoints; or SYR_PROFILE_TOKEN)",
+    )
+    parser.add_argument(
+        "--snapshot", action="store_true", help="Serve typed device values on /api/snapshot"
+    )
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args()
+
+    # The API accepts commands, including the valve shut-off
+    args.api_token = args.api_token or os.environ.get("SYR_API_TOKEN")
+    if not args.api_token and not is_loopback(args.api_host):
+        parser.error(
+            f"--api-host {args.api_host} is reachable from other machines; "
+            "set --api-token or SYR_API_TOKEN"
+        )
+    if args.state_file is None or args.journal is None:
+        data_dir = args.data_dir or default_data_dir()
+        data_dir.mkdir(parents=True, exist_ok=True)
+        args.state_file = args.state_file or data_dir / STATE_FILE
+        args.journal = args.journal or data_dir / JOURNAL_FILE
+
+    logging.basicConfig(
+        level=args.log_level.upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    try:
+        import uvloop  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        uvloop = None
+    else:
+        _LOGGER.debug("Using uvloop")
+
+    if sys.version_info >= (3, 11):
+        loop_factory = uvloop.new_event_loop if uvloop is not None else None
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(async_run(args))
+    else:
+        if uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        asyncio.run(async_run(args))
+
+
+if __name__ == "__main__":
+    main()
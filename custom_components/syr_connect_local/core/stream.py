@@ -0,0 +1,128 @@
+"""Live device state stream (Server-Sent Events).
+
+Subscribers get a snapshot of all identified devices on connect and then
+only the properties that changed on each check-in. Events are encoded once
+and shared by all subscribers; a subscriber that falls behind has its
+buffer dropped and is sent a fresh snapshot instead.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import json
+import logging
+from typing import Any
+
+from aiohttp import web
+
+from ..const import STREAM_KEEPALIVE_INTERVAL, STREAM_QUEUE_SIZE
+from .device import DeviceState
+
+_LOGGER = logging.getLogger(__name__)
+
+# Queue markers for subscribers
+_RESYNC = b""
+_CLOSE = None
+
+_KEEPALIVE = b": keepalive\n\n"
+
+
+def encode_event(event: str, data: Any) -> bytes:
+    """Encode an event in the text/event-stream format."""
+    payload = json.dumps(data, separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n".encode()
+
+
+def device_snapshot(device: DeviceState) -> dict[str, Any]:
+    """Return the streamed representation of a device."""
+    return {"serial": device.serial_number, "properties": device.properties}
+
+
+class DeviceStream:
+    """Fan device changes out to stream subscribers."""
+
+    def __init__(self, get_devices: Callable[[], dict[str, DeviceState]]) -> None:
+        """Initialize the stream."""
+        self._get_devices = get_devices
+        self._subscribers: set[asyncio.Queue[bytes | None]] = set()
+        self.events = 0
+        self.resyncs = 0
+
+    def device_added(self, device: DeviceState) -> None:
+        """Publish a newly identified device."""
+        if self._subscribers:
+            self._publish(encode_event("device", device_snapshot(device)))
+
+    def device_changed(self, serial: str, changed: dict[str, str]) -> None:
+        """Publish the properties that changed on a check-in."""
+        if self._subscribers and changed:
+            self._publish(encode_event("delta", {"serial": serial, "properties": changed}))
+
+    def device_removed(self, serial: str) -> None:
+        """Publish the removal of a device."""
+        if self._subscribers:
+            self._publish(encode_event("removed", {"serial": serial}))
+
+    def _publish(self, event: bytes) -> None:
+        """Queue an encoded event for every subscriber."""
+        self.events += 1
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too far behind to catch up with deltas; start over from a snapshot
+                self.resyncs += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(_RESYNC)
+
+    def _snapshot(self) -> bytes:
+        """Encode a snapshot of all identified devices."""
+        devices = [
+            device_snapshot(device)
+            for device in self._get_devices().values()
+            if device.is_identified
+        ]
+        return encode_event("snapshot", {"devices": devices})
+
+    def close(self) -> None:
+        """Disconnect all subscribers."""
+        for queue in self._subscribers:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(_CLOSE)
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        """Stream events to one subscriber until it disconnects."""
+        response = web.StreamResponse(
+            headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"}
+        )
+        await response.prepare(request)
+
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(STREAM_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        _LOGGER.debug("Stream subscriber %s connected", request.remote)
+        try:
+            await response.write(self._snapshot())
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), STREAM_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    event = _KEEPALIVE
+                if event is _CLOSE:
+                    break
+                await response.write(event or self._snapshot())
+        except ConnectionError:
+            pass
+        finally:
+            self._subscribers.discard(queue)
+            _LOGGER.debug("Stream subscriber %s disconnected", request.remote)
+        return response
+
+    def metrics(self) -> dict[str, Any]:
+        """Return stream counters."""
+        return {
+            "subscribers": len(self._subscribers),
+            "events": self.events,
+            "resyncs": self.resyncs,
+        }
@@ -0,0 +1,78 @@
+"""TLS contexts for legacy SYR devices."""
+from __future__ import annotations
+
+import logging
+import os
+import ssl
+import threading
+from typing import Any
+
+from ..const import TLS_NUM_TICKETS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Contexts by (cert_file, key_file), with the file mtimes they were built from.
+# Kept at module level so they survive server restarts and config entry reloads:
+# the OpenSSL session cache and ticket keys live in the context, so reusing it
+# lets devices resume their sessions instead of doing a full handshake.
+_CONTEXTS: dict[tuple[str, str], tuple[tuple[float, float], ssl.SSLContext]] = {}
+_CONTEXTS_LOCK = threading.Lock()
+
+
+def _file_mtimes(cert_file: str, key_file: str) -> tuple[float, float]:
+    """Return the modification times of the certificate and key."""
+    return os.stat(cert_file).st_mtime, os.stat(key_file).st_mtime
+
+
+def create_ssl_context(cert_file: str, key_file: str) -> ssl.SSLContext:
+    """Create an SSL context for legacy devices.
+
+    Blocking; run in an executor.
+    """
+    ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    ssl_context.load_cert_chain(cert_file, key_file)
+
+    # Allow older TLS versions and weaker ciphers for compatibility with legacy SYR devices
+    # SYR devices may use TLS 1.0/1.1 with older cipher suites
+    ssl_context.minimum_version = ssl.TLSVersion.TLSv1
+    ssl_context.set_ciphers("DEFAULT:@SECLEVEL=0")
+
+    # Session resumption: the server-side session-ID cache is on by default;
+    # make sure tickets are not disabled and set how many TLS 1.3 tickets to issue
+    ssl_context.options &= ~ssl.OP_NO_TICKET
+    ssl_context.num_tickets = TLS_NUM_TICKETS
+
+    _LOGGER.debug("SSL context created with TLS 1.0+ support and relaxed cipher policy")
+    return ssl_context
+
+
+def get_ssl_context(cert_file: str, key_file: str) -> ssl.SSLContext:
+    """Return a cached SSL context, rebuilding it if the files changed.
+
+    Blocking; run in an executor.
+    """
+    key = (cert_file, key_file)
+    mtimes = _file_mtimes(cert_file, key_file)
+    with _CONTEXTS_LOCK:
+        cached = _CONTEXTS.get(key)
+        if cached is not None and cached[0] == mtimes:
+            return cached[1]
+        ssl_context = create_ssl_context(cert_file, key_file)
+        _CONTEXTS[key] = (mtimes, ssl_context)
+        return ssl_context
+
+
+def session_metrics(ssl_context: ssl.SSLContext) -> dict[str, Any]:
+    """Return handshake and session cache counters of a server context."""
+    stats = ssl_context.session_stats()
+    resumed = stats["hits"]
+    return {
+        "handshakes_full": max(0, stats["accept_good"] - resumed),
+        "handshakes_resumed": resumed,
+        "handshakes_failed": max(0, stats["accept"] - stats["accept_good"]),
+        "session_cache_misses": stats["misses"],
+        "session_cache_timeouts": stats["timeouts"],
+        "session_cache_full": stats["cache_full"],
+        "sessions_cached": stats["number"],
+        "num_tickets": ssl_context.num_tickets,
+    }
@@ -0,0 +1,147 @@
+"""TLS termination in a worker thread."""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Future
+import logging
+import socket
+import ssl
+import threading
+
+from .admission import AdmissionControl, AdmissionGate
+
+_LOGGER = logging.getLogger(__name__)
+
+_BUFFER_SIZE = 65536
+
+
+class TlsOffloader:
+    """Terminate TLS on its own event loop and forward plaintext locally.
+
+    Handshakes and record encryption run in a worker thread, so they do not
+    compete with the main event loop. Each device connection is forwarded
+    to a loopback listener of the main server; `clients` maps the local port
+    of every forwarded connection to the device's address, so the server can
+    restore the real client address.
+    """
+
+    def __init__(
+        self,
+        port: int,
+        ssl_context: ssl.SSLContext,
+        backend_port: int,
+        admission: AdmissionControl,
+    ) -> None:
+        """Initialize the offloader."""
+        self.port = port
+        self.ssl_context = ssl_context
+        self.backend_port = backend_port
+        # Connection limits apply here; the loopback site only sees this thread
+        self.admission = admission
+        # Written by the worker thread, read by the main loop
+        self.clients: dict[int, str] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.Server | None = None
+        self._thread: threading.Thread | None = None
+
+    async def start(self) -> None:
+        """Start the worker thread and wait until it is listening."""
+        ready: Future[None] = Future()
+        self._thread = threading.Thread(
+            target=self._run, args=(ready,), name="syr_connect_local_tls", daemon=True
+        )
+        self._thread.start()
+        await asyncio.wrap_future(ready)
+
+    async def stop(self) -> None:
+        """Stop listening and shut down the worker thread."""
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
+        self._loop = self._thread = None
+
+    def _run(self, ready: Future[None]) -> None:
+        """Run the worker event loop."""
+        loop = asyncio.new_event_loop()
+        try:
+            self._server = loop.run_until_complete(
+                loop.create_server(
+                    self._protocol,
+                    None,  # Listen on all interfaces
+                    self.port,
+                    reuse_port=hasattr(socket, "SO_REUSEPORT"),
+                )
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            ready.set_exception(err)
+            loop.close()
+            return
+
+        self._loop = loop
+        ready.set_result(None)
+        _LOGGER.debug("TLS offload listening on port %d", self.port)
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+            loop.run_until_complete(asyncio.sleep(0))
+            loop.close()
+
+    def _protocol(self) -> asyncio.Protocol:
+        """Return the protocol for a new connection (runs in the worker thread).
+
+        The gate admits the connection before the TLS handshake.
+        """
+        return AdmissionGate(
+            asyncio.StreamReaderProtocol(asyncio.StreamReader(), self._handle_client),
+            self.admission,
+            self.ssl_context,
+        )
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Forward one device connection to the main server."""
+        peer = writer.get_extra_info("peername")
+        await self._forward(reader, writer, peer[0] if peer else "")
+
+    async def _forward(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str
+    ) -> None:
+        """Pipe a device connection to and from the main server."""
+        try:
+            backend_reader, backend_writer = await asyncio.open_connection(
+                "127.0.0.1", self.backend_port
+            )
+        except OSError as err:
+            _LOGGER.error("TLS offload cannot reach the server: %s", err)
+            writer.close()
+            return
+
+        local_port = backend_writer.get_extra_info("sockname")[1]
+        self.clients[local_port] = host
+        try:
+            pipes = [
+                asyncio.ensure_future(self._pipe(reader, backend_writer)),
+                asyncio.ensure_future(self._pipe(backend_reader, writer)),
+            ]
+            # Either side closing ends the connection
+            _, pending = await asyncio.wait(pipes, return_when=asyncio.FIRST_COMPLETED)
+            for pipe in pending:
+                pipe.cancel()
+        finally:
+            self.clients.pop(local_port, None)
+            for stream in (backend_writer, writer):
+                stream.close()
+
+    @staticmethod
+    async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Copy data from reader to writer until EOF."""
+        try:
+            while data := await reader.read(_BUFFER_SIZE):
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, ssl.SSLError):
+            pass
@@ -7,7 +7,7 @@ from typing import Any
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 
-from .const import DATA_SERVER, DOMAIN
+from .const import DATA_PLATFORMS, DATA_SERVER, DOMAIN
 
 
 async def async_get_config_entry_diagnostics(
@@ -29,15 +29,25 @@ async def async_get_config_entry_diagnostics(
             if device.last_seen:
                 last_seen_ago = round(max(0.0, now - device.last_seen), 3)
 
+            model_key = server.capabilities.model_key(device.properties)
             devices_info.append(
                 {
                     "serial": serial,
                     "identified": device.is_identified,
+                    "identification_state": device.identification_state,
+                    "time_to_identify_seconds": device.time_to_identify,
+                    "model": model_key,
+                    "unsupported_getters": sorted(server.capabilities.unsupported(model_key))
+                    if model_key
+                    else [],
+                    "requested_getters_count": len(device.requested_getters),
                     "last_seen_seconds_ago": last_seen_ago,
                     "properties_count": len(device.properties),
                     "properties": device.properties,
                     "pending_commands_count": len(device.pending_commands),
                     "pending_commands": device.pending_commands,
+                    "pending_command_priorities": device.command_priorities,
+                    "command_latencies": device.command_latencies,
                 }
             )
 
@@ -48,8 +58,13 @@ async def async_get_config_entry_diagnostics(
                 "use_https": server.use_https,
                 "enable_debug_endpoints": server.enable_debug_endpoints,
                 "devices_count": len(server.get_all_devices()),
+                "metrics": server.get_metrics(),
+                "loaded_platforms": sorted(entry_data.get(DATA_PLATFORMS, [])),
             },
             "devices": devices_info,
+            "capabilities": server.capabilities.as_dict(),
+            "known_devices": sorted(server.known_devices),
+            "access_log": server.get_access_log(),
         }
     except Exception as err:
         return {"error": f"Failed to gather diagnostics: {err}"}
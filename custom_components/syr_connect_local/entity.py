@@ -0,0 +1,190 @@
+"""Shared entity base and declarative entity descriptions.
+
+Each platform declares its entities as a table of descriptions. When a
+device appears, every description is checked against the properties the
+device reports, so the entities of a device are created in a single pass.
+Device info is built and cached by the device's coordinator and shared by
+all of its entities.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DATA_COORDINATORS, DOMAIN, SIGNAL_NEW_DEVICE
+from .coordinator import SyrConnectLocalCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Capabilities:
+    """Properties a device reports, read from its data without copying it."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, device_data: dict[str, Any]) -> None:
+        """Initialize the capability set."""
+        self._data = device_data
+
+    def has(self, key: str) -> bool:
+        """Return True if the device reports a value for the property."""
+        return self._data.get(key) is not None
+
+    def has_nonzero(self, key: str) -> bool:
+        """Return True if the device reports a value other than 0."""
+        value = self._data.get(key)
+        return value is not None and value != 0
+
+
+@dataclass(frozen=True)
+class SyrEntityDescription:
+    """Describe an entity of a SYR device.
+
+    The key is the device property backing the entity. The entity is
+    created if the device reports all required properties, or before the
+    device has sent any data if created_without_data is set.
+    """
+
+    key: str
+    name: str
+    # Unique ID suffix, the key if not set
+    unique_id: str | None = None
+    requires: tuple[str, ...] = ()
+    requires_nonzero: tuple[str, ...] = ()
+    created_without_data: bool = False
+    # Available whenever the device is, whether or not it reports the key
+    always_available: bool = False
+    icon: str | None = None
+    entity_category: Any = None
+    has_entity_name: bool = False
+
+    def is_supported(self, capabilities: Capabilities | None) -> bool:
+        """Return True if a device with these capabilities gets this entity."""
+        if capabilities is None:
+            return self.created_without_data
+        return all(map(capabilities.has, self.requires)) and all(
+            map(capabilities.has_nonzero, self.requires_nonzero)
+        )
+
+
+def required_properties(
+    descriptions: Iterable[SyrEntityDescription],
+) -> tuple[str, ...] | None:
+    """Return the properties a device must report one of to get any of these entities.
+
+    None if some entity is created for every device, i.e. it requires no
+    property or is created before the device has sent any data.
+    """
+    properties: dict[str, None] = {}
+    for description in descriptions:
+        required = description.requires or description.requires_nonzero
+        if description.created_without_data or not required:
+            return None
+        properties.update(dict.fromkeys(required))
+    return tuple(properties)
+
+
+class SyrEntity(CoordinatorEntity):
+    """Base class for entities backed by a property of one device."""
+
+    _description: SyrEntityDescription
+
+    def __init__(
+        self,
+        coordinator: SyrConnectLocalCoordinator,
+        description: SyrEntityDescription,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._description = description
+        self._serial = coordinator.serial
+        self._property_key = description.key
+        self._attr_name = description.name
+        self._attr_unique_id = f"{coordinator.serial}_{description.unique_id or description.key}"
+        if description.icon:
+            self._attr_icon = description.icon
+        if description.entity_category is not None:
+            self._attr_entity_category = description.entity_category
+        if description.has_entity_name:
+            self._attr_has_entity_name = True
+
+        # Enable entity by default only if property is available from device
+        device_data = coordinator.data
+        self._attr_entity_registry_enabled_default = description.always_available or (
+            device_data is not None and device_data.get(description.key) is not None
+        )
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return the device info shared by all entities of the device."""
+        return self.coordinator.device_info
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        if not self.coordinator.last_update_success:
+            return False
+        if self._description.always_available:
+            return True
+
+        # Entity is available only if the property exists in device data
+        device_data = self.coordinator.data
+        return device_data is not None and device_data.get(self._property_key) is not None
+
+
+def create_entities(
+    coordinator: SyrConnectLocalCoordinator,
+    descriptions: Iterable[SyrEntityDescription],
+    entity_factory: Callable[[SyrConnectLocalCoordinator, Any], Entity],
+) -> list[Entity]:
+    """Create the entities a device supports, in one pass over the descriptions."""
+    device_data = coordinator.data
+    capabilities = None if device_data is None else Capabilities(device_data)
+    return [
+        entity_factory(coordinator, description)
+        for description in descriptions
+        if description.is_supported(capabilities)
+    ]
+
+
+def async_setup_platform_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    platform: str,
+    descriptions: Iterable[SyrEntityDescription],
+    entity_factory: Callable[[SyrConnectLocalCoordinator, Any], Entity],
+) -> None:
+    """Add entities for known devices and for devices discovered later."""
+    coordinators: dict[str, SyrConnectLocalCoordinator] = hass.data[DOMAIN][
+        entry.entry_id
+    ][DATA_COORDINATORS]
+    descriptions = tuple(descriptions)
+
+    entities: list[Entity] = []
+    for coordinator in coordinators.values():
+        entities.extend(create_entities(coordinator, descriptions, entity_factory))
+    async_add_entities(entities)
+
+    # Listen for newly discovered devices and add entities dynamically
+    async def _handle_new_device(serial: str) -> None:
+        _LOGGER.debug("%s platform: new device signal for %s", platform, serial)
+        new_entities = create_entities(coordinators[serial], descriptions, entity_factory)
+        if new_entities:
+            _LOGGER.info(
+                "%s platform: adding %d entities for %s", platform, len(new_entities), serial
+            )
+            async_add_entities(new_entities)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_NEW_DEVICE, _handle_new_device)
+    )
@@ -0,0 +1,11 @@
+"""Shared fixtures for the core tests.
+
+The tests cover the Home Assistant independent core package only, so they
+run with aiohttp and pytest installed, from the repository root.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,64 @@
+"""Tests for per-model capability learning."""
+from __future__ import annotations
+
+from custom_components.syr_connect_local.const import PROPERTY_SERIAL
+from custom_components.syr_connect_local.core.capabilities import CapabilityMap
+
+MODEL = "SLPS|80|1.0"
+REQUEST = {"getFLO": "", "getCEL": "", PROPERTY_SERIAL: ""}
+
+
+def _learned(threshold: int = 3, interval: int = 4) -> CapabilityMap:
+    """Return a map that has learned getCEL is unsupported."""
+    capabilities = CapabilityMap(miss_threshold=threshold, reprobe_interval=interval)
+    for _ in range(threshold):
+        capabilities.observe(MODEL, REQUEST, {"getFLO": "0", PROPERTY_SERIAL: ""})
+    return capabilities
+
+
+def test_getter_is_unsupported_after_consecutive_misses() -> None:
+    """A getter is dropped on the threshold-th empty answer in a row, not before."""
+    capabilities = CapabilityMap(miss_threshold=3)
+    answered = {"getFLO": "0"}
+
+    assert not capabilities.observe(MODEL, REQUEST, answered)
+    assert not capabilities.observe(MODEL, REQUEST, answered)
+    # An answer in between starts the count again
+    assert not capabilities.observe(MODEL, REQUEST, {**answered, "getCEL": "215"})
+    assert not capabilities.observe(MODEL, REQUEST, answered)
+    assert not capabilities.observe(MODEL, REQUEST, answered)
+    assert capabilities.observe(MODEL, REQUEST, answered)
+
+    # Protected getters are never dropped
+    assert capabilities.unsupported(MODEL) == {"getCEL"}
+
+
+def test_every_nth_response_reprobes() -> None:
+    """Unsupported getters are requested again every reprobe_interval-th response."""
+    capabilities = _learned(interval=4)
+
+    pruned = [
+        "getCEL" in capabilities.prune(MODEL, dict(REQUEST)) for _ in range(8)
+    ]
+
+    assert pruned == [False, False, False, True, False, False, False, True]
+
+
+def test_answered_reprobe_makes_getter_supported_again() -> None:
+    """A getter that is answered again is no longer pruned."""
+    capabilities = _learned()
+
+    assert capabilities.observe(MODEL, REQUEST, {"getFLO": "0", "getCEL": "215"})
+    assert capabilities.unsupported(MODEL) == set()
+    assert capabilities.prune(MODEL, dict(REQUEST)) == REQUEST
+
+
+def test_unobserved_responses_do_not_count_toward_reprobe() -> None:
+    """Responses passed with reprobe=False are pruned and leave the schedule alone."""
+    capabilities = _learned(interval=2)
+
+    for _ in range(5):
+        assert "getCEL" not in capabilities.prune(MODEL, dict(REQUEST), reprobe=False)
+
+    assert "getCEL" not in capabilities.prune(MODEL, dict(REQUEST))
+    assert "getCEL" in capabilities.prune(MODEL, dict(REQUEST))
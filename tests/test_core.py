@@ -0,0 +1,48 @@
+"""Tests for the boundary between the core and Home Assistant."""
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+from custom_components.syr_connect_local.core.protocol import SyrProtocol
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _loaded_modules(statement: str) -> set[str]:
+    """Run an import in a fresh interpreter and return the modules it loaded."""
+    script = f"import sys; {statement}; print('\\n'.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, capture_output=True, check=True, text=True
+    )
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "module", ["core.server", "core.standalone", "core.remote", "core.converters"]
+)
+def test_core_imports_without_homeassistant(module: str) -> None:
+    """The core modules load without Home Assistant."""
+    modules = _loaded_modules(f"import custom_components.syr_connect_local.{module}")
+    assert not {name for name in modules if name.split(".")[0] == "homeassistant"}
+
+
+def test_core_package_loads_submodules_lazily() -> None:
+    """Importing the core package alone loads neither the server nor aiohttp."""
+    modules = _loaded_modules("import custom_components.syr_connect_local.core")
+    assert "custom_components.syr_connect_local.core.server" not in modules
+    assert "aiohttp" not in modules
+
+
+def test_xml_round_trip() -> None:
+    """Generated XML parses back into the same properties."""
+    properties = {"getSRN": "123456789", "getCNA": "LEXplus10SL", "setSIR": "0", "getFLO": ""}
+    assert SyrProtocol.parse_xml(SyrProtocol.generate_xml(properties)) == properties
+
+
+def test_parse_invalid_xml() -> None:
+    """Invalid XML yields no properties instead of an exception."""
+    assert SyrProtocol.parse_xml("<sc><d><c n=") == {}
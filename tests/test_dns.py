@@ -0,0 +1,260 @@
+"""Tests for the DNS responder."""
+from __future__ import annotations
+
+import asyncio
+import struct
+
+from custom_components.syr_connect_local.const import DNS_TTL
+from custom_components.syr_connect_local.core.dns import (
+    TYPE_A,
+    TYPE_AAAA,
+    DnsResponder,
+)
+from custom_components.syr_connect_local.core.proxy import parse_trusted_proxies
+
+HEADER = struct.Struct("!HHHHHH")
+LOCAL_ADDRESS = "192.168.1.10"
+UPSTREAM_ADDRESS = bytes([93, 184, 215, 14])
+
+
+def _query(name: str, qtype: int = TYPE_A, ident: int = 0x1234) -> bytes:
+    """Build a recursive query with one question."""
+    question = b"".join(bytes([len(label)]) + label.encode() for label in name.split("."))
+    return HEADER.pack(ident, 0x0100, 1, 0, 0, 0) + question + b"\0" + struct.pack("!HH", qtype, 1)
+
+
+def _answer(query: bytes, address: bytes, ttl: int = 60) -> bytes:
+    """Build an upstream answer to a query."""
+    ident = query[:2]
+    record = b"\xc0\x0c" + struct.pack("!HHIH", TYPE_A, 1, ttl, len(address)) + address
+    return ident + struct.pack("!HHHHH", 0x8180, 1, 1, 0, 0) + query[HEADER.size :] + record
+
+
+class _Client(asyncio.DatagramProtocol):
+    """Collect the datagrams sent to a UDP endpoint."""
+
+    def __init__(self) -> None:
+        self.received: asyncio.Queue[tuple[bytes, tuple]] = asyncio.Queue()
+        self.transport: asyncio.DatagramTransport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        self.received.put_nowait((data, addr))
+
+
+async def _endpoint(**kwargs) -> _Client:
+    """Open a UDP endpoint on the loopback interface."""
+    _, protocol = await asyncio.get_running_loop().create_datagram_endpoint(
+        _Client, **kwargs
+    )
+    return protocol
+
+
+async def _start(
+    upstream: tuple[str, int] | None = None, clients: str | None = None
+) -> tuple[DnsResponder, int]:
+    """Start a responder on a free port and return it with the port."""
+    responder = DnsResponder(
+        0,
+        [LOCAL_ADDRESS],
+        upstream,
+        parse_trusted_proxies(clients) if clients else None,
+    )
+    await responder.start()
+    return responder, responder._transport.get_extra_info("sockname")[1]
+
+
+async def _ask(port: int, query: bytes) -> bytes:
+    """Send a query from the loopback interface and return the response."""
+    client = await _endpoint(remote_addr=("127.0.0.1", port))
+    try:
+        client.transport.sendto(query)
+        data, _ = await asyncio.wait_for(client.received.get(), 2)
+    finally:
+        client.transport.close()
+    return data
+
+
+def _rcode(response: bytes) -> int:
+    return HEADER.unpack_from(response)[1] & 0x000F
+
+
+def test_answers_handled_domains_with_local_address() -> None:
+    """A queries for the SYR cloud domains get this host's address."""
+
+    async def run() -> tuple[list[bytes], DnsResponder]:
+        responder, port = await _start()
+        try:
+            responses = [
+                await _ask(port, _query("syrconnect.de", ident=0x0001)),
+                await _ask(port, _query("WWW.SyrConnect.de", ident=0x0002)),
+            ]
+        finally:
+            responder.stop()
+        return responses, responder
+
+    responses, responder = asyncio.run(run())
+
+    for ident, response in enumerate(responses, 1):
+        response_id, flags, questions, answers, _, _ = HEADER.unpack_from(response)
+        assert response_id == ident
+        # Authoritative response without error
+        assert flags & 0x8400 == 0x8400
+        assert _rcode(response) == 0
+        assert (questions, answers) == (1, 1)
+        assert response.endswith(
+            struct.pack("!HHIH", TYPE_A, 1, DNS_TTL, 4) + bytes([192, 168, 1, 10])
+        )
+    assert responder.counters["local"] == 2
+
+
+def test_nodata_for_missing_address_family() -> None:
+    """AAAA queries for a handled domain get an empty answer, not an error."""
+
+    async def run() -> bytes:
+        responder, port = await _start()
+        try:
+            return await _ask(port, _query("syrconnect.de", TYPE_AAAA))
+        finally:
+            responder.stop()
+
+    response = asyncio.run(run())
+
+    _, flags, questions, answers, authority, _ = HEADER.unpack_from(response)
+    assert flags & 0x8000
+    assert _rcode(response) == 0
+    assert (questions, answers, authority) == (1, 0, 0)
+
+
+def test_refuses_without_upstream() -> None:
+    """Other names are refused when no upstream resolver is configured."""
+
+    async def run() -> tuple[bytes, DnsResponder]:
+        responder, port = await _start()
+        try:
+            return await _ask(port, _query("example.com")), responder
+        finally:
+            responder.stop()
+
+    response, responder = asyncio.run(run())
+
+    assert _rcode(response) == 5
+    assert responder.counters["refused"] == 1
+
+
+def test_forwards_other_names_and_caches_answers() -> None:
+    """Other names are forwarded under a new ID, relayed with the client's ID and cached."""
+
+    async def run() -> tuple[list[bytes], list[bytes], DnsResponder]:
+        upstream = await _endpoint(local_addr=("127.0.0.1", 0))
+        upstream_port = upstream.transport.get_extra_info("sockname")[1]
+        responder, port = await _start(upstream=("127.0.0.1", upstream_port))
+        forwarded: list[bytes] = []
+
+        async def answer() -> None:
+            data, addr = await upstream.received.get()
+            forwarded.append(data)
+            upstream.transport.sendto(_answer(data, UPSTREAM_ADDRESS), addr)
+
+        try:
+            task = asyncio.create_task(answer())
+            first = await _ask(port, _query("example.com", ident=0x1111))
+            await task
+            # Served from the cache; the upstream is not asked again
+            second = await _ask(port, _query("example.com", ident=0x2222))
+        finally:
+            responder.stop()
+            upstream.transport.close()
+        return [first, second], forwarded, responder
+
+    responses, forwarded, responder = asyncio.run(run())
+
+    assert len(forwarded) == 1
+    assert forwarded[0][2:] == _query("example.com")[2:]
+    for ident, response in zip((0x1111, 0x2222), responses):
+        assert HEADER.unpack_from(response)[0] == ident
+        assert response.endswith(UPSTREAM_ADDRESS)
+    assert responder.counters["forwarded"] == 1
+    assert responder.counters["cache_hits"] == 1
+
+
+def test_ignores_answers_to_other_questions() -> None:
+    """An upstream answer with the right ID but another question is not relayed."""
+
+    async def run() -> tuple[bytes, DnsResponder]:
+        upstream = await _endpoint(local_addr=("127.0.0.1", 0))
+        upstream_port = upstream.transport.get_extra_info("sockname")[1]
+        responder, port = await _start(upstream=("127.0.0.1", upstream_port))
+
+        async def answer() -> None:
+            data, addr = await upstream.received.get()
+            spoofed = data[:2] + _query("attacker.example")[2:]
+            upstream.transport.sendto(_answer(spoofed, bytes([6, 6, 6, 6])), addr)
+            upstream.transport.sendto(_answer(data, UPSTREAM_ADDRESS), addr)
+
+        try:
+            task = asyncio.create_task(answer())
+            response = await _ask(port, _query("example.com"))
+            await task
+        finally:
+            responder.stop()
+            upstream.transport.close()
+        return response, responder
+
+    response, responder = asyncio.run(run())
+
+    assert response.endswith(UPSTREAM_ADDRESS)
+    assert responder.counters["mismatched"] == 1
+
+
+def test_refuses_recursion_for_outside_clients() -> None:
+    """Clients outside the allow-list only get answers for the SYR domains."""
+
+    async def run() -> tuple[bytes, bytes, DnsResponder]:
+        upstream = await _endpoint(local_addr=("127.0.0.1", 0))
+        upstream_port = upstream.transport.get_extra_info("sockname")[1]
+        responder, port = await _start(
+            upstream=("127.0.0.1", upstream_port), clients="192.168.9.0/24"
+        )
+        try:
+            refused = await _ask(port, _query("example.com"))
+            local = await _ask(port, _query("syrconnect.de"))
+        finally:
+            responder.stop()
+            upstream.transport.close()
+        assert upstream.received.empty()
+        return refused, local, responder
+
+    refused, local, responder = asyncio.run(run())
+
+    assert _rcode(refused) == 5
+    assert _rcode(local) == 0
+    assert HEADER.unpack_from(local)[3] == 1
+    assert responder.counters["forwarded"] == 0
+
+
+def test_ignores_malformed_queries() -> None:
+    """Truncated queries and responses sent to the responder are dropped."""
+
+    async def run() -> DnsResponder:
+        responder, port = await _start()
+        client = await _endpoint(remote_addr=("127.0.0.1", port))
+        try:
+            client.transport.sendto(b"\x12\x34")
+            client.transport.sendto(_query("syrconnect.de")[:-3])
+            # A valid query afterwards is still answered
+            client.transport.sendto(_query("syrconnect.de"))
+            await asyncio.wait_for(client.received.get(), 2)
+            await asyncio.sleep(0.05)
+        finally:
+            client.transport.close()
+            responder.stop()
+        assert client.received.empty()
+        return responder
+
+    responder = asyncio.run(run())
+
+    assert responder.counters["malformed"] == 2
+    assert responder.counters["local"] == 1
@@ -0,0 +1,78 @@
+"""Tests for the journal of queued device commands."""
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from custom_components.syr_connect_local.const import (
+    COMMAND_PRIORITY_HIGH as HIGH,
+    COMMAND_PRIORITY_NORMAL as NORMAL,
+)
+from custom_components.syr_connect_local.core import journal
+from custom_components.syr_connect_local.core.journal import CommandJournal
+
+
+@pytest.fixture(autouse=True)
+def fast_flush(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Write batches right away."""
+    monkeypatch.setattr(journal, "JOURNAL_FLUSH_DELAY", 0.01)
+
+
+def _records(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_replay_after_crash(tmp_path: Path) -> None:
+    """Flushed records survive a crash; a torn last line is skipped."""
+    path = tmp_path / "commands.jsonl"
+
+    async def crash() -> None:
+        written = CommandJournal(path)
+        await written.start()
+        written.queued("123456789", "setAB", "1", HIGH)
+        written.queued("123456789", "setSIR", "0", NORMAL)
+        written.queued("987654321", "setRTH", "3", NORMAL)
+        written.delivered("123456789", ["setSIR"])
+        await asyncio.sleep(0.1)
+        # Killed without stop(): nothing more is written
+        written._worker.cancel()
+
+    asyncio.run(crash())
+    with path.open("a") as file:
+        file.write('{"q": "987654321", "c": "setR')
+
+    async def restart() -> dict:
+        replayed = CommandJournal(path)
+        pending = await replayed.start()
+        await replayed.stop()
+        return pending
+
+    assert asyncio.run(restart()) == {
+        "123456789": {"setAB": ("1", HIGH)},
+        "987654321": {"setRTH": ("3", NORMAL)},
+    }
+
+
+def test_compaction(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A journal grown well beyond its pending commands is rewritten to them."""
+    monkeypatch.setattr(journal, "JOURNAL_COMPACT_THRESHOLD", 10)
+    path = tmp_path / "commands.jsonl"
+
+    async def run() -> dict:
+        commands = CommandJournal(path)
+        await commands.start()
+        for value in range(20):
+            commands.queued("123456789", "setSIR", str(value), NORMAL)
+            commands.delivered("123456789", ["setSIR"])
+        commands.queued("123456789", "setAB", "1", HIGH)
+        await commands.stop()
+        return commands.metrics()
+
+    metrics = asyncio.run(run())
+
+    assert metrics["compactions"] >= 1
+    assert _records(path) == [{"q": "123456789", "c": "setAB", "v": "1", "p": HIGH}]
+    assert not path.with_suffix(".tmp").exists()
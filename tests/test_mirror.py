@@ -0,0 +1,133 @@
+"""Tests for mirroring check-ins to the SYR cloud."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+from aiohttp import web
+import pytest
+
+from custom_components.syr_connect_local.const import ENDPOINT_ALL
+from custom_components.syr_connect_local.core import mirror
+from custom_components.syr_connect_local.core.mirror import CloudMirror
+
+UPSTREAM_COMMANDS = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<sc version="1.0"><d><c n="getSRN" v="" /><c n="setSIR" v="0" /></d></sc>'
+)
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry in fractions of a second on a small queue."""
+    monkeypatch.setattr(mirror, "MIRROR_RETRY_DELAY", 0.01)
+    monkeypatch.setattr(mirror, "MIRROR_QUEUE_SIZE", 4)
+
+
+async def _mirror_to_stand_in(
+    handler: Callable[[web.Request, bytes], web.Response],
+    bodies: list[bytes],
+    settle: float = 0.3,
+) -> tuple[CloudMirror, list[tuple[str, str]]]:
+    """Forward check-ins to a stand-in upstream.
+
+    The check-ins are queued before the worker starts. Returns the mirror
+    and the upstream commands it passed on.
+    """
+    async def check_in(request: web.Request) -> web.Response:
+        return handler(request, await request.read())
+
+    app = web.Application()
+    app.router.add_post(ENDPOINT_ALL, check_in)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    cloud_mirror = CloudMirror(f"http://127.0.0.1:{port}")
+    commands: list[tuple[str, str]] = []
+    cloud_mirror.on_upstream_commands = lambda serial, setters: commands.extend(
+        (serial, f"{name}={value}") for name, value in setters.items()
+    )
+    for body in bodies:
+        cloud_mirror.forward(ENDPOINT_ALL, body, "syrconnect.de", "123456789")
+    try:
+        await cloud_mirror.start()
+        await asyncio.sleep(settle)
+    finally:
+        await cloud_mirror.stop()
+        await runner.cleanup()
+    return cloud_mirror, commands
+
+
+def test_forwards_and_passes_on_upstream_commands() -> None:
+    """Check-ins reach the upstream with the device's host and its setters come back."""
+    received: list[tuple[bytes, str]] = []
+
+    def handler(request: web.Request, body: bytes) -> web.Response:
+        received.append((body, request.host))
+        return web.Response(text=UPSTREAM_COMMANDS)
+
+    cloud_mirror, commands = asyncio.run(_mirror_to_stand_in(handler, [b"xml=1"]))
+
+    assert received == [(b"xml=1", "syrconnect.de")]
+    assert commands == [("123456789", "setSIR=0")]
+    assert cloud_mirror.metrics()["forwarded"] == 1
+    assert cloud_mirror.metrics()["upstream_commands"] == 1
+
+
+def test_full_queue_drops_oldest() -> None:
+    """With the queue full, the oldest check-ins give way to new ones."""
+    received: list[bytes] = []
+
+    def handler(request: web.Request, body: bytes) -> web.Response:
+        received.append(body)
+        return web.Response(text="")
+
+    bodies = [f"xml={index}".encode() for index in range(6)]
+    cloud_mirror, _ = asyncio.run(_mirror_to_stand_in(handler, bodies))
+
+    assert received == bodies[2:]
+    assert cloud_mirror.metrics()["dropped"] == 2
+    assert cloud_mirror.metrics()["forwarded"] == 4
+    assert cloud_mirror.metrics()["queued"] == 0
+
+
+def test_retries_until_upstream_answers() -> None:
+    """A check-in is retried with back-off until the upstream accepts it."""
+    attempts = 0
+
+    def handler(request: web.Request, body: bytes) -> web.Response:
+        nonlocal attempts
+        attempts += 1
+        if attempts < mirror.MIRROR_MAX_ATTEMPTS:
+            return web.Response(status=503)
+        return web.Response(text=UPSTREAM_COMMANDS)
+
+    cloud_mirror, commands = asyncio.run(_mirror_to_stand_in(handler, [b"xml=1"]))
+
+    assert attempts == mirror.MIRROR_MAX_ATTEMPTS
+    assert cloud_mirror.metrics()["retries"] == mirror.MIRROR_MAX_ATTEMPTS - 1
+    assert cloud_mirror.metrics()["forwarded"] == 1
+    assert cloud_mirror.metrics()["failed"] == 0
+    assert commands == [("123456789", "setSIR=0")]
+
+
+def test_gives_up_after_max_attempts() -> None:
+    """A check-in the upstream keeps rejecting is counted as failed; the next one is sent."""
+    received: list[bytes] = []
+
+    def handler(request: web.Request, body: bytes) -> web.Response:
+        received.append(body)
+        return web.Response(status=500)
+
+    cloud_mirror, commands = asyncio.run(
+        _mirror_to_stand_in(handler, [b"xml=1", b"xml=2"])
+    )
+
+    attempts = mirror.MIRROR_MAX_ATTEMPTS
+    assert received == [b"xml=1"] * attempts + [b"xml=2"] * attempts
+    assert cloud_mirror.metrics()["failed"] == 2
+    assert cloud_mirror.metrics()["forwarded"] == 0
+    assert commands == []
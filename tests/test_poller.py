@@ -0,0 +1,222 @@
+"""Tests for polling devices with a local JSON API."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+from aiohttp import web
+import pytest
+
+from custom_components.syr_connect_local.const import (
+    COMMAND_PRIORITY_HIGH,
+    COMMAND_PRIORITY_LOW,
+)
+from custom_components.syr_connect_local.core import poller
+from custom_components.syr_connect_local.core.server import SyrConnectServer
+
+INTERVAL_MIN = 0.05
+INTERVAL_MAX = 0.4
+# Timers may fire slightly early
+TOLERANCE = 0.8
+
+IDENTITY = {
+    "getSRN": "123456789",
+    "getVER": "1.0",
+    "getFIR": "SLPS",
+    "getTYP": "80",
+    "getCNA": "LEXplus10SL",
+}
+PROPERTIES = {**IDENTITY, "getFLO": 0, "getCEL": 215, "getRES": 1200}
+
+
+@pytest.fixture(autouse=True)
+def fast_intervals(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Poll in fractions of a second."""
+    monkeypatch.setattr(poller, "POLL_INTERVAL_MIN", INTERVAL_MIN)
+    monkeypatch.setattr(poller, "POLL_INTERVAL_MAX", INTERVAL_MAX)
+
+
+async def _poll_stand_in(
+    handler: Callable[[web.Request], web.Response],
+    duration: float,
+    server: SyrConnectServer | None = None,
+    set_status: int = 200,
+) -> tuple[SyrConnectServer, dict, list[float], list[str]]:
+    """Poll a stand-in device for a while.
+
+    Returns the server, the poller metrics of the device, the times of the
+    polls and the setter paths that were requested. Setters are answered
+    with set_status.
+    """
+    loop = asyncio.get_running_loop()
+    times: list[float] = []
+    setters: list[str] = []
+
+    async def get_all(request: web.Request) -> web.Response:
+        times.append(loop.time())
+        return handler(request)
+
+    async def set_value(request: web.Request) -> web.Response:
+        setters.append(f"{request.match_info['command']}/{request.match_info['value']}")
+        return web.json_response({}, status=set_status)
+
+    app = web.Application()
+    app.router.add_get("/safe-tec/get/ALL", get_all)
+    app.router.add_get("/safe-tec/set/{command}/{value}", set_value)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    url = f"http://127.0.0.1:{port}/safe-tec"
+
+    server = server or SyrConnectServer()
+    device_poller = poller.DevicePoller(server)
+    try:
+        await device_poller.start([url])
+        await asyncio.sleep(duration)
+        metrics = device_poller.metrics()["devices"][url]
+    finally:
+        await device_poller.stop()
+        await runner.cleanup()
+    return server, metrics, times, setters
+
+
+def _gaps(times: list[float]) -> list[float]:
+    return [later - earlier for earlier, later in zip(times, times[1:])]
+
+
+def test_parse_poll_hosts() -> None:
+    """Bare hosts get the default port and path."""
+    assert poller.parse_poll_hosts("192.168.1.20, 192.168.1.21:8080/api/") == [
+        "http://192.168.1.20:5333/safe-tec",
+        "http://192.168.1.21:8080/api",
+    ]
+    assert poller.parse_poll_hosts(["https://device.local/safe-tec"]) == [
+        "https://device.local/safe-tec"
+    ]
+    assert poller.parse_poll_hosts(None) == []
+
+
+def test_unchanged_device_backs_off() -> None:
+    """The interval doubles up to the maximum while nothing changes."""
+
+    def handler(request: web.Request) -> web.Response:
+        return web.json_response(PROPERTIES)
+
+    server, metrics, times, _ = asyncio.run(_poll_stand_in(handler, 1.5))
+
+    assert server.get_device("123456789").is_identified
+    assert metrics["interval"] == INTERVAL_MAX
+    assert metrics["errors"] == 0
+    # The first poll is a change: the device is new
+    expected = [INTERVAL_MIN, INTERVAL_MIN * 2, INTERVAL_MIN * 4, INTERVAL_MAX, INTERVAL_MAX]
+    gaps = _gaps(times)
+    assert len(gaps) >= len(expected)
+    for gap, interval in zip(gaps, expected):
+        assert gap >= interval * TOLERANCE
+
+
+def test_change_resets_interval() -> None:
+    """A changed value brings the interval back to the minimum."""
+    polls = 0
+
+    def handler(request: web.Request) -> web.Response:
+        nonlocal polls
+        polls += 1
+        return web.json_response({**PROPERTIES, "getFLO": polls})
+
+    _, metrics, times, _ = asyncio.run(_poll_stand_in(handler, 0.5))
+
+    assert metrics["interval"] == INTERVAL_MIN
+    assert all(gap >= INTERVAL_MIN * TOLERANCE for gap in _gaps(times))
+
+
+def test_errors_back_off() -> None:
+    """Failed polls are counted and backed off like unchanged ones."""
+
+    def handler(request: web.Request) -> web.Response:
+        return web.Response(status=500)
+
+    _, metrics, times, _ = asyncio.run(_poll_stand_in(handler, 1.0))
+
+    assert metrics["errors"] == len(times)
+    assert metrics["last_error"]
+    assert metrics["interval"] == INTERVAL_MAX
+    # Minimum, then doubling: far fewer polls than a hot loop
+    assert len(times) <= 6
+    assert all(gap >= INTERVAL_MIN * 2 * TOLERANCE for gap in _gaps(times))
+
+
+def test_identifying_device_is_polled_at_minimum_interval() -> None:
+    """A device that only reports its identity is polled again, but not in a loop."""
+
+    def handler(request: web.Request) -> web.Response:
+        return web.json_response(IDENTITY)
+
+    server, metrics, times, _ = asyncio.run(_poll_stand_in(handler, 0.5))
+
+    assert server.get_device("123456789").identification_state == "identifying"
+    # No back-off while identifying
+    assert metrics["interval"] == INTERVAL_MIN
+    assert all(gap >= INTERVAL_MIN * TOLERANCE for gap in _gaps(times))
+    assert 3 <= len(times) <= 0.5 / INTERVAL_MIN + 2
+
+
+def test_queued_commands_are_sent() -> None:
+    """Commands queued for a polled device are sent as setter requests."""
+
+    def handler(request: web.Request) -> web.Response:
+        return web.json_response(PROPERTIES)
+
+    async def run() -> list[str]:
+        server = SyrConnectServer()
+        server.process_check_in("123456789", {k: str(v) for k, v in PROPERTIES.items()})
+        server.queue_commands("123456789", {"setSIR": "0"})
+        _, _, _, setters = await _poll_stand_in(handler, 0.2, server)
+        return setters
+
+    assert asyncio.run(run()) == ["SIR/0"]
+
+
+def test_setter_values_are_quoted() -> None:
+    """A value with reserved characters stays one path segment."""
+
+    def handler(request: web.Request) -> web.Response:
+        return web.json_response(PROPERTIES)
+
+    async def run() -> list[str]:
+        server = SyrConnectServer()
+        server.process_check_in("123456789", {k: str(v) for k, v in PROPERTIES.items()})
+        server.queue_commands("123456789", {"setCNA": "Cellar 1/2 #3"})
+        _, _, _, setters = await _poll_stand_in(handler, 0.2, server)
+        return setters
+
+    assert asyncio.run(run()) == ["CNA/Cellar 1/2 #3"]
+
+
+def test_failed_setters_keep_priority_and_queue_time() -> None:
+    """Setters the device did not accept are queued again as they were."""
+
+    def handler(request: web.Request) -> web.Response:
+        return web.json_response(PROPERTIES)
+
+    async def run():
+        server = SyrConnectServer()
+        device = server.process_check_in(
+            "123456789", {k: str(v) for k, v in PROPERTIES.items()}
+        )
+        device.queue_command("setAB", "1", COMMAND_PRIORITY_HIGH)
+        device.queue_command("setSIR", "0", COMMAND_PRIORITY_LOW)
+        queued_at = dict(device.command_queued_at)
+        await _poll_stand_in(handler, 0.1, server, set_status=500)
+        return device, queued_at
+
+    device, queued_at = asyncio.run(run())
+
+    assert device.pending_commands == {"setAB": "1", "setSIR": "0"}
+    assert device.command_priorities == {
+        "setAB": COMMAND_PRIORITY_HIGH,
+        "setSIR": COMMAND_PRIORITY_LOW,
+    }
+    assert device.command_queued_at == queued_at
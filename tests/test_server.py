@@ -0,0 +1,240 @@
+"""Tests for the device table and check-in handlers of the server."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+import socket
+
+import aiohttp
+import pytest
+
+from custom_components.syr_connect_local.const import (
+    ADMISSION_MAX_REQUEST_SIZE,
+    COMMAND_PRIORITY_HIGH,
+    ENDPOINT_ALL,
+    ENDPOINT_BASIC,
+    FAST_LANE_PROPERTIES,
+    IDENT_STATE_IDENTIFIED,
+    IDENT_STATE_IDENTIFYING,
+    IDENT_STATE_NEW,
+    UNIDENTIFIED_DEVICE_TTL,
+)
+from custom_components.syr_connect_local.core.server import SyrConnectServer
+
+IDENTITY = {
+    "getSRN": "123456789",
+    "getVER": "1.0",
+    "getFIR": "SLPS",
+    "getTYP": "80",
+    "getCNA": "LEXplus10SL",
+}
+PROPERTIES = {**IDENTITY, "getFLO": "0", "getCEL": "215", "getRES": "1200"}
+
+
+def _check_in(server: SyrConnectServer, serial: str, last_seen: float = 0):
+    """Check a serial in and set when it was last seen."""
+    device = server.process_check_in(serial, {"getSRN": serial})
+    if device is not None:
+        device.last_seen = last_seen
+    return device
+
+
+def _identify(server: SyrConnectServer, serial: str, last_seen: float = 0):
+    """Add a device that has completed identification."""
+    device = _check_in(server, serial, last_seen)
+    device.identification_state = IDENT_STATE_IDENTIFIED
+    return device
+
+
+def test_full_table_evicts_least_recently_seen_unidentified_serial() -> None:
+    """Identified devices stay when a new serial needs a slot."""
+
+    async def run() -> SyrConnectServer:
+        server = SyrConnectServer(device_capacity=3)
+        now = asyncio.get_running_loop().time()
+        _identify(server, "identified", last_seen=now - 100)
+        _check_in(server, "old", last_seen=now - 50)
+        _check_in(server, "recent", last_seen=now - 10)
+        assert _check_in(server, "new", last_seen=now) is not None
+        return server
+
+    server = asyncio.run(run())
+
+    assert set(server.devices) == {"identified", "recent", "new"}
+    assert server.evictions["capacity"] == 1
+
+
+def test_full_table_of_identified_devices_rejects_new_serial() -> None:
+    """A new serial is turned away instead of evicting an identified device."""
+
+    async def run() -> tuple[SyrConnectServer, object]:
+        server = SyrConnectServer(device_capacity=2)
+        _identify(server, "first")
+        _identify(server, "second")
+        return server, server.process_check_in("new", {"getSRN": "new"})
+
+    server, device = asyncio.run(run())
+
+    assert device is None
+    assert set(server.devices) == {"first", "second"}
+    assert server.rejected_serials == 1
+    assert server.evictions["capacity"] == 0
+
+
+def test_evict_expired() -> None:
+    """Stale unidentified serials and long unseen devices are dropped."""
+
+    async def run() -> SyrConnectServer:
+        server = SyrConnectServer(device_expiry=3600)
+        now = asyncio.get_running_loop().time()
+        _check_in(server, "stale", last_seen=now - UNIDENTIFIED_DEVICE_TTL - 1)
+        _check_in(server, "fresh", last_seen=now - 1)
+        _identify(server, "gone", last_seen=now - 3601)
+        _identify(server, "present", last_seen=now - 1)
+        server._evict_expired(now)
+        return server
+
+    server = asyncio.run(run())
+
+    assert set(server.devices) == {"fresh", "present"}
+    assert server.evictions["unidentified"] == 1
+    assert server.evictions["expired"] == 1
+    assert set(server.known_devices) == {"gone"}
+
+
+def test_expired_device_keeps_pending_commands(tmp_path: Path) -> None:
+    """Commands of an evicted device are queued again when it checks back in."""
+
+    async def run():
+        server = SyrConnectServer(device_expiry=3600, journal_path=str(tmp_path / "journal"))
+        now = asyncio.get_running_loop().time()
+        device = _identify(server, "gone", last_seen=now - 3601)
+        device.queue_command("setAB", "1")
+        device.queue_command("setRTH", "2")
+        server._evict_expired(now)
+        assert "gone" not in server.devices
+        assert set(server.journal.pending["gone"]) == {"setAB", "setRTH"}
+        return server.process_check_in("gone", {"getSRN": "gone"})
+
+    device = asyncio.run(run())
+
+    assert device.pending_commands == {"setAB": "1", "setRTH": "2"}
+    assert device.command_priorities["setAB"] == COMMAND_PRIORITY_HIGH
+
+
+
+def test_identification_states() -> None:
+    """A device is announced once it has answered the full property set."""
+    discovered: list[str] = []
+
+    async def run() -> list[str]:
+        server = SyrConnectServer()
+        server.on_device_discovered = lambda serial, properties: discovered.append(serial)
+        return [
+            server.process_check_in("123456789", properties).identification_state
+            for properties in ({"getSRN": "123456789"}, IDENTITY, PROPERTIES)
+        ]
+
+    assert asyncio.run(run()) == [IDENT_STATE_NEW, IDENT_STATE_IDENTIFYING, IDENT_STATE_IDENTIFIED]
+    assert discovered == ["123456789"]
+
+
+def test_known_device_is_fast_tracked() -> None:
+    """A device known with the same model is announced on its identity check-in."""
+
+    async def run(version: str) -> tuple[str, str | None]:
+        server = SyrConnectServer()
+        server.restore_state({"known_devices": {"123456789": PROPERTIES}})
+        device = server.process_check_in("123456789", {**IDENTITY, "getVER": version})
+        return device.identification_state, device.properties.get("getCEL")
+
+    assert asyncio.run(run("1.0")) == (IDENT_STATE_IDENTIFIED, "215")
+    # A firmware update is a different model: identify afresh
+    assert asyncio.run(run("1.1")) == (IDENT_STATE_IDENTIFYING, None)
+
+
+
+def test_fast_lane_response() -> None:
+    """A pending setAB goes out alone with the essential getters; the rest follows."""
+
+    async def run() -> tuple[dict[str, str], list[str], dict[str, str]]:
+        server = SyrConnectServer()
+        device = server.process_check_in("123456789", PROPERTIES)
+        server.queue_commands("123456789", {"setSIR": "0", "setAB": "1"})
+        fast_lane = server._build_response(device)
+        requested = device.requested_getters
+        return fast_lane, requested, server._build_response(device)
+
+    fast_lane, requested, following = asyncio.run(run())
+
+    assert fast_lane == {"setAB": "1", **{getter: "" for getter in FAST_LANE_PROPERTIES}}
+    assert requested == FAST_LANE_PROPERTIES
+    assert following["setSIR"] == "0"
+    assert "setAB" not in following
+    assert "getFLO" in following
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.parametrize("endpoint", [ENDPOINT_BASIC, ENDPOINT_ALL])
+def test_oversized_chunked_check_in_is_rejected(endpoint: str) -> None:
+    """A body over the limit without a Content-Length gets a 413."""
+
+    async def body() -> AsyncIterator[bytes]:
+        yield b"xml="
+        for _ in range(ADMISSION_MAX_REQUEST_SIZE // 1024 + 1):
+            yield b"x" * 1024
+
+    async def run() -> tuple[int, int]:
+        server = SyrConnectServer(http_port=_free_port())
+        await server.start()
+        try:
+            async with aiohttp.ClientSession() as session, session.post(
+                f"http://127.0.0.1:{server.http_port}{endpoint}",
+                data=body(),
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            ) as response:
+                status = response.status
+        finally:
+            await server.stop()
+        return status, server.admission.rejected["request_too_large"]
+
+    assert asyncio.run(run()) == (413, 1)
+
+
+def test_reconfigure_keeps_settings_of_listeners_that_did_not_start(tmp_path: Path) -> None:
+    """A port in use or a missing certificate leaves the running listeners as they are."""
+    port = _free_port()
+
+    async def run() -> SyrConnectServer:
+        server = SyrConnectServer(http_port=port)
+        await server.start()
+        with socket.socket() as taken:
+            taken.bind(("", 0))
+            taken.listen()
+            try:
+                await server.reconfigure(
+                    http_port=taken.getsockname()[1],
+                    https_port=_free_port(),
+                    use_https=True,
+                    cert_file=str(tmp_path / "missing.pem"),
+                    key_file=str(tmp_path / "missing.key"),
+                    enable_debug_endpoints=False,
+                    tls_offload=False,
+                )
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.close()
+            finally:
+                await server.stop()
+        return server
+
+    server = asyncio.run(run())
+
+    assert server.http_port == port
+    assert not server.use_https
+    assert server.cert_file is None
@@ -0,0 +1,62 @@
+"""Tests for the standalone server's command line."""
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+from custom_components.syr_connect_local.core import standalone
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.mark.parametrize(
+    ("host", "loopback"),
+    [
+        ("127.0.0.1", True),
+        ("::1", True),
+        ("localhost", True),
+        ("0.0.0.0", False),
+        ("", False),
+        ("192.168.1.10", False),
+        ("server.local", False),
+    ],
+)
+def test_is_loopback(host: str, loopback: bool) -> None:
+    """Only loopback addresses count as local."""
+    assert standalone.is_loopback(host) is loopback
+
+
+def test_default_data_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """State goes to SYR_DATA_DIR or the XDG state directory, not the working directory."""
+    monkeypatch.setenv("SYR_DATA_DIR", str(tmp_path / "data"))
+    assert standalone.default_data_dir() == tmp_path / "data"
+
+    monkeypatch.delenv("SYR_DATA_DIR")
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path / "state"))
+    assert standalone.default_data_dir() == tmp_path / "state" / "syr_connect_local"
+
+
+def test_refuses_public_api_without_token(tmp_path: Path) -> None:
+    """The command API is not exposed to the network without a token."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "custom_components.syr_connect_local.core.standalone",
+            "--api-host",
+            "0.0.0.0",
+            "--data-dir",
+            str(tmp_path),
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={"PATH": "", "HOME": str(tmp_path)},
+        timeout=30,
+    )
+
+    assert result.returncode == 2
+    assert "--api-token" in result.stderr